@@ -12,6 +12,7 @@ import re
 import shutil
 import subprocess
 import sys
+import sysconfig
 import platform
 from pathlib import Path
 from logging import info, warning, error
@@ -27,12 +28,18 @@ ReferencePylonVersion = {
 
 ################################################################################
 
+def is_free_threaded_python():
+    return bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+
 def prepare_for_limited_api(min_ver_str):
     min_maj, min_min = map(int, min_ver_str.split("."))
     py_ver_too_low = sys.version_info[:2] < (min_maj, min_min)
     # Disable limited api when python version is to low
     if py_ver_too_low:
         return None, None
+    # Free-threaded builds (e.g. 3.13t) don't support the limited api
+    if is_free_threaded_python():
+        return None, None
     return f"0x{min_maj:02x}{min_min:02x}0000", f"cp{min_maj}{min_min}"
 
 MIN_PY_VER_FOR_LIMITED_API = "3.9" # some low value to prove that it works
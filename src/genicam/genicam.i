@@ -284,6 +284,15 @@ typedef unsigned long long int  uintmax_t;
 %include "GCException.i"
 #undef MODULE_NAME
 
+%init %{
+#ifdef Py_GIL_DISABLED
+    // The SWIG runtime (type lookup, ownership flags, directors) and the
+    // state the wrappers keep in Python objects still rely on the GIL, so
+    // free-threaded builds keep it enabled while the module is loaded.
+    PyUnstable_Module_SetGIL(m, Py_MOD_GIL_USED);
+#endif
+%}
+
 %pythoncode %{
 import warnings
 %}
@@ -0,0 +1,385 @@
+%{
+namespace Pylon
+{
+    // Allocator carving the grab buffers out of one block of memory owned by
+    // Python, e.g. a numpy array. 'memory' is the Python object owning the
+    // block, it is kept alive until the allocator is destroyed. Allocation and
+    // freeing are called by pylon with the GIL released, they must not touch
+    // Python objects.
+    class CArrayBufferAllocator
+    {
+    public:
+        CArrayBufferAllocator(PyObject* memory, size_t address, size_t size, size_t alignment)
+            : m_memory(memory)
+            , m_address(address)
+            , m_size(size)
+            , m_alignment(alignment)
+            , m_next(0)
+            , m_numBuffers(0)
+        {
+            if (address == 0 || size == 0)
+            {
+                throw INVALID_ARGUMENT_EXCEPTION("The memory of the buffer factory must not be empty.");
+            }
+            if (alignment == 0 || (alignment & (alignment - 1)) != 0)
+            {
+                throw INVALID_ARGUMENT_EXCEPTION("The alignment must be a power of two.");
+            }
+            Py_XINCREF(m_memory);
+        }
+
+        ~CArrayBufferAllocator()
+        {
+            // May be destroyed by the camera on any thread.
+            if (m_memory != NULL && Py_IsInitialized())
+            {
+                PyGILState_STATE state = PyGILState_Ensure();
+                Py_DECREF(m_memory);
+                PyGILState_Release(state);
+            }
+        }
+
+        void AllocateBuffer(size_t bufferSize, void** pCreatedBuffer, intptr_t& bufferContext)
+        {
+            std::lock_guard<std::mutex> guard(m_lock);
+
+            // Reuse a free slot first, the buffer size rarely changes.
+            for (size_t i = 0; i < m_slots.size(); ++i)
+            {
+                if (!m_slots[i].used && m_slots[i].size >= bufferSize)
+                {
+                    m_slots[i].used = true;
+                    ++m_numBuffers;
+                    *pCreatedBuffer = reinterpret_cast<void*>(m_address + m_slots[i].offset);
+                    bufferContext = static_cast<intptr_t>(i);
+                    return;
+                }
+            }
+
+            const size_t offset = ((m_address + m_next + m_alignment - 1) & ~(m_alignment - 1)) - m_address;
+            if (offset > m_size || m_size - offset < bufferSize)
+            {
+                throw RUNTIME_EXCEPTION("The memory of the buffer factory is exhausted.");
+            }
+            Slot slot = {offset, bufferSize, true};
+            m_slots.push_back(slot);
+            m_next = offset + bufferSize;
+            ++m_numBuffers;
+            *pCreatedBuffer = reinterpret_cast<void*>(m_address + offset);
+            bufferContext = static_cast<intptr_t>(m_slots.size() - 1);
+        }
+
+        void FreeBuffer(intptr_t bufferContext)
+        {
+            std::lock_guard<std::mutex> guard(m_lock);
+            const size_t i = static_cast<size_t>(bufferContext);
+            if (i < m_slots.size() && m_slots[i].used)
+            {
+                m_slots[i].used = false;
+                --m_numBuffers;
+            }
+            if (m_numBuffers == 0)
+            {
+                // All buffers are back, the next grab may use other sizes.
+                m_slots.clear();
+                m_next = 0;
+            }
+        }
+
+        size_t GetNumBuffers()
+        {
+            std::lock_guard<std::mutex> guard(m_lock);
+            return m_numBuffers;
+        }
+
+        size_t GetCapacity() const
+        {
+            return m_size;
+        }
+
+        size_t GetAddress() const
+        {
+            return m_address;
+        }
+
+    private:
+        CArrayBufferAllocator(const CArrayBufferAllocator&);
+        CArrayBufferAllocator& operator=(const CArrayBufferAllocator&);
+
+        struct Slot
+        {
+            size_t offset;
+            size_t size;
+            bool used;
+        };
+
+        PyObject* m_memory;
+        const size_t m_address;
+        const size_t m_size;
+        const size_t m_alignment;
+        std::mutex m_lock;
+        std::vector<Slot> m_slots;
+        size_t m_next;
+        size_t m_numBuffers;
+    };
+
+    // The buffer factory handed to a camera, which deletes it after freeing
+    // the last buffer. Shares the allocator with the ArrayBufferFactory
+    // object, so either may go first.
+    class CArrayBufferFactoryLink : public IBufferFactory
+    {
+    public:
+        explicit CArrayBufferFactoryLink(const std::shared_ptr<CArrayBufferAllocator>& allocator)
+            : m_allocator(allocator)
+        {
+        }
+
+        virtual void AllocateBuffer(size_t bufferSize, void** pCreatedBuffer, intptr_t& bufferContext)
+        {
+            m_allocator->AllocateBuffer(bufferSize, pCreatedBuffer, bufferContext);
+        }
+
+        virtual void FreeBuffer(void* /*pCreatedBuffer*/, intptr_t bufferContext)
+        {
+            m_allocator->FreeBuffer(bufferContext);
+        }
+
+        virtual void DestroyBufferFactory()
+        {
+            delete this;
+        }
+
+    private:
+        std::shared_ptr<CArrayBufferAllocator> m_allocator;
+    };
+
+    // Wrapped as ArrayBufferFactory and always owned by Python. Cameras get a
+    // CArrayBufferFactoryLink, see InstantCamera.SetBufferFactory.
+    class CArrayBufferFactory
+    {
+    public:
+        CArrayBufferFactory(PyObject* memory, size_t address, size_t size, size_t alignment)
+            : m_allocator(std::make_shared<CArrayBufferAllocator>(memory, address, size, alignment))
+        {
+        }
+
+        size_t GetNumBuffers()
+        {
+            return m_allocator->GetNumBuffers();
+        }
+
+        size_t GetCapacity() const
+        {
+            return m_allocator->GetCapacity();
+        }
+
+        size_t _GetAddress() const
+        {
+            return m_allocator->GetAddress();
+        }
+
+        IBufferFactory* CreateLink() const
+        {
+            return new CArrayBufferFactoryLink(m_allocator);
+        }
+
+    private:
+        std::shared_ptr<CArrayBufferAllocator> m_allocator;
+    };
+}
+%}
+
+%rename(BufferFactory) Pylon::IBufferFactory;
+%rename(_ArrayBufferFactory) Pylon::CArrayBufferFactory;
+%ignore Pylon::IBufferFactory::AllocateBuffer;
+%ignore Pylon::IBufferFactory::FreeBuffer;
+%ignore Pylon::IBufferFactory::DestroyBufferFactory;
+
+// The constructor takes a reference to 'memory', so the GIL must be held.
+%nothread Pylon::CArrayBufferFactory::CArrayBufferFactory;
+
+%include <pylon/BufferFactory.h>;
+
+namespace Pylon
+{
+    class CArrayBufferFactory
+    {
+    public:
+        CArrayBufferFactory(PyObject* memory, size_t address, size_t size, size_t alignment);
+        size_t GetNumBuffers();
+        size_t GetCapacity() const;
+        size_t _GetAddress() const;
+    };
+}
+
+%pythoncode %{
+class ArrayBufferFactory(_ArrayBufferFactory):
+    '''
+    Buffer factory allocating the grab buffers as slices of 'memory', a
+    C contiguous numpy array or any other writable buffer object. Frames are
+    received directly in this memory, np.asarray(grabResult) is a view of it.
+    The memory must be large enough for MaxNumBuffer buffers of PayloadSize
+    bytes, each starting at a multiple of 'alignment'.
+    Attach it with InstantCamera.SetBufferFactory before calling StartGrabbing.
+    The object stays owned by Python, the memory is kept until it is gone
+    and every camera using it has freed its buffers.
+    '''
+
+    @needs_numpy
+    def __init__(self, memory, alignment = 64):
+        if isinstance(memory, _pylon_numpy.ndarray):
+            if not memory.flags.c_contiguous:
+                raise ValueError("memory must be C contiguous")
+            array = memory.reshape(-1).view(_pylon_numpy.uint8)
+        else:
+            array = _pylon_numpy.frombuffer(memory, dtype = _pylon_numpy.uint8)
+        if not array.flags.writeable:
+            raise ValueError("memory must be writeable")
+        _ArrayBufferFactory.__init__(self, array, array.__array_interface__["data"][0], array.nbytes, alignment)
+        self.memory = memory
+
+    def GetOffset(self, grabResult):
+        '''
+        Return the offset of the buffer of 'grabResult' within the memory of
+        this factory.
+        '''
+        return grabResult._GetBufferAddress() - self._GetAddress()
+%}
+
+%pythoncode %{
+class SharedFrameDescriptor(_namedtuple("SharedFrameDescriptor", (
+        "name", "offset", "shape", "dtype", "strides", "bufferId"
+        ))):
+    '''
+    Picklable reference to a frame in the shared memory segment 'name' of a
+    SharedMemoryBufferFactory, see OpenSharedFrame.
+    '''
+    __slots__ = ()
+
+class SharedMemoryBufferFactory(ArrayBufferFactory):
+    '''
+    Buffer factory allocating the grab buffers in a new named shared memory
+    segment of 'size' bytes (multiprocessing.shared_memory compatible).
+    Share() hands a grab result to other processes as SharedFrameDescriptor.
+    The buffer is returned to the camera after all workers have released the
+    frame, see ReleaseSharedFrame and ProcessReleases.
+    '''
+
+    @needs_numpy
+    def __init__(self, size, name = None, alignment = 4096, context = None):
+        import itertools
+        import multiprocessing
+        import threading
+        from multiprocessing import shared_memory
+        self.sharedMemory = shared_memory.SharedMemory(name = name, create = True, size = size)
+        ArrayBufferFactory.__init__(self, self.sharedMemory.buf, alignment)
+        self.releaseQueue = (context or multiprocessing).Queue()
+        self._shared = {}
+        self._shared_lock = threading.Lock()
+        self._buffer_ids = itertools.count(1)
+
+    def Share(self, grabResult, count = 1):
+        '''
+        Keep the buffer of 'grabResult' until it has been released 'count' times
+        and return a SharedFrameDescriptor for it. 'grabResult' itself may be
+        released right away.
+        '''
+        array = _pylon_numpy.asarray(grabResult)
+        offset = array.__array_interface__["data"][0] - self._GetAddress()
+        if not 0 <= offset < self.GetCapacity():
+            raise ValueError("The image data is not located in the shared memory of this factory")
+        bufferId = next(self._buffer_ids)
+        with self._shared_lock:
+            self._shared[bufferId] = [array, count]
+        return SharedFrameDescriptor(
+            self.sharedMemory.name, offset, array.shape, array.dtype.str, array.strides, bufferId
+            )
+
+    def Release(self, bufferId):
+        '''
+        Release one reference to a shared frame. Returns True if that was the
+        last one and the buffer went back to the camera.
+        '''
+        with self._shared_lock:
+            entry = self._shared.get(bufferId)
+            if entry is None:
+                return False
+            entry[1] -= 1
+            if entry[1] > 0:
+                return False
+            del self._shared[bufferId]
+        return True
+
+    def ProcessReleases(self, timeout = None):
+        '''
+        Apply the releases sent by workers through 'releaseQueue'. Waits up to
+        'timeout' seconds for the first one if there are none yet. Returns the
+        number of buffers that went back to the camera.
+        '''
+        import queue
+        returned = 0
+        block = timeout is None or timeout > 0
+        while True:
+            try:
+                bufferId = self.releaseQueue.get(block, timeout) if block else self.releaseQueue.get_nowait()
+            except queue.Empty:
+                return returned
+            if self.Release(bufferId):
+                returned += 1
+            block = False
+
+    def GetNumShared(self):
+        with self._shared_lock:
+            return len(self._shared)
+
+    def Close(self):
+        '''
+        Drop all shared frames and unlink the shared memory segment. The mapping
+        itself lives until the cameras using the factory freed their buffers.
+        '''
+        with self._shared_lock:
+            self._shared.clear()
+        self.sharedMemory.unlink()
+        try:
+            self.sharedMemory.close()
+        except BufferError:
+            pass
+
+_attached_shared_memory = {}
+
+def _AttachSharedMemory(name):
+    from multiprocessing import shared_memory
+    try:
+        return shared_memory.SharedMemory(name = name, track = False)
+    except TypeError:
+        # Python < 3.13: don't let the resource tracker of this process unlink
+        # the segment owned by the grabbing process.
+        shm = shared_memory.SharedMemory(name = name)
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return shm
+
+@needs_numpy
+def OpenSharedFrame(descriptor):
+    '''
+    Return a numpy view of the frame referenced by 'descriptor', usable in any
+    process. The segment stays attached for the lifetime of the process.
+    '''
+    shm = _attached_shared_memory.get(descriptor.name)
+    if shm is None:
+        shm = _attached_shared_memory[descriptor.name] = _AttachSharedMemory(descriptor.name)
+    return _pylon_numpy.ndarray(
+        descriptor.shape, dtype = descriptor.dtype, buffer = shm.buf,
+        offset = descriptor.offset, strides = descriptor.strides
+        )
+
+def ReleaseSharedFrame(descriptor, releaseQueue):
+    '''
+    Tell the grabbing process that this worker is done with the frame. Views
+    returned by OpenSharedFrame must not be used afterwards.
+    '''
+    releaseQueue.put(descriptor.bufferId)
+%}
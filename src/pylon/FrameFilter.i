@@ -0,0 +1,336 @@
+%{
+namespace Pylon
+{
+    // Drops grab results before they are handed to Python. Retrieve() is
+    // called with the GIL released, dropped results are released right away,
+    // so their buffers are queued again immediately.
+    class CFrameFilter
+    {
+    public:
+        CFrameFilter(size_t decimation = 1, double maxRateHz = 0.0, size_t keepNewest = 0)
+            : m_decimation(1)
+            , m_maxRateHz(0.0)
+            , m_keepNewest(0)
+        {
+            SetDecimation(decimation);
+            SetMaxRateHz(maxRateHz);
+            SetKeepNewest(keepNewest);
+            Reset();
+            ResetStatistics();
+        }
+
+        // Deliver every 'decimation'th successfully grabbed frame.
+        void SetDecimation(size_t decimation)
+        {
+            if (decimation == 0)
+            {
+                throw INVALID_ARGUMENT_EXCEPTION("The decimation must not be zero.");
+            }
+            std::lock_guard<std::mutex> guard(m_lock);
+            m_decimation = decimation;
+        }
+
+        size_t GetDecimation()
+        {
+            std::lock_guard<std::mutex> guard(m_lock);
+            return m_decimation;
+        }
+
+        // Deliver at most 'maxRateHz' frames per second on average, 0 for no
+        // limit. The time a result is taken from the output queue counts.
+        void SetMaxRateHz(double maxRateHz)
+        {
+            if (!(maxRateHz >= 0.0))
+            {
+                throw INVALID_ARGUMENT_EXCEPTION("The maximum rate must not be negative.");
+            }
+            std::lock_guard<std::mutex> guard(m_lock);
+            m_maxRateHz = maxRateHz;
+        }
+
+        double GetMaxRateHz()
+        {
+            std::lock_guard<std::mutex> guard(m_lock);
+            return m_maxRateHz;
+        }
+
+        // Only keep the newest 'keepNewest' frames of the ones waiting in the
+        // output queue, 0 to keep all of them.
+        void SetKeepNewest(size_t keepNewest)
+        {
+            std::lock_guard<std::mutex> guard(m_lock);
+            m_keepNewest = keepNewest;
+            while (m_keepNewest > 0 && m_held.size() > m_keepNewest)
+            {
+                m_held.pop_front();
+                ++m_statistics.numDroppedNewest;
+            }
+        }
+
+        size_t GetKeepNewest()
+        {
+            std::lock_guard<std::mutex> guard(m_lock);
+            return m_keepNewest;
+        }
+
+        // Retrieves the next result of 'camera' passing the filter. Has the
+        // semantics of InstantCamera.RetrieveResult.
+        bool Retrieve(CInstantCamera& camera, unsigned int timeoutMs, CGrabResultPtr& grabResult, ETimeoutHandling timeoutHandling = TimeoutHandling_ThrowException)
+        {
+            grabResult.Release();
+            const std::chrono::steady_clock::time_point deadline =
+                std::chrono::steady_clock::now() + std::chrono::milliseconds(timeoutMs);
+            for (;;)
+            {
+                if (GetKeepNewest() > 0)
+                {
+                    // Take everything that is ready, so only the newest frames
+                    // survive.
+                    CGrabResultPtr ready;
+                    while (camera.IsGrabbing() && camera.RetrieveResult(0, ready, TimeoutHandling_Return))
+                    {
+                        Offer(ready);
+                        ready.Release();
+                    }
+                }
+                if (PopHeld(grabResult))
+                {
+                    return true;
+                }
+
+                if (!camera.IsGrabbing())
+                {
+                    return false;
+                }
+                const std::chrono::steady_clock::time_point now = std::chrono::steady_clock::now();
+                const unsigned int remaining = now < deadline
+                    ? static_cast<unsigned int>(std::chrono::duration_cast<std::chrono::milliseconds>(deadline - now).count())
+                    : 0;
+                CGrabResultPtr result;
+                if (!camera.RetrieveResult(remaining, result, TimeoutHandling_Return))
+                {
+                    if (timeoutHandling == TimeoutHandling_ThrowException && camera.IsGrabbing())
+                    {
+                        throw TIMEOUT_EXCEPTION("No grab result passed the frame filter within %u ms.", timeoutMs);
+                    }
+                    return false;
+                }
+                Offer(result);
+            }
+        }
+
+        // Drops the held results and restarts decimation and rate limiting.
+        void Reset()
+        {
+            std::lock_guard<std::mutex> guard(m_lock);
+            m_held.clear();
+            m_count = 0;
+            m_nextDelivery = std::chrono::steady_clock::time_point();
+        }
+
+        size_t GetNumHeld()
+        {
+            std::lock_guard<std::mutex> guard(m_lock);
+            return m_held.size();
+        }
+
+        void ResetStatistics()
+        {
+            std::lock_guard<std::mutex> guard(m_lock);
+            memset(&m_statistics, 0, sizeof(m_statistics));
+        }
+
+        // Returns (numReceived, numDelivered, numDroppedDecimation,
+        // numDroppedRate, numDroppedNewest).
+        PyObject* _GetStatistics()
+        {
+            Statistics s;
+            {
+                std::lock_guard<std::mutex> guard(m_lock);
+                s = m_statistics;
+            }
+            return Py_BuildValue(
+                "(KKKKK)",
+                s.numReceived, s.numDelivered, s.numDroppedDecimation,
+                s.numDroppedRate, s.numDroppedNewest
+                );
+        }
+
+    private:
+        CFrameFilter(const CFrameFilter&);
+        CFrameFilter& operator=(const CFrameFilter&);
+
+        struct Statistics
+        {
+            unsigned long long numReceived;
+            unsigned long long numDelivered;
+            unsigned long long numDroppedDecimation;
+            unsigned long long numDroppedRate;
+            unsigned long long numDroppedNewest;
+        };
+
+        // Applies decimation and rate limit. Accepted results are appended to
+        // the held results.
+        void Offer(const CGrabResultPtr& result)
+        {
+            std::lock_guard<std::mutex> guard(m_lock);
+            ++m_statistics.numReceived;
+            // Failed grabs are always delivered, the consumer must see them.
+            if (result->GrabSucceeded())
+            {
+                if (m_count++ % m_decimation != 0)
+                {
+                    ++m_statistics.numDroppedDecimation;
+                    return;
+                }
+                if (m_maxRateHz > 0.0)
+                {
+                    const std::chrono::steady_clock::time_point now = std::chrono::steady_clock::now();
+                    if (now < m_nextDelivery)
+                    {
+                        ++m_statistics.numDroppedRate;
+                        return;
+                    }
+                    // Tolerates a jitter of half an interval, so a camera
+                    // running slightly faster than the limit isn't halved.
+                    const std::chrono::steady_clock::duration interval =
+                        std::chrono::duration_cast<std::chrono::steady_clock::duration>(std::chrono::duration<double>(1.0 / m_maxRateHz));
+                    m_nextDelivery = std::max(m_nextDelivery, now - interval / 2) + interval;
+                }
+            }
+            m_held.push_back(result);
+            while (m_keepNewest > 0 && m_held.size() > m_keepNewest)
+            {
+                m_held.pop_front();
+                ++m_statistics.numDroppedNewest;
+            }
+        }
+
+        bool PopHeld(CGrabResultPtr& grabResult)
+        {
+            std::lock_guard<std::mutex> guard(m_lock);
+            if (m_held.empty())
+            {
+                return false;
+            }
+            grabResult = m_held.front();
+            m_held.pop_front();
+            ++m_statistics.numDelivered;
+            return true;
+        }
+
+        std::mutex m_lock;
+        size_t m_decimation;
+        double m_maxRateHz;
+        size_t m_keepNewest;
+        std::deque<CGrabResultPtr> m_held;
+        unsigned long long m_count;
+        std::chrono::steady_clock::time_point m_nextDelivery;
+        Statistics m_statistics;
+    };
+}
+%}
+
+%rename(FrameFilter) Pylon::CFrameFilter;
+%nothread Pylon::CFrameFilter::_GetStatistics;
+
+namespace Pylon
+{
+    class CFrameFilter
+    {
+    public:
+        CFrameFilter(size_t decimation = 1, double maxRateHz = 0.0, size_t keepNewest = 0);
+        void SetDecimation(size_t decimation);
+        size_t GetDecimation();
+        void SetMaxRateHz(double maxRateHz);
+        double GetMaxRateHz();
+        void SetKeepNewest(size_t keepNewest);
+        size_t GetKeepNewest();
+        bool Retrieve(CInstantCamera& camera, unsigned int timeoutMs, CGrabResultPtr& grabResult, ETimeoutHandling timeoutHandling = TimeoutHandling_ThrowException);
+        void Reset();
+        size_t GetNumHeld();
+        void ResetStatistics();
+        PyObject* _GetStatistics();
+    };
+}
+
+%extend Pylon::CFrameFilter {
+    PROP_GETSET(Decimation)
+    PROP_GETSET(MaxRateHz)
+    PROP_GETSET(KeepNewest)
+%pythoncode %{
+    def GetStatistics(self):
+        '''
+        Return the FrameFilterStatistics collected since construction or the
+        last call of ResetStatistics.
+        '''
+        return FrameFilterStatistics._make(self._GetStatistics())
+%}
+}
+
+%feature("docstring") Pylon::CInstantCamera::_RetrieveFilteredResult "
+Retrieves a grab result according to the strategy, waits if it is not yet
+available. If a FrameFilter is set, see SetFrameFilter, the result is
+retrieved through it. Otherwise behaves like CInstantCamera::RetrieveResult()
+of pylon.
+";
+
+%nothread Pylon::CInstantCamera::_SetFrameFilter;
+%nothread Pylon::CInstantCamera::_GetFrameFilter;
+%nothread Pylon::CInstantCamera::_RetrieveFilteredResult;
+
+%extend Pylon::CInstantCamera {
+    // Wrapped as RetrieveResult. Applies the frame filter kept for the camera
+    // and waits without the GIL.
+    bool _RetrieveFilteredResult(unsigned int timeoutMs, CGrabResultPtr& grabResult, ETimeoutHandling timeoutHandling = TimeoutHandling_ThrowException)
+    {
+        PyObject* frameFilterObject = PylonCameraStates::GetFrameFilter($self);
+        CFrameFilter* frameFilter = NULL;
+        if (frameFilterObject != NULL)
+        {
+            SWIG_ConvertPtr(frameFilterObject, reinterpret_cast<void**>(&frameFilter), SWIGTYPE_p_Pylon__CFrameFilter, 0);
+        }
+        bool retrieved = false;
+        try
+        {
+            // The reference keeps the filter alive while it is used.
+            PylonGilRelease release;
+            retrieved = frameFilter != NULL
+                ? frameFilter->Retrieve(*$self, timeoutMs, grabResult, timeoutHandling)
+                : $self->RetrieveResult(timeoutMs, grabResult, timeoutHandling);
+        }
+        catch (...)
+        {
+            Py_XDECREF(frameFilterObject);
+            throw;
+        }
+        Py_XDECREF(frameFilterObject);
+        return retrieved;
+    }
+
+    void _SetFrameFilter(PyObject* frameFilter)
+    {
+        PylonCameraStates::SetFrameFilter($self, frameFilter != Py_None ? frameFilter : NULL);
+    }
+
+    PyObject* _GetFrameFilter()
+    {
+        PyObject* frameFilter = PylonCameraStates::GetFrameFilter($self);
+        if (frameFilter == NULL)
+        {
+            Py_RETURN_NONE;
+        }
+        return frameFilter;
+    }
+}
+
+%pythoncode %{
+class FrameFilterStatistics(_namedtuple("FrameFilterStatistics", (
+        "numReceived", "numDelivered", "numDroppedDecimation",
+        "numDroppedRate", "numDroppedNewest"
+        ))):
+    '''
+    Counters of a FrameFilter, see FrameFilter.GetStatistics.
+    '''
+    __slots__ = ()
+%}
@@ -0,0 +1,235 @@
+%{
+namespace Pylon
+{
+    // Holds the grab results retrieved by one call of Retrieve(). None of the
+    // methods touch Python objects, so they all run without the GIL.
+    class CGrabResultBatch
+    {
+    public:
+        CGrabResultBatch() {}
+
+        // Waits until 'maxResults' results have been retrieved, 'timeoutMs' has
+        // elapsed or the camera stopped grabbing. Results that are already
+        // waiting in the output queue are always collected. If 'filter' is
+        // given, only results passing it are collected. Returns the number of
+        // results held by the batch.
+        size_t Retrieve(CInstantCamera& camera, size_t maxResults, unsigned int timeoutMs, CFrameFilter* filter = NULL)
+        {
+            Release();
+            const std::chrono::steady_clock::time_point deadline =
+                std::chrono::steady_clock::now() + std::chrono::milliseconds(timeoutMs);
+            while (m_results.size() < maxResults && camera.IsGrabbing())
+            {
+                const std::chrono::steady_clock::time_point now = std::chrono::steady_clock::now();
+                const unsigned int remaining = now < deadline
+                    ? static_cast<unsigned int>(std::chrono::duration_cast<std::chrono::milliseconds>(deadline - now).count())
+                    : 0;
+                CGrabResultPtr result;
+                const bool retrieved = filter != NULL
+                    ? filter->Retrieve(camera, remaining, result, TimeoutHandling_Return)
+                    : camera.RetrieveResult(remaining, result, TimeoutHandling_Return);
+                if (!retrieved)
+                {
+                    break;
+                }
+                m_results.push_back(result);
+            }
+            return m_results.size();
+        }
+
+        size_t GetCount() const
+        {
+            return m_results.size();
+        }
+
+        CGrabResultPtr GetResult(size_t index) const
+        {
+            if (index >= m_results.size())
+            {
+                throw OUT_OF_RANGE_EXCEPTION("Index is out of range.");
+            }
+            return m_results[index];
+        }
+
+        // Returns the buffers of all results to the camera.
+        void Release()
+        {
+            m_results.clear();
+        }
+
+        // Copies the image data of all results into caller owned memory. Frame
+        // 'i' starts at 'address + i * frameStride' and is stored densely.
+        // Packed formats are unpacked. Frames that failed or don't match the
+        // given geometry are zero filled. Returns the number of copied frames.
+        size_t _CopyTo(size_t address, size_t size, size_t frameStride, EPixelType pt, uint32_t width, uint32_t height)
+        {
+            PylonUnpackInfo info;
+            const size_t frameSize = height * (PylonGetUnpackInfo(pt, info)
+                ? static_cast<size_t>(width) * sizeof(uint16_t)
+                : PylonImageRowSize(pt, width));
+            if (m_results.empty())
+            {
+                return 0;
+            }
+            if (frameStride < frameSize || size < frameStride * (m_results.size() - 1) + frameSize)
+            {
+                throw INVALID_ARGUMENT_EXCEPTION("Destination buffer is too small.");
+            }
+            size_t copied = 0;
+            for (size_t i = 0; i < m_results.size(); ++i)
+            {
+                const size_t dst = address + i * frameStride;
+                if (PylonCopyResultTo(dst, frameSize, 0, m_results[i], pt, width, height))
+                {
+                    ++copied;
+                }
+                else
+                {
+                    memset(reinterpret_cast<void*>(dst), 0, frameSize);
+                }
+            }
+            return copied;
+        }
+
+        // Fills one metadata record per result, see GrabResultMetadataDtype.
+        void _FillMetadata(size_t address, size_t size, size_t itemSize)
+        {
+            if (!m_results.empty())
+            {
+                PylonFillGrabResultMetadataTo(address, size, itemSize, &m_results[0], m_results.size());
+            }
+        }
+
+    private:
+        CGrabResultBatch(const CGrabResultBatch&);
+        CGrabResultBatch& operator=(const CGrabResultBatch&);
+
+        std::vector<CGrabResultPtr> m_results;
+    };
+
+    // Fills one metadata record for each GrabResult of the sequence 'results'.
+    // Needs the GIL for accessing the sequence.
+    static void _FillGrabResultMetadata(PyObject* results, size_t address, size_t size, size_t itemSize)
+    {
+        PyObject* seq = PySequence_Fast(results, "results must be a sequence of GrabResult objects");
+        if (seq == NULL)
+        {
+            PyErr_Clear();
+            throw INVALID_ARGUMENT_EXCEPTION("results must be a sequence of GrabResult objects");
+        }
+        std::vector<CGrabResultPtr> ptrs;
+        const Py_ssize_t count = PySequence_Size(seq);
+        ptrs.reserve(static_cast<size_t>(count));
+        for (Py_ssize_t i = 0; i < count; ++i)
+        {
+            PyObject* item = PySequence_GetItem(seq, i);
+            void* argp = NULL;
+            const int res = item != NULL ? SWIG_ConvertPtr(item, &argp, SWIGTYPE_p_Pylon__CGrabResultPtr, 0) : SWIG_ERROR;
+            Py_XDECREF(item);
+            if (!SWIG_IsOK(res) || argp == NULL)
+            {
+                Py_DECREF(seq);
+                PyErr_Clear();
+                throw INVALID_ARGUMENT_EXCEPTION("results must be a sequence of GrabResult objects");
+            }
+            ptrs.push_back(*static_cast<CGrabResultPtr*>(argp));
+        }
+        Py_DECREF(seq);
+        if (!ptrs.empty())
+        {
+            PylonFillGrabResultMetadataTo(address, size, itemSize, &ptrs[0], ptrs.size());
+        }
+    }
+}
+%}
+
+%rename(GrabResultBatch) Pylon::CGrabResultBatch;
+
+namespace Pylon
+{
+    class CGrabResultBatch
+    {
+    public:
+        CGrabResultBatch();
+        size_t Retrieve(CInstantCamera& camera, size_t maxResults, unsigned int timeoutMs, CFrameFilter* filter = NULL);
+        size_t GetCount() const;
+        CGrabResultPtr GetResult(size_t index) const;
+        void Release();
+        size_t _CopyTo(size_t address, size_t size, size_t frameStride, EPixelType pt, uint32_t width, uint32_t height);
+        void _FillMetadata(size_t address, size_t size, size_t itemSize);
+    };
+
+    %nothread _FillGrabResultMetadata;
+    void _FillGrabResultMetadata(PyObject* results, size_t address, size_t size, size_t itemSize);
+}
+
+%extend Pylon::CGrabResultBatch {
+%pythoncode %{
+    def __len__(self):
+        return self.GetCount()
+
+    def __getitem__(self, index):
+        count = self.GetCount()
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("batch index out of range")
+        return self.GetResult(index)
+
+    def __iter__(self):
+        return (self.GetResult(i) for i in range(self.GetCount()))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.Release()
+%}
+}
+
+%pythoncode %{
+class GrabResultMetadata(_namedtuple("GrabResultMetadata", (
+        "timeStamp", "id", "imageNumber", "blockId", "cameraContext",
+        "width", "height", "paddingX", "pixelType", "errorCode", "grabSucceeded"
+        ))):
+    '''
+    Per frame information of a grab result, see GrabResult.GetMetadata.
+    The fields match GrabResultMetadataDtype.
+    '''
+    __slots__ = ()
+
+@needs_numpy
+def FillGrabResultMetadata(results, out):
+    '''
+    Fill out[i] with the metadata of results[i] in a single call. 'results' is a
+    GrabResultBatch or a sequence of GrabResult objects, 'out' a structured array
+    of GrabResultMetadataDtype. Returns the view of the filled records.
+    '''
+    count = len(results)
+    if count > len(out):
+        raise ValueError("out is too small for %d results" % count)
+    out = out[:count]
+    address, size, stride = _GetOutArrayInfo(out, (count,), GrabResultMetadataDtype)
+    if isinstance(results, GrabResultBatch):
+        results._FillMetadata(address, size, GrabResultMetadataDtype.itemsize)
+    else:
+        _FillGrabResultMetadata(results, address, size, GrabResultMetadataDtype.itemsize)
+    return out
+
+try:
+    GrabResultMetadataDtype = _pylon_numpy.dtype([
+        ("timeStamp", _pylon_numpy.uint64),
+        ("id", _pylon_numpy.int64),
+        ("imageNumber", _pylon_numpy.int64),
+        ("blockId", _pylon_numpy.uint64),
+        ("cameraContext", _pylon_numpy.int64),
+        ("width", _pylon_numpy.uint32),
+        ("height", _pylon_numpy.uint32),
+        ("paddingX", _pylon_numpy.uint32),
+        ("pixelType", _pylon_numpy.uint32),
+        ("errorCode", _pylon_numpy.uint32),
+        ("grabSucceeded", _pylon_numpy.bool_),
+        ], align = True)
+except NameError:
+    pass
+%}
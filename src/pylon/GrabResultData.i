@@ -14,7 +14,7 @@
     // Since 'GetBuffer', 'GetImageBuffer', 'GetMemoryView', 'GetImageMemoryView'
     // and '_Unpack10or12BitPacked' allocate memory, they must not be called without
     // the GIL being held. Therefore we have to tell SWIG not to release the GIL
-    // when calling them (%nothread).
+    // when calling them (%nothread). They release it themselves while copying.
 
     %nothread GetBuffer;
     %nothread GetImageBuffer;
@@ -25,15 +25,21 @@
     PyObject * GetBuffer()
     {
         void * buf = $self->GetBuffer();
-        size_t length = $self->GetPayloadSize();
-        return (buf) ? PyByteArray_FromStringAndSize((const char *) buf, length) : Py_None;
+        if (buf == NULL)
+        {
+            Py_RETURN_NONE;
+        }
+        return PylonCopyToByteArray(buf, $self->GetPayloadSize());
     }
 
     PyObject * GetImageBuffer()
     {
         void * buf = $self->GetBuffer();
-        size_t length = $self->GetImageSize();
-        return (buf) ? PyByteArray_FromStringAndSize((const char *) buf, length) : Py_None;
+        if (buf == NULL)
+        {
+            Py_RETURN_NONE;
+        }
+        return PylonCopyToByteArray(buf, $self->GetImageSize());
     }
 
     PyObject * GetMemoryView()
@@ -66,160 +72,57 @@
 %#endif
     }
 
-    PyObject * _Unpack10or12BitPacked()
+    // Copy the image data into caller owned memory (e.g. a numpy array).
+    // These don't allocate Python objects, so the GIL is released.
+    void _CopyImageTo(size_t address, size_t size, size_t stride)
     {
-        // Current pixel type of our data
-        EPixelType cur_pt = $self->GetPixelType();
-
-        // Parameter for conversion
-        EPixelType conv_src_pt = PixelType_Undefined;
-        EPixelType conv_dst_pt = PixelType_Undefined;
-
-        // Type of resulting image data
-        EPixelType ret_pt = PixelType_Undefined;
-
-        /*
-         * Now set conversion parameter depending on the current type
-         * Hack: Image format converter does not allow Bayer* as output format
-         *       so we treat Bayer* as Mono* as we only are interested in the
-         *       unpack operation.
-         */
-        switch(cur_pt)
-        {
-        case PixelType_Mono12packed:
-            conv_src_pt = PixelType_Mono12packed;
-            conv_dst_pt = PixelType_Mono16;
-            ret_pt = PixelType_Mono12;
-            break;
-
-        case PixelType_Mono12p:
-            conv_src_pt = PixelType_Mono12p;
-            conv_dst_pt = PixelType_Mono16;
-            ret_pt = PixelType_Mono12;
-            break;
-
-        case PixelType_BayerBG12Packed:
-            conv_src_pt = PixelType_Mono12packed;
-            conv_dst_pt = PixelType_Mono16;
-            ret_pt = PixelType_BayerBG12;
-            break;
-
-        case PixelType_BayerBG12p:
-            conv_src_pt = PixelType_Mono12p;
-            conv_dst_pt = PixelType_Mono16;
-            ret_pt = PixelType_BayerBG12;
-            break;
-
-        case PixelType_BayerGB12Packed:
-            conv_src_pt = PixelType_Mono12packed;
-            conv_dst_pt = PixelType_Mono16;
-            ret_pt = PixelType_BayerGB12;
-            break;
-
-        case PixelType_BayerGB12p:
-            conv_src_pt = PixelType_Mono12p;
-            conv_dst_pt = PixelType_Mono16;
-            ret_pt = PixelType_BayerGB12;
-            break;
-
-        case PixelType_BayerRG12Packed:
-            conv_src_pt = PixelType_Mono12packed;
-            conv_dst_pt = PixelType_Mono16;
-            ret_pt = PixelType_BayerRG12;
-            break;
-
-        case PixelType_BayerRG12p:
-            conv_src_pt = PixelType_Mono12p;
-            conv_dst_pt = PixelType_Mono16;
-            ret_pt = PixelType_BayerRG12;
-            break;
-
-        case PixelType_BayerGR12Packed:
-            conv_src_pt = PixelType_Mono12packed;
-            conv_dst_pt = PixelType_Mono16;
-            ret_pt = PixelType_BayerGR12;
-            break;
-
-        case PixelType_BayerGR12p:
-            conv_src_pt = PixelType_Mono12p;
-            conv_dst_pt = PixelType_Mono16;
-            ret_pt = PixelType_BayerGR12;
-            break;
-
-        case PixelType_Mono10packed:
-            conv_src_pt = PixelType_Mono10packed;
-            conv_dst_pt = PixelType_Mono16;
-            ret_pt = PixelType_Mono10;
-            break;
-
-        case PixelType_Mono10p:
-            conv_src_pt = PixelType_Mono10p;
-            conv_dst_pt = PixelType_Mono16;
-            ret_pt = PixelType_Mono10;
-            break;
-
-        case PixelType_BayerBG10p:
-            conv_src_pt = PixelType_Mono10p;
-            conv_dst_pt = PixelType_Mono16;
-            ret_pt = PixelType_BayerBG10;
-            break;
-
-        case PixelType_BayerGB10p:
-            conv_src_pt = PixelType_Mono10p;
-            conv_dst_pt = PixelType_Mono16;
-            ret_pt = PixelType_BayerGB10;
-            break;
-
-        case PixelType_BayerRG10p:
-            conv_src_pt = PixelType_Mono10p;
-            conv_dst_pt = PixelType_Mono16;
-            ret_pt = PixelType_BayerRG10;
-            break;
-
-        case PixelType_BayerGR10p:
-            conv_src_pt = PixelType_Mono10p;
-            conv_dst_pt = PixelType_Mono16;
-            ret_pt = PixelType_BayerGR10;
-            break;
-
-        default:
-            throw INVALID_ARGUMENT_EXCEPTION( "Invalid PixelFormat, unable to unpack.");
-        }
+        PylonCopyImageTo(
+            address, size, stride,
+            $self->GetBuffer(), $self->GetImageSize(),
+            $self->GetPixelType(), $self->GetWidth(), $self->GetHeight(), $self->GetPaddingX()
+            );
+    }
 
-        // Now get some info for the current image data
-        const void * const buf = $self->GetBuffer();
-        const size_t sz = $self->GetImageSize();
-        const uint32_t width = $self->GetWidth();
-        const uint32_t height = $self->GetHeight();
-        const size_t padding_x = $self->GetPaddingX();
+    void _CopyBufferTo(size_t address, size_t size)
+    {
+        PylonCopyBufferTo(address, size, $self->GetBuffer(), $self->GetPayloadSize());
+    }
 
-        // Use the pylon converter to do the real work
-        CImageFormatConverter converter;
-        converter.OutputPixelFormat = conv_dst_pt;
+    // Address of the data for exporting it without a copy, see __array__.
+    size_t _GetBufferAddress()
+    {
+        return reinterpret_cast<size_t>($self->GetBuffer());
+    }
 
-        // Create a new buffer, the allocated memory is returned
-        size_t new_size = converter.GetBufferSizeForConversion(conv_src_pt, width, height);
-        uint8_t *dst = new uint8_t[new_size];
+    // Unpack into caller owned memory of lsb aligned 16 bit pixels. Runs without
+    // holding the GIL. Returns the pixel type of the unpacked data.
+    EPixelType _UnpackTo(size_t address, size_t size, size_t stride)
+    {
+        return PylonUnpackTo(
+            address, size, stride,
+            $self->GetBuffer(), $self->GetImageSize(),
+            $self->GetPixelType(), $self->GetWidth(), $self->GetHeight(), $self->GetPaddingX()
+            );
+    }
 
-        try
-        {
-            converter.Convert(dst, new_size, buf, sz, conv_src_pt,  width, height, padding_x, ImageOrientation_TopDown);
-        }
-        catch(...)
+    PyObject * _Unpack10or12BitPacked()
+    {
+        EPixelType ret_pt = PixelType_Undefined;
+        PyObject * data = PylonUnpackToByteArray(
+            ret_pt,
+            $self->GetBuffer(), $self->GetImageSize(),
+            $self->GetPixelType(), $self->GetWidth(), $self->GetHeight(), $self->GetPaddingX()
+            );
+        if (data == NULL)
         {
-            // Unable to convert, free temp buffer and return empty
-            delete[] dst;
-            throw LOGICAL_ERROR_EXCEPTION( "Failed to unpack!");
+            return NULL;
         }
 
         // Build python return object
         PyObject * result = 0;
-
-        PyObject * data = (dst) ? PyByteArray_FromStringAndSize((const char *) dst, new_size) : Py_None;
         // workaround for using AppendOutput outside of template for swig >= 4.3
         const int IS_VOID = 1;
         result = SWIG_Python_AppendOutput(result, data, IS_VOID);
-        delete [] dst;
 
         PyObject * tp = PyInt_FromLong((long) ret_pt);
         result = SWIG_Python_AppendOutput(result, tp, IS_VOID);
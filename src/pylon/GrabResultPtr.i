@@ -14,83 +14,97 @@
     def GetImageFormat(self, pt = None):
         if pt is None:
             pt = self.GetPixelType()
-        if IsPacked(pt):
-            raise ValueError("Packed Formats are not supported with numpy interface")
-        if pt in ( PixelType_Mono8, PixelType_BayerGR8, PixelType_BayerRG8, PixelType_BayerGB8, PixelType_BayerBG8, PixelType_Confidence8, PixelType_Coord3D_C8 ):
-            shape = (self.GetHeight(), self.GetWidth())
-            format = "B"
-            dtype = _pylon_numpy.uint8
-        elif pt in ( PixelType_Mono10, PixelType_BayerGR10, PixelType_BayerRG10, PixelType_BayerGB10, PixelType_BayerBG10 ):
-            shape = (self.GetHeight(), self.GetWidth())
-            format = "H"
-            dtype = _pylon_numpy.uint16
-        elif pt in ( PixelType_Mono12, PixelType_BayerGR12, PixelType_BayerRG12, PixelType_BayerGB12, PixelType_BayerBG12 ):
-            shape = (self.GetHeight(), self.GetWidth())
-            format = "H"
-            dtype = _pylon_numpy.uint16
-        elif pt in ( PixelType_Mono16, PixelType_BayerGR16, PixelType_BayerRG16, PixelType_BayerGB16, PixelType_BayerBG16, PixelType_Confidence16, PixelType_Coord3D_C16 ):
-            shape = (self.GetHeight(), self.GetWidth())
-            format = "H"
-            dtype = _pylon_numpy.uint16
-        elif pt in ( PixelType_RGB8packed, PixelType_BGR8packed ):
-            shape = (self.GetHeight(), self.GetWidth(), 3)
-            dtype = _pylon_numpy.uint8
-            format = "B"
-        elif pt in ( PixelType_RGB12packed, PixelType_BGR12packed, PixelType_RGB10packed, PixelType_BGR10packed ):
-            shape = (self.GetHeight(), self.GetWidth(), 3)
-            format = "H"
-            dtype = _pylon_numpy.uint16            
-        elif pt in ( PixelType_YUV422_YUYV_Packed, PixelType_YUV422packed ):
-            shape = (self.GetHeight(), self.GetWidth(), 2)
-            dtype = _pylon_numpy.uint8
-            format = "B"
-        elif pt in ( PixelType_Coord3D_ABC32f, ):
-            shape = (self.GetHeight(), self.GetWidth(), 3)
-            dtype = _pylon_numpy.float32
-            format = "f"
-        elif pt in ( PixelType_Data32f, ):
-            shape = (self.GetHeight(), self.GetWidth(), 1)
-            dtype = _pylon_numpy.float32
-            format = "f"
-        elif pt in ( PixelType_BiColorRGBG8, PixelType_BiColorBGRG8 ):
-            shape = (self.GetHeight(), self.GetWidth() * 2)
-            format = "B"
-            dtype = _pylon_numpy.uint8
-        elif pt in ( PixelType_BiColorRGBG10, PixelType_BiColorBGRG10, PixelType_BiColorRGBG12, PixelType_BiColorBGRG12 ):
-            shape = (self.GetHeight(), self.GetWidth() * 2)
-            format = "H"
-            dtype = _pylon_numpy.uint16
-        else:
-            raise ValueError("Pixel format currently not supported")
-
-        return (shape, dtype, format)
+        return _GetImageFormat(pt, self.GetWidth(), self.GetHeight())
 
     @needs_numpy
-    def GetArray(self, raw = False):
+    def GetArray(self, raw = False, out = None):
+        '''
+        Get a numpy array holding a copy of the image data.
+        If 'out' is given, the data is copied into this caller owned array,
+        which must have the shape and dtype of the image, and 'out' is returned.
+        '''
 
         # Raw case => Simple byte wrapping of buffer
         if raw:
+            if out is not None:
+                address, size, stride = _GetOutArrayInfo(out, (self.GetPayloadSize(),), _pylon_numpy.uint8)
+                self._CopyBufferTo(address, size)
+                return out
             shape, dtype, format = ( self.GetPayloadSize() ), _pylon_numpy.uint8, "B"
             buf = self.GetBuffer()
             return _pylon_numpy.ndarray(shape, dtype = dtype, buffer=buf)
 
         pt = self.GetPixelType()
-        if IsPacked(pt):
-            buf, new_pt = self._Unpack10or12BitPacked()
-            shape, dtype, format = self.GetImageFormat(new_pt)
+        width = self.GetWidth()
+        descriptor = _pixel_format_registry.get(pt)
+        if descriptor is not None and descriptor.packed:
+            # Unpack straight into the destination array, the GIL is released meanwhile.
+            shape, dtype, format = _GetImageFormat(descriptor.unpackedType, width, self.GetHeight())
+            if out is None:
+                out = _pylon_numpy.empty(shape, dtype = dtype)
+            address, size, stride = _GetOutArrayInfo(out, shape, dtype)
+            self._UnpackTo(address, size, stride)
+            return out
         else:
-            shape, dtype, format = self.GetImageFormat(pt)
+            shape, dtype, format = _GetImageFormat(pt, width, self.GetHeight())
+            if out is not None:
+                # Single copy into the caller's array, the GIL is released meanwhile.
+                address, size, stride = _GetOutArrayInfo(out, shape, dtype)
+                self._CopyImageTo(address, size, stride)
+                return out
             buf = self.GetImageBuffer()
-
-        strides = None
-        if self.PaddingX > 0:
-            # If padding is present, we need to calculate the strides
-            # strides = (bytes per row, bytes per pixel)
-            strides = self.Width * _pylon_numpy.dtype(dtype).itemsize + self.PaddingX, _pylon_numpy.dtype(dtype).itemsize
+            # Lines may be padded, the strides skip the padding bytes.
+            strides = _GetImageStrides(pt, width, self.GetPaddingX())
 
         # Now we will copy the data into an array:
         return _pylon_numpy.ndarray(shape, dtype = dtype, buffer=buf, strides=strides)
 
+    @needs_numpy
+    def __array__(self, dtype = None, copy = None):
+        '''
+        Export the image data to numpy without a copy, e.g. by numpy.asarray(obj).
+        The array holds a reference to the grab result, so the data stays valid after
+        releasing this GrabResult. The buffer is returned to the camera when the last
+        array referencing it is deleted.
+        Packed pixel formats are unpacked into a new array.
+        '''
+        return _ExportArray(self, GrabResult(self), self._GetBufferAddress(), self.GetImageSize(), dtype, copy)
+
+    def __buffer__(self, flags):
+        return _ExportBuffer(self)
+
+    @needs_numpy
+    def __dlpack__(self, *, stream = None, max_version = None, dl_device = None, copy = None):
+        '''
+        Export the image data as DLPack capsule, e.g. for torch.from_dlpack(obj).
+        The capsule keeps the grab result alive until the consumer releases it.
+        '''
+        return _ExportDLPack(self, stream, dl_device, copy)
+
+    def __dlpack_device__(self):
+        return (_DLPACK_CPU, 0)
+
+    def GetMetadata(self, out = None, index = 0):
+        '''
+        Get time stamp, ids, image number, block id, geometry, pixel type, error
+        code, grab status and camera context as GrabResultMetadata in one call.
+        If 'out' is given, a structured array of GrabResultMetadataDtype, the
+        record is written to out[index] instead and 'out' is returned.
+        '''
+        if out is None:
+            return GrabResultMetadata._make(self._GetMetadataTuple())
+        if not isinstance(out, _pylon_numpy.ndarray):
+            raise TypeError("out must be a numpy.ndarray")
+        if out.ndim != 1:
+            raise ValueError("out must be one dimensional")
+        if index < 0:
+            index += len(out)
+        if not 0 <= index < len(out):
+            raise IndexError("index out of range")
+        address, size, stride = _GetOutArrayInfo(out[index:index + 1], (1,), GrabResultMetadataDtype)
+        self._FillMetadata(address, size, GrabResultMetadataDtype.itemsize)
+        return out
+
     def GetChunkNode( self, nodeName ):
         return self.GetChunkDataNodeMap().GetNode(nodeName)
 
@@ -156,16 +170,20 @@
 
         # For packed formats, we cannot zero-copy, so use GetArray
         pt = self.GetPixelType()
-        if IsPacked(pt):
+        descriptor = _pixel_format_registry.get(pt)
+        if descriptor is not None and descriptor.packed:
             yield self.GetArray()
             return
 
         mv = self.GetImageMemoryView()
-        if not raw:
-            shape, dtype, format = self.GetImageFormat()
-            mv = mv.cast(format, shape)
-
-        ar = _pylon_numpy.asarray(mv)
+        if raw:
+            ar = _pylon_numpy.asarray(mv)
+        else:
+            # Lines may be padded, the strides skip the padding bytes.
+            width = self.GetWidth()
+            shape, dtype, format = _GetImageFormat(pt, width, self.GetHeight())
+            strides = _GetImageStrides(pt, width, self.GetPaddingX())
+            ar = _pylon_numpy.ndarray(shape, dtype = dtype, buffer=mv, strides=strides)
 
         # trace external references to array
         initial_refcount = sys.getrefcount(ar)
@@ -181,6 +199,45 @@
         mv.release()
 
 %}
+
+    // Export as DLPack capsule keeping a copy of the grab result alive, see __dlpack__.
+    // Creates Python objects, so the GIL must be held.
+    %nothread _GetDLPackCapsule;
+    PyObject* _GetDLPackCapsule(
+        int ndim, size_t shape0, size_t shape1, size_t shape2,
+        size_t stride0, size_t stride1, size_t stride2,
+        int typeCode, int bits, PyObject* keepalive
+        )
+    {
+        const size_t shape[3] = {shape0, shape1, shape2};
+        const size_t strides[3] = {stride0, stride1, stride2};
+        return PylonCreateDLPackCapsule(
+            *$self, (*$self)->GetBuffer(), keepalive,
+            ndim, shape, strides, typeCode, bits
+            );
+    }
+
+    // One call snapshots of the per frame information, see GetMetadata.
+    %nothread _GetMetadataTuple;
+    PyObject* _GetMetadataTuple()
+    {
+        if (!$self->IsValid())
+        {
+            throw RUNTIME_EXCEPTION("The grab result is invalid.");
+        }
+        PylonGrabResultMetadata m;
+        PylonFillGrabResultMetadata(m, *$self);
+        return PylonGrabResultMetadataToTuple(m);
+    }
+
+    void _FillMetadata(size_t address, size_t size, size_t itemSize)
+    {
+        if (!$self->IsValid())
+        {
+            throw RUNTIME_EXCEPTION("The grab result is invalid.");
+        }
+        PylonFillGrabResultMetadataTo(address, size, itemSize, $self, 1);
+    }
 }
 
 %include <pylon/GrabResultPtr.h>;
@@ -0,0 +1,381 @@
+%{
+namespace Pylon
+{
+    // Counts the grab results retrieved from a camera, fed by a
+    // CGrabStatisticsHandler registered with the camera. The counters are
+    // atomics updated by the retrieving thread, so reading them never blocks
+    // grabbing. No node is read per result, the buffer
+    // counts are sampled every BufferSampleInterval results and when the
+    // statistics are read.
+    //
+    // The latency from a result becoming ready until it is retrieved is
+    // derived from the timestamp of the result. The offset between the
+    // camera clock and the host clock is estimated as the smallest
+    // difference seen, so latencies are relative to the fastest retrieval.
+    // Results without a timestamp aren't added to the latency histogram.
+    class CGrabStatisticsCollector
+    {
+    public:
+        enum { NumLatencyBuckets = 14, BufferSampleInterval = 256 };
+
+        // Upper bounds of the latency buckets in microseconds, the last
+        // bucket has no bound.
+        static const unsigned long long* GetLatencyBoundsUs()
+        {
+            static const unsigned long long bounds[NumLatencyBuckets - 1] = {
+                100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000, 500000, 1000000
+                };
+            return bounds;
+        }
+
+        CGrabStatisticsCollector()
+            : m_registered(false)
+        {
+            Reset();
+        }
+
+        // Returns true if the caller is to register a handler feeding the
+        // collector, false if one is registered already.
+        bool BeginRegistration()
+        {
+            bool registered = false;
+            return m_registered.compare_exchange_strong(registered, true);
+        }
+
+        // Called when the handler has been deregistered or its registration
+        // failed.
+        void EndRegistration()
+        {
+            m_registered = false;
+        }
+
+        void OnImagesSkipped(CInstantCamera& /*camera*/, size_t countOfSkippedImages)
+        {
+            m_skipped += countOfSkippedImages;
+        }
+
+        void OnImageGrabbed(CInstantCamera& camera, const CGrabResultPtr& grabResult)
+        {
+            const long long nowNs = static_cast<long long>(
+                std::chrono::duration_cast<std::chrono::nanoseconds>(std::chrono::steady_clock::now().time_since_epoch()).count());
+            const unsigned long long retrieved = ++m_retrieved;
+            if (!grabResult->GrabSucceeded())
+            {
+                ++m_failed;
+            }
+            if (retrieved % BufferSampleInterval == 1)
+            {
+                SampleBufferCounts(camera);
+            }
+
+            const uint64_t timeStamp = grabResult->GetTimeStamp();
+            if (timeStamp == 0)
+            {
+                return;
+            }
+            unsigned long long latencyUs;
+            {
+                std::lock_guard<std::mutex> guard(m_clockLock);
+                if (m_tickFrequency == 0)
+                {
+                    m_tickFrequency = GetTickFrequency(camera);
+                }
+                // The camera clock went backwards, e.g. the camera has been
+                // reset, the offset must be estimated again.
+                if (timeStamp < m_lastTimeStamp)
+                {
+                    m_hasOffset = false;
+                }
+                m_lastTimeStamp = timeStamp;
+                const long long readyNs = static_cast<long long>(
+                    static_cast<double>(timeStamp) * 1e9 / static_cast<double>(m_tickFrequency));
+                const long long offsetNs = nowNs - readyNs;
+                if (!m_hasOffset || offsetNs < m_offsetNs)
+                {
+                    m_offsetNs = offsetNs;
+                    m_hasOffset = true;
+                }
+                latencyUs = static_cast<unsigned long long>((offsetNs - m_offsetNs) / 1000);
+            }
+            const unsigned long long* bounds = GetLatencyBoundsUs();
+            size_t bucket = 0;
+            while (bucket < NumLatencyBuckets - 1 && latencyUs > bounds[bucket])
+            {
+                ++bucket;
+            }
+            ++m_latencyCounts[bucket];
+            m_latencySumUs += latencyUs;
+        }
+
+        void Reset()
+        {
+            m_retrieved = 0;
+            m_failed = 0;
+            m_skipped = 0;
+            m_maxReadyBuffers = 0;
+            m_maxEmptyBuffers = 0;
+            m_latencySumUs = 0;
+            for (size_t i = 0; i < NumLatencyBuckets; ++i)
+            {
+                m_latencyCounts[i] = 0;
+            }
+            std::lock_guard<std::mutex> guard(m_clockLock);
+            m_tickFrequency = 0;
+            m_lastTimeStamp = 0;
+            m_offsetNs = 0;
+            m_hasOffset = false;
+        }
+
+        // Updates the high-water marks of the buffer counts of 'camera'.
+        void SampleBufferCounts(CInstantCamera& camera)
+        {
+            UpdateMax(m_maxReadyBuffers, GetNodeValue(camera.NumReadyBuffers));
+            UpdateMax(m_maxEmptyBuffers, GetNodeValue(camera.NumEmptyBuffers));
+        }
+
+        // Returns (numRetrieved, numFailed, numSkipped, maxNumReadyBuffers,
+        // maxNumEmptyBuffers, latencySumUs, latencyBoundsUs, latencyCounts).
+        PyObject* _GetCounters()
+        {
+            PyObject* bounds = PyTuple_New(NumLatencyBuckets - 1);
+            PyObject* counts = PyTuple_New(NumLatencyBuckets);
+            for (size_t i = 0; i < NumLatencyBuckets; ++i)
+            {
+                if (i < NumLatencyBuckets - 1)
+                {
+                    PyTuple_SetItem(bounds, i, PyLong_FromUnsignedLongLong(GetLatencyBoundsUs()[i]));
+                }
+                PyTuple_SetItem(counts, i, PyLong_FromUnsignedLongLong(m_latencyCounts[i].load()));
+            }
+            return Py_BuildValue(
+                "(KKKKKKNN)",
+                m_retrieved.load(), m_failed.load(), m_skipped.load(),
+                m_maxReadyBuffers.load(), m_maxEmptyBuffers.load(), m_latencySumUs.load(),
+                bounds, counts
+                );
+        }
+
+    private:
+        CGrabStatisticsCollector(const CGrabStatisticsCollector&);
+        CGrabStatisticsCollector& operator=(const CGrabStatisticsCollector&);
+
+        static void UpdateMax(std::atomic<unsigned long long>& value, unsigned long long candidate)
+        {
+            unsigned long long current = value.load();
+            while (candidate > current && !value.compare_exchange_weak(current, candidate))
+            {
+            }
+        }
+
+        static unsigned long long GetNodeValue(GENAPI_NAMESPACE::IInteger& node)
+        {
+            try
+            {
+                return static_cast<unsigned long long>(node.GetValue());
+            }
+            catch (...)
+            {
+                return 0;
+            }
+        }
+
+        // Returns the ticks per second of the timestamps of 'camera'. GigE
+        // cameras report it, the timestamps of the others are nanoseconds.
+        static uint64_t GetTickFrequency(CInstantCamera& camera)
+        {
+            try
+            {
+                GENAPI_NAMESPACE::IInteger* node = dynamic_cast<GENAPI_NAMESPACE::IInteger*>(
+                    camera.GetNodeMap().GetNode("GevTimestampTickFrequency"));
+                if (GENAPI_NAMESPACE::IsReadable(node) && node->GetValue() > 0)
+                {
+                    return static_cast<uint64_t>(node->GetValue());
+                }
+            }
+            catch (...)
+            {
+            }
+            return 1000000000;
+        }
+
+        std::atomic<bool> m_registered;
+        std::mutex m_clockLock;
+        uint64_t m_tickFrequency;
+        uint64_t m_lastTimeStamp;
+        long long m_offsetNs;
+        bool m_hasOffset;
+
+        std::atomic<unsigned long long> m_retrieved;
+        std::atomic<unsigned long long> m_failed;
+        std::atomic<unsigned long long> m_skipped;
+        std::atomic<unsigned long long> m_maxReadyBuffers;
+        std::atomic<unsigned long long> m_maxEmptyBuffers;
+        std::atomic<unsigned long long> m_latencySumUs;
+        std::atomic<unsigned long long> m_latencyCounts[NumLatencyBuckets];
+    };
+
+    // Image event handler feeding the results of a camera into its
+    // collector. Owned by the camera, the collector is shared with the
+    // state the wrapper keeps for the camera.
+    class CGrabStatisticsHandler : public CImageEventHandler
+    {
+    public:
+        explicit CGrabStatisticsHandler(const std::shared_ptr<CGrabStatisticsCollector>& collector)
+            : m_collector(collector)
+        {
+        }
+
+        virtual ~CGrabStatisticsHandler()
+        {
+            // e.g. replaced by RegistrationMode_ReplaceAll, enabling the
+            // statistics again registers a new handler.
+            m_collector->EndRegistration();
+        }
+
+        virtual void OnImagesSkipped(CInstantCamera& camera, size_t countOfSkippedImages)
+        {
+            m_collector->OnImagesSkipped(camera, countOfSkippedImages);
+        }
+
+        virtual void OnImageGrabbed(CInstantCamera& camera, const CGrabResultPtr& grabResult)
+        {
+            m_collector->OnImageGrabbed(camera, grabResult);
+        }
+
+    private:
+        std::shared_ptr<CGrabStatisticsCollector> m_collector;
+    };
+}
+%}
+
+%nothread Pylon::CInstantCamera::_GetGrabStatisticsCounters;
+
+%extend Pylon::CInstantCamera {
+    // The collector is kept in the state of the native camera, so all proxies
+    // of the camera share it.
+    void _EnableGrabStatistics()
+    {
+        std::shared_ptr<CGrabStatisticsCollector> collector;
+        bool registration = false;
+        PylonCameraStates::Update($self, [&](PylonCameraState& state)
+        {
+            if (!state.grabStatistics)
+            {
+                state.grabStatistics = std::make_shared<CGrabStatisticsCollector>();
+            }
+            collector = state.grabStatistics;
+            registration = collector->BeginRegistration();
+        });
+        if (registration)
+        {
+            // Registered without holding the lock of the camera states.
+            try
+            {
+                $self->RegisterImageEventHandler(new CGrabStatisticsHandler(collector), RegistrationMode_Append, Cleanup_Delete);
+            }
+            catch (...)
+            {
+                collector->EndRegistration();
+                throw;
+            }
+        }
+    }
+
+    void _SampleGrabStatistics()
+    {
+        std::shared_ptr<CGrabStatisticsCollector> collector = PylonCameraStates::GetGrabStatistics($self);
+        if (collector && $self->IsOpen())
+        {
+            collector->SampleBufferCounts(*$self);
+        }
+    }
+
+    void _ResetGrabStatistics()
+    {
+        std::shared_ptr<CGrabStatisticsCollector> collector = PylonCameraStates::GetGrabStatistics($self);
+        if (collector)
+        {
+            collector->Reset();
+        }
+    }
+
+    // Returns the counters, see CGrabStatisticsCollector::_GetCounters, or
+    // None if the statistics aren't enabled.
+    PyObject* _GetGrabStatisticsCounters()
+    {
+        std::shared_ptr<CGrabStatisticsCollector> collector = PylonCameraStates::GetGrabStatistics($self);
+        if (!collector)
+        {
+            Py_RETURN_NONE;
+        }
+        return collector->_GetCounters();
+    }
+}
+
+%pythoncode %{
+import threading
+
+class GrabStatistics(_namedtuple("GrabStatistics", (
+        "numRetrieved", "numDelivered", "numFailed", "numSkipped", "numRequeued",
+        "maxNumReadyBuffers", "maxNumEmptyBuffers",
+        "latencyBoundsUs", "latencyCounts", "latencySumUs"
+        ))):
+    '''
+    Grab statistics of a camera, see InstantCamera.GetGrabStatistics.
+    'latencyCounts[i]' is the number of results that were retrieved at most
+    'latencyBoundsUs[i]' microseconds after they became ready, the last
+    count has no upper bound. The latency is derived from the timestamps of
+    the results relative to the fastest retrieval seen, results without a
+    timestamp aren't counted. The buffer high-water marks are sampled every
+    256 results and when the statistics are read.
+    '''
+    __slots__ = ()
+
+    def AsDict(self):
+        d = self._asdict()
+        d["latencyBoundsUs"] = list(self.latencyBoundsUs)
+        d["latencyCounts"] = list(self.latencyCounts)
+        return d
+
+    def ToPrometheus(self, prefix = "pypylon_grab", labels = None):
+        '''
+        Return the statistics in the Prometheus text exposition format.
+        'labels' is a dict of labels added to every sample.
+        '''
+        def format_labels(extra = None):
+            items = dict(labels or {})
+            items.update(extra or {})
+            if not items:
+                return ""
+            escaped = (
+                '%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+                for k, v in sorted(items.items())
+                )
+            return "{" + ",".join(escaped) + "}"
+
+        lines = [
+            "# HELP %s_frames_total Grab results by outcome." % prefix,
+            "# TYPE %s_frames_total counter" % prefix,
+            ]
+        for outcome, value in (
+                ("retrieved", self.numRetrieved), ("delivered", self.numDelivered),
+                ("failed", self.numFailed), ("skipped", self.numSkipped), ("requeued", self.numRequeued)):
+            lines.append("%s_frames_total%s %d" % (prefix, format_labels({"outcome": outcome}), value))
+        for name, value, text in (
+                ("ready_buffers_max", self.maxNumReadyBuffers, "High-water mark of NumReadyBuffers."),
+                ("empty_buffers_max", self.maxNumEmptyBuffers, "High-water mark of NumEmptyBuffers.")):
+            lines.append("# HELP %s_%s %s" % (prefix, name, text))
+            lines.append("# TYPE %s_%s gauge" % (prefix, name))
+            lines.append("%s_%s%s %d" % (prefix, name, format_labels(), value))
+        name = prefix + "_delivery_latency_seconds"
+        lines.append("# HELP %s Time from a buffer becoming ready until it was retrieved." % name)
+        lines.append("# TYPE %s histogram" % name)
+        cumulative = 0
+        for bound, count in zip(tuple(self.latencyBoundsUs) + (None,), self.latencyCounts):
+            cumulative += count
+            le = "+Inf" if bound is None else repr(bound / 1e6)
+            lines.append("%s_bucket%s %d" % (name, format_labels({"le": le}), cumulative))
+        lines.append("%s_sum%s %r" % (name, format_labels(), self.latencySumUs / 1e6))
+        lines.append("%s_count%s %d" % (name, format_labels(), cumulative))
+        return "\n".join(lines) + "\n"
+%}
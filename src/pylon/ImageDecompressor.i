@@ -90,7 +90,9 @@
 %extend Pylon::CImageDecompressor {
     // Since all wrapped functions access Python objects, they must not be
     // called without the GIL being held. Therefore we have to tell SWIG not
-    // to release the GIL when calling them (%nothread).
+    // to release the GIL when calling them (%nothread). Decompressing a grab
+    // result releases it, a bytearray passed in could be resized by another
+    // thread, so decompressing from a buffer keeps it.
     %nothread SetCompressionDescriptor;
     %nothread GetCompressionInfo;
     %nothread ComputeCompressionDescriptorHash;
@@ -167,6 +169,7 @@
         Pylon::CPylonImage *image = new Pylon::CPylonImage();
         try
         {
+            PylonGilRelease release;
             $self->DecompressImage(*image, grabResult);
         }
         catch (const GenericException&)
@@ -5,6 +5,380 @@
 %clear Pylon::CGrabResultPtr& grabResult;
 %include <pylon/ImageEventHandler.h>
 
+%{
+namespace Pylon
+{
+    // Image event handler collecting the results delivered by the grab loop
+    // thread and passing them in batches to OnImagesGrabbed. A batch is
+    // dispatched when it holds 'maxBatchSize' results or its oldest result
+    // has waited for 'maxDelayUs' microseconds. OnImagesGrabbed is called
+    // from a dispatcher thread of the handler, so the GIL is acquired once per
+    // batch instead of once per frame.
+    //
+    // The dispatcher thread is never joined, since the handler may be
+    // deregistered or destroyed by a thread holding the GIL while the
+    // dispatcher waits for it. The dispatcher shares its state with the
+    // handler and stops calling it once the handler has been destroyed.
+    class CBatchingImageEventHandler : public CImageEventHandler
+    {
+    public:
+        CBatchingImageEventHandler(size_t maxBatchSize = 16, unsigned int maxDelayUs = 1000)
+        {
+            if (maxBatchSize == 0)
+            {
+                throw INVALID_ARGUMENT_EXCEPTION("The maximum batch size must not be zero.");
+            }
+            m_state = std::make_shared<State>(this, maxBatchSize, std::chrono::microseconds(maxDelayUs));
+            ResetStatistics();
+        }
+
+        virtual ~CBatchingImageEventHandler()
+        {
+            State& s = *m_state;
+            std::unique_lock<std::mutex> lock(s.lock);
+            s.handler = NULL;
+            s.pending.clear();
+            s.condition.notify_all();
+            // A running callback uses the handler. It can't be running while
+            // Python destroys the handler, since it references it.
+            if (s.dispatcherId != std::this_thread::get_id())
+            {
+                s.condition.wait(lock, [&s] { return s.callbackCamera == NULL; });
+            }
+        }
+
+        // Override this to receive the grab results. Called with the GIL held.
+        virtual void OnImagesGrabbed(CInstantCamera& /*camera*/, const std::vector<CGrabResultPtr>& /*grabResults*/)
+        {
+        }
+
+        // Called by the grab loop thread. Only queues the result, no Python
+        // code is involved.
+        virtual void OnImageGrabbed(CInstantCamera& camera, const CGrabResultPtr& grabResult)
+        {
+            Pending pending = {&camera, grabResult, std::chrono::steady_clock::now()};
+            State& s = *m_state;
+            std::lock_guard<std::mutex> guard(s.lock);
+            if (!s.running)
+            {
+                s.running = true;
+                std::thread(&CBatchingImageEventHandler::Run, m_state).detach();
+            }
+            s.pending.push_back(pending);
+            // The dispatcher only needs to wake up to start the timer of a
+            // new batch or when the batch is full.
+            if (s.pending.size() == 1 || s.pending.size() >= s.maxBatchSize)
+            {
+                s.condition.notify_all();
+            }
+        }
+
+        virtual void OnImageEventHandlerRegistered(CInstantCamera& camera)
+        {
+            std::lock_guard<std::mutex> guard(m_state->lock);
+            ++m_state->cameras[&camera];
+        }
+
+        // Results of 'camera' that haven't been dispatched yet are dropped, the
+        // camera may be about to be destroyed. Waits for a running callback
+        // for 'camera' unless called by it. The dispatcher thread ends when
+        // the handler has been deregistered from all cameras.
+        virtual void OnImageEventHandlerDeregistered(CInstantCamera& camera)
+        {
+            State& s = *m_state;
+            std::unique_lock<std::mutex> lock(s.lock);
+            std::map<CInstantCamera*, size_t>::iterator it = s.cameras.find(&camera);
+            if (it != s.cameras.end() && --it->second == 0)
+            {
+                s.cameras.erase(it);
+                s.pending.erase(
+                    std::remove_if(s.pending.begin(), s.pending.end(), [&camera](const Pending& p) { return p.camera == &camera; }),
+                    s.pending.end());
+            }
+            s.condition.notify_all();
+            if (s.dispatcherId != std::this_thread::get_id())
+            {
+                s.condition.wait(lock, [&s, &camera] { return s.callbackCamera != &camera; });
+            }
+        }
+
+        size_t GetMaxBatchSize() const
+        {
+            return m_state->maxBatchSize;
+        }
+
+        unsigned int GetMaxDelayUs() const
+        {
+            return static_cast<unsigned int>(m_state->maxDelay.count());
+        }
+
+        size_t GetNumPending()
+        {
+            std::lock_guard<std::mutex> guard(m_state->lock);
+            return m_state->pending.size();
+        }
+
+        void ResetStatistics()
+        {
+            std::lock_guard<std::mutex> guard(m_state->lock);
+            memset(&m_state->statistics, 0, sizeof(m_state->statistics));
+        }
+
+        // Returns (numBatches, numFrames, maxBatchSize, sumLatencyUs,
+        // maxLatencyUs, sumCallbackUs, maxCallbackUs, numErrors).
+        PyObject* _GetStatistics()
+        {
+            Statistics s;
+            {
+                std::lock_guard<std::mutex> guard(m_state->lock);
+                s = m_state->statistics;
+            }
+            return Py_BuildValue(
+                "(KKKKKKKK)",
+                s.numBatches, s.numFrames, s.maxBatchSize, s.sumLatencyUs,
+                s.maxLatencyUs, s.sumCallbackUs, s.maxCallbackUs, s.numErrors
+                );
+        }
+
+    private:
+        CBatchingImageEventHandler(const CBatchingImageEventHandler&);
+        CBatchingImageEventHandler& operator=(const CBatchingImageEventHandler&);
+
+        typedef std::chrono::steady_clock::time_point TimePoint;
+
+        struct Pending
+        {
+            CInstantCamera* camera;
+            CGrabResultPtr result;
+            TimePoint arrival;
+        };
+
+        struct Statistics
+        {
+            unsigned long long numBatches;
+            unsigned long long numFrames;
+            unsigned long long maxBatchSize;
+            unsigned long long sumLatencyUs;
+            unsigned long long maxLatencyUs;
+            unsigned long long sumCallbackUs;
+            unsigned long long maxCallbackUs;
+            unsigned long long numErrors;
+        };
+
+        // Shared by the handler and its dispatcher thread, guarded by 'lock'.
+        struct State
+        {
+            State(CBatchingImageEventHandler* handler_, size_t maxBatchSize_, std::chrono::microseconds maxDelay_)
+                : maxBatchSize(maxBatchSize_), maxDelay(maxDelay_), handler(handler_)
+                , running(false), callbackCamera(NULL)
+            {
+            }
+
+            const size_t maxBatchSize;
+            const std::chrono::microseconds maxDelay;
+            std::mutex lock;
+            std::condition_variable condition;
+            std::deque<Pending> pending;
+            // NULL once the handler has been destroyed
+            CBatchingImageEventHandler* handler;
+            // registration count per camera
+            std::map<CInstantCamera*, size_t> cameras;
+            bool running;
+            std::thread::id dispatcherId;
+            // the camera of the running callback
+            CInstantCamera* callbackCamera;
+            Statistics statistics;
+        };
+
+        static unsigned long long Microseconds(const std::chrono::steady_clock::duration& d)
+        {
+            return static_cast<unsigned long long>(std::chrono::duration_cast<std::chrono::microseconds>(d).count());
+        }
+
+        static void Run(std::shared_ptr<State> state)
+        {
+            State& s = *state;
+            std::unique_lock<std::mutex> lock(s.lock);
+            s.dispatcherId = std::this_thread::get_id();
+            std::vector<CGrabResultPtr> results;
+            std::vector<TimePoint> arrivals;
+            for (;;)
+            {
+                if (s.handler == NULL || s.cameras.empty())
+                {
+                    s.pending.clear();
+                    s.running = false;
+                    s.dispatcherId = std::thread::id();
+                    return;
+                }
+                if (s.pending.empty())
+                {
+                    s.condition.wait(lock);
+                    continue;
+                }
+                const TimePoint due = s.pending.front().arrival + s.maxDelay;
+                if (s.pending.size() < s.maxBatchSize && std::chrono::steady_clock::now() < due)
+                {
+                    s.condition.wait_until(lock, due);
+                    continue;
+                }
+
+                // A batch only holds results of one camera.
+                CInstantCamera* camera = s.pending.front().camera;
+                while (!s.pending.empty() && results.size() < s.maxBatchSize && s.pending.front().camera == camera)
+                {
+                    results.push_back(s.pending.front().result);
+                    arrivals.push_back(s.pending.front().arrival);
+                    s.pending.pop_front();
+                }
+                lock.unlock();
+                Dispatch(s, *camera, results, arrivals);
+                results.clear();
+                arrivals.clear();
+                lock.lock();
+            }
+        }
+
+        static void Dispatch(State& s, CInstantCamera& camera, const std::vector<CGrabResultPtr>& results, const std::vector<TimePoint>& arrivals)
+        {
+            if (!Py_IsInitialized())
+            {
+                return;
+            }
+            PyGILState_STATE gil = PyGILState_Ensure();
+            CBatchingImageEventHandler* handler;
+            {
+                // The handler may have been destroyed or deregistered from
+                // the camera while waiting for the GIL.
+                std::lock_guard<std::mutex> guard(s.lock);
+                handler = s.cameras.count(&camera) != 0 ? s.handler : NULL;
+                s.callbackCamera = handler != NULL ? &camera : NULL;
+            }
+            if (handler == NULL)
+            {
+                PyGILState_Release(gil);
+                return;
+            }
+            bool failed = false;
+            const TimePoint start = std::chrono::steady_clock::now();
+            try
+            {
+                handler->OnImagesGrabbed(camera, results);
+            }
+            catch (...)
+            {
+                failed = true;
+            }
+            if (PyErr_Occurred())
+            {
+                failed = true;
+                PyErr_WriteUnraisable(NULL);
+            }
+            const TimePoint end = std::chrono::steady_clock::now();
+
+            // The latency includes waiting for the GIL. The statistics are
+            // updated before a waiting deregistration continues.
+            {
+                std::lock_guard<std::mutex> guard(s.lock);
+                Statistics& st = s.statistics;
+                st.numBatches += 1;
+                st.numFrames += results.size();
+                st.maxBatchSize = std::max<unsigned long long>(st.maxBatchSize, results.size());
+                for (size_t i = 0; i < arrivals.size(); ++i)
+                {
+                    const unsigned long long latency = Microseconds(start - arrivals[i]);
+                    st.sumLatencyUs += latency;
+                    st.maxLatencyUs = std::max(st.maxLatencyUs, latency);
+                }
+                const unsigned long long callback = Microseconds(end - start);
+                st.sumCallbackUs += callback;
+                st.maxCallbackUs = std::max(st.maxCallbackUs, callback);
+                if (failed)
+                {
+                    st.numErrors += 1;
+                }
+                s.callbackCamera = NULL;
+            }
+            s.condition.notify_all();
+            PyGILState_Release(gil);
+        }
+
+        std::shared_ptr<State> m_state;
+    };
+}
+%}
+
+%rename(BatchingImageEventHandler) Pylon::CBatchingImageEventHandler;
+%feature("director") Pylon::CBatchingImageEventHandler;
+// The grab loop thread must not call into Python for every frame, so these
+// stay C++ only.
+%feature("nodirector") Pylon::CBatchingImageEventHandler::OnImageGrabbed;
+%feature("nodirector") Pylon::CBatchingImageEventHandler::OnImageEventHandlerRegistered;
+%feature("nodirector") Pylon::CBatchingImageEventHandler::OnImageEventHandlerDeregistered;
+%nothread Pylon::CBatchingImageEventHandler::_GetStatistics;
+
+%typemap(directorin) const std::vector<Pylon::CGrabResultPtr>& grabResults {
+    $input = PyList_New($1.size());
+    for (size_t i = 0; i < $1.size(); ++i)
+    {
+        PyList_SetItem($input, i, SWIG_NewPointerObj(new CGrabResultPtr($1[i]), $descriptor(Pylon::CGrabResultPtr*), SWIG_POINTER_OWN));
+    }
+}
+
+namespace Pylon
+{
+    class CBatchingImageEventHandler : public CImageEventHandler
+    {
+    public:
+        CBatchingImageEventHandler(size_t maxBatchSize = 16, unsigned int maxDelayUs = 1000);
+        virtual ~CBatchingImageEventHandler();
+        virtual void OnImagesGrabbed(CInstantCamera& camera, const std::vector<CGrabResultPtr>& grabResults);
+        virtual void OnImageGrabbed(CInstantCamera& camera, const CGrabResultPtr& grabResult);
+        virtual void OnImageEventHandlerRegistered(CInstantCamera& camera);
+        virtual void OnImageEventHandlerDeregistered(CInstantCamera& camera);
+        size_t GetMaxBatchSize() const;
+        unsigned int GetMaxDelayUs() const;
+        size_t GetNumPending();
+        void ResetStatistics();
+        PyObject* _GetStatistics();
+    };
+}
+
+%extend Pylon::CBatchingImageEventHandler {
+%pythoncode %{
+    def GetStatistics(self):
+        '''
+        Return the BatchDispatchStatistics collected since construction or the
+        last call of ResetStatistics. The latency of a frame is the time from
+        its arrival in the grab loop thread until OnImagesGrabbed is entered,
+        including waiting for the GIL.
+        '''
+        (numBatches, numFrames, maxBatchSize, sumLatencyUs,
+         maxLatencyUs, sumCallbackUs, maxCallbackUs, numErrors) = self._GetStatistics()
+        return BatchDispatchStatistics(
+            numBatches, numFrames, maxBatchSize,
+            numFrames / numBatches if numBatches else 0.0,
+            sumLatencyUs / numFrames if numFrames else 0.0,
+            maxLatencyUs,
+            sumCallbackUs / numBatches if numBatches else 0.0,
+            maxCallbackUs,
+            numErrors
+            )
+%}
+}
+
+%pythoncode %{
+class BatchDispatchStatistics(_namedtuple("BatchDispatchStatistics", (
+        "numBatches", "numFrames", "maxBatchSize", "meanBatchSize",
+        "meanLatencyUs", "maxLatencyUs", "meanCallbackUs", "maxCallbackUs", "numErrors"
+        ))):
+    '''
+    Batch sizes and dispatch latencies of a BatchingImageEventHandler, see
+    BatchingImageEventHandler.GetStatistics.
+    '''
+    __slots__ = ()
+%}
+
 // =========================================
 // = GrabResult smart ptr output
 
@@ -5,8 +5,498 @@
 // is not supported by SWIG.
 %ignore Pylon::CImageFormatConverter::IOutputPixelFormatEnum;
 
+%{
+// Checks that caller owned memory of 'size' bytes can hold the conversion
+// result of an image with the given properties.
+static void PylonCheckConversionBuffer(const CImageFormatConverter& converter, size_t size, EPixelType pt, uint32_t width, uint32_t height)
+{
+    const size_t required = converter.GetBufferSizeForConversion(pt, width, height);
+    if (size < required)
+    {
+        throw INVALID_ARGUMENT_EXCEPTION(
+            "Destination buffer is too small, %llu bytes are required, %llu are provided.",
+            static_cast<unsigned long long>(required), static_cast<unsigned long long>(size)
+            );
+    }
+}
+
+// Source image data of a conversion.
+struct PylonConversionSource
+{
+    explicit PylonConversionSource(const IImage& src)
+        : buffer(src.GetBuffer()), size(src.GetImageSize()), pixelType(src.GetPixelType())
+        , width(src.GetWidth()), height(src.GetHeight()), paddingX(src.GetPaddingX())
+        , orientation(src.GetOrientation())
+    {
+    }
+
+    explicit PylonConversionSource(const CGrabResultPtr& src)
+        : buffer(NULL), size(0), pixelType(PixelType_Undefined), width(0), height(0), paddingX(0)
+        , orientation(ImageOrientation_TopDown)
+    {
+        if (!src.IsValid())
+        {
+            throw INVALID_ARGUMENT_EXCEPTION("The grab result is invalid.");
+        }
+        buffer = src->GetBuffer();
+        size = src->GetImageSize();
+        pixelType = src->GetPixelType();
+        width = src->GetWidth();
+        height = src->GetHeight();
+        paddingX = src->GetPaddingX();
+    }
+
+    const void* buffer;
+    size_t size;
+    EPixelType pixelType;
+    uint32_t width;
+    uint32_t height;
+    size_t paddingX;
+    EImageOrientation orientation;
+};
+
+// Rows converted in addition above and below a band, so demosaicing sees the
+// same neighborhood as in a conversion of the whole image. Even, so every
+// band starts with the same Bayer phase.
+static const uint32_t PylonConversionHaloRows = 8;
+static const uint32_t PylonMinConversionBandRows = 64;
+
+// Copies the parameters that affect the conversion result.
+static void PylonCopyConverterParameters(CImageFormatConverter& dst, CImageFormatConverter& src)
+{
+    dst.OutputPixelFormat.SetValue(src.OutputPixelFormat.GetValue());
+    dst.OutputBitAlignment.SetIntValue(src.OutputBitAlignment.GetIntValue());
+    dst.MonoConversionMethod.SetIntValue(src.MonoConversionMethod.GetIntValue());
+    dst.InconvertibleEdgeHandling.SetIntValue(src.InconvertibleEdgeHandling.GetIntValue());
+    dst.Gamma.SetValue(src.Gamma.GetValue());
+    dst.AdditionalLeftShift.SetValue(src.AdditionalLeftShift.GetValue());
+    dst.OutputOrientation.SetIntValue(src.OutputOrientation.GetIntValue());
+    dst.OutputPaddingX.SetValue(src.OutputPaddingX.GetValue());
+}
+
+// Creates 'count' converters with the parameters of 'converter'. Called by
+// the thread owning 'converter', tasks of the pool use one clone each.
+static std::vector<std::unique_ptr<CImageFormatConverter> > PylonCloneConverters(CImageFormatConverter& converter, size_t count)
+{
+    std::vector<std::unique_ptr<CImageFormatConverter> > clones;
+    clones.reserve(count);
+    for (size_t i = 0; i < count; ++i)
+    {
+        clones.emplace_back(new CImageFormatConverter());
+        PylonCopyConverterParameters(*clones.back(), converter);
+    }
+    return clones;
+}
+
+// Converts 'src' into caller owned memory. With more than one thread, the
+// image is split into horizontal bands converted in parallel by the pool of
+// native threads. Every band is converted together with halo rows by its own
+// converter and only its own rows are copied to the destination, so the
+// result is identical to converting the whole image at once. Images that
+// can't be split, e.g. packed rows not starting at a byte boundary, are
+// converted by the calling thread.
+static void PylonConvertTo(CImageFormatConverter& converter, void* dst, size_t dstSize, const PylonConversionSource& src, size_t numThreads)
+{
+    PylonCheckConversionBuffer(converter, dstSize, src.pixelType, src.width, src.height);
+    if (numThreads == 0)
+    {
+        numThreads = PylonThreadPool::GetDefaultNumThreads();
+    }
+    const size_t required = converter.GetBufferSizeForConversion(src.pixelType, src.width, src.height);
+    const size_t numBands = std::min<size_t>(numThreads, src.height / PylonMinConversionBandRows);
+    const std::string outputOrientation = converter.OutputOrientation.ToString().c_str();
+    const bool splittable = numBands > 1
+        && src.orientation == ImageOrientation_TopDown
+        && (outputOrientation == "Unchanged" || outputOrientation == "TopDown")
+        && converter.OutputPaddingX.GetValue() == 0
+        && (static_cast<size_t>(BitPerPixel(src.pixelType)) * src.width) % 8 == 0
+        && required % src.height == 0;
+    if (!splittable)
+    {
+        converter.Convert(dst, dstSize, src.buffer, src.size, src.pixelType, src.width, src.height, src.paddingX, src.orientation);
+        return;
+    }
+
+    const size_t srcStride = PylonImageRowSize(src.pixelType, src.width) + src.paddingX;
+    const size_t dstStride = required / src.height;
+    // Bands start at even rows.
+    const uint32_t bandRows = static_cast<uint32_t>(((src.height + numBands - 1) / numBands + 1) & ~static_cast<size_t>(1));
+    const size_t numTasks = (src.height + bandRows - 1) / bandRows;
+    std::vector<std::unique_ptr<CImageFormatConverter> > converters = PylonCloneConverters(converter, numTasks);
+    PylonThreadPool::Instance().Run(numTasks, numThreads, [&](size_t band)
+    {
+        const uint32_t first = static_cast<uint32_t>(band * bandRows);
+        const uint32_t last = std::min(src.height, first + bandRows);
+        const uint32_t top = first - std::min(first, PylonConversionHaloRows);
+        const uint32_t bottom = std::min(src.height, last + PylonConversionHaloRows);
+        const size_t srcOffset = top * srcStride;
+        if (srcOffset >= src.size)
+        {
+            throw INVALID_ARGUMENT_EXCEPTION("The source buffer is too small for the image geometry.");
+        }
+
+        std::vector<uint8_t> buffer(dstStride * (bottom - top));
+        converters[band]->Convert(
+            buffer.data(), buffer.size(),
+            static_cast<const uint8_t*>(src.buffer) + srcOffset, std::min(src.size - srcOffset, srcStride * (bottom - top)),
+            src.pixelType, src.width, bottom - top, src.paddingX, ImageOrientation_TopDown
+            );
+        memcpy(
+            static_cast<uint8_t*>(dst) + first * dstStride,
+            buffer.data() + (first - top) * dstStride,
+            (last - first) * dstStride
+            );
+    });
+}
+
+// Converts into 'dst' after resetting it to the output format, its buffer is
+// reused if it is large enough.
+static void PylonConvertParallelInto(CImageFormatConverter& converter, CPylonImage& dst, const PylonConversionSource& src, size_t numThreads)
+{
+    dst.Reset(converter.OutputPixelFormat.GetValue(), src.width, src.height);
+    PylonConvertTo(converter, dst.GetBuffer(), dst.GetAllocatedBufferSize(), src, numThreads);
+}
+
+// A source of a batch conversion. A grab result is copied to keep its buffer
+// alive, an image is kept alive by the sequence holding it.
+struct PylonBatchItem
+{
+    PylonBatchItem() : image(NULL) {}
+
+    CGrabResultPtr result;
+    const IImage* image;
+    std::string error;
+};
+
+// Converts one source of a batch into 'frameSize' bytes at 'dst'. Returns an
+// empty string on success, the error message otherwise.
+static std::string PylonConvertBatchItem(CImageFormatConverter& converter, void* dst, size_t frameSize, const PylonBatchItem& item, uint32_t width, uint32_t height)
+{
+    if (!item.error.empty())
+    {
+        return item.error;
+    }
+    try
+    {
+        if (item.image == NULL)
+        {
+            if (!item.result.IsValid())
+            {
+                return "The grab result is invalid.";
+            }
+            if (!item.result->GrabSucceeded())
+            {
+                return std::string("The grab failed: ") + item.result->GetErrorDescription().c_str();
+            }
+        }
+        else if (!item.image->IsValid())
+        {
+            return "The image is invalid.";
+        }
+        const PylonConversionSource src = item.image == NULL ? PylonConversionSource(item.result) : PylonConversionSource(*item.image);
+        if (src.width != width || src.height != height)
+        {
+            return "The image size " + std::to_string(src.width) + "x" + std::to_string(src.height)
+                + " differs from the size of the batch " + std::to_string(width) + "x" + std::to_string(height) + ".";
+        }
+        PylonConvertTo(converter, dst, frameSize, src, 1);
+        return std::string();
+    }
+    catch (const GenericException& e)
+    {
+        return e.GetDescription();
+    }
+    catch (const std::exception& e)
+    {
+        return e.what();
+    }
+}
+
+// Converts every GrabResult or image of the sequence 'sources' of images of
+// 'width' x 'height' pixels into frames of 'frameSize' bytes, 'frameStride'
+// bytes apart, at 'address'. The frames are converted in parallel by up to
+// 'numThreads' threads without the GIL, one converter per thread. A source
+// that can't be converted doesn't stop the batch, its frame is zeroed.
+// Needs the GIL for accessing the sequence. Returns a dict mapping the index
+// of every failed source to its error message.
+static PyObject* PylonConvertBatchTo(
+    CImageFormatConverter& converter, PyObject* sources, size_t address, size_t size,
+    size_t frameStride, size_t frameSize, uint32_t width, uint32_t height, size_t numThreads)
+{
+    PyObject* seq = PySequence_Fast(sources, "sources must be a sequence of GrabResult or Image objects");
+    if (seq == NULL)
+    {
+        PyErr_Clear();
+        throw INVALID_ARGUMENT_EXCEPTION("sources must be a sequence of GrabResult or Image objects");
+    }
+    const size_t count = static_cast<size_t>(PySequence_Size(seq));
+    if (count > 0 && (frameStride < frameSize || size < frameStride * (count - 1) + frameSize))
+    {
+        Py_DECREF(seq);
+        throw INVALID_ARGUMENT_EXCEPTION("The destination buffer is too small for %llu frames.", static_cast<unsigned long long>(count));
+    }
+    std::vector<PylonBatchItem> items(count);
+    for (size_t i = 0; i < count; ++i)
+    {
+        PyObject* item = PySequence_GetItem(seq, static_cast<Py_ssize_t>(i));
+        void* argp = NULL;
+        if (item != NULL && SWIG_IsOK(SWIG_ConvertPtr(item, &argp, SWIGTYPE_p_Pylon__CGrabResultPtr, 0)) && argp != NULL)
+        {
+            items[i].result = *static_cast<CGrabResultPtr*>(argp);
+        }
+        else if (item != NULL && SWIG_IsOK(SWIG_ConvertPtr(item, &argp, SWIGTYPE_p_Pylon__IImage, 0)) && argp != NULL)
+        {
+            items[i].image = static_cast<const IImage*>(argp);
+        }
+        else
+        {
+            items[i].error = "Not a GrabResult or Image.";
+        }
+        // The sequence keeps the item alive.
+        Py_XDECREF(item);
+    }
+    PyErr_Clear();
+
+    std::vector<std::string> errors(count);
+    try
+    {
+        PylonGilRelease release;
+        if (numThreads == 0)
+        {
+            numThreads = PylonThreadPool::GetDefaultNumThreads();
+        }
+        const size_t numTasks = std::min(numThreads, count);
+        std::vector<std::unique_ptr<CImageFormatConverter> > converters;
+        if (numTasks > 1)
+        {
+            converters = PylonCloneConverters(converter, numTasks);
+        }
+        // Task t converts the frames t, t + numTasks, ...
+        PylonThreadPool::Instance().Run(numTasks, numThreads, [&](size_t task)
+        {
+            CImageFormatConverter& taskConverter = converters.empty() ? converter : *converters[task];
+            for (size_t i = task; i < count; i += numTasks)
+            {
+                uint8_t* frame = reinterpret_cast<uint8_t*>(address) + i * frameStride;
+                errors[i] = PylonConvertBatchItem(taskConverter, frame, frameSize, items[i], width, height);
+                if (!errors[i].empty())
+                {
+                    memset(frame, 0, frameSize);
+                }
+            }
+        });
+    }
+    catch (...)
+    {
+        Py_DECREF(seq);
+        throw;
+    }
+    Py_DECREF(seq);
+
+    PyObject* result = PyDict_New();
+    for (size_t i = 0; result != NULL && i < count; ++i)
+    {
+        if (errors[i].empty())
+        {
+            continue;
+        }
+        PyObject* key = PyLong_FromSize_t(i);
+        PyObject* value = PyUnicode_DecodeUTF8(errors[i].c_str(), static_cast<Py_ssize_t>(errors[i].size()), "replace");
+        if (key == NULL || value == NULL || PyDict_SetItem(result, key, value) != 0)
+        {
+            Py_CLEAR(result);
+        }
+        Py_XDECREF(key);
+        Py_XDECREF(value);
+    }
+    return result;
+}
+
+// A region of a fused conversion, laid out like the rows of the uint64 array
+// ImageFormatConverter.ConvertRegions passes. The converted region is written
+// to 'height' / scale rows of 'width' / scale pixels, 'rowStride' bytes apart,
+// at 'address'.
+struct PylonConversionRegion
+{
+    uint64_t x;
+    uint64_t y;
+    uint64_t width;
+    uint64_t height;
+    uint64_t address;
+    uint64_t size;
+    uint64_t rowStride;
+};
+
+// Averages blocks of 'scale' x 'scale' pixels of interleaved samples, rounded
+// to nearest.
+template <typename T>
+static void PylonDownscaleRows(
+    uint8_t* dst, size_t dstStride, const uint8_t* src, size_t srcStride,
+    size_t outWidth, size_t outHeight, size_t channels, uint32_t scale)
+{
+    const uint64_t count = static_cast<uint64_t>(scale) * scale;
+    for (size_t oy = 0; oy < outHeight; ++oy)
+    {
+        T* out = reinterpret_cast<T*>(dst + oy * dstStride);
+        const uint8_t* block = src + oy * scale * srcStride;
+        for (size_t ox = 0; ox < outWidth; ++ox)
+        {
+            for (size_t c = 0; c < channels; ++c)
+            {
+                uint64_t sum = 0;
+                for (uint32_t dy = 0; dy < scale; ++dy)
+                {
+                    const T* in = reinterpret_cast<const T*>(block + dy * srcStride) + ox * scale * channels + c;
+                    for (uint32_t dx = 0; dx < scale; ++dx)
+                    {
+                        sum += in[dx * channels];
+                    }
+                }
+                out[ox * channels + c] = static_cast<T>((sum + count / 2) / count);
+            }
+        }
+    }
+}
+
+// Converts 'region' of 'src' and downscales it by 'scale'. Only the region
+// and a margin of halo pixels are converted, so demosaicing sees the same
+// neighborhood as in a conversion of the whole image. The margin starts at
+// even coordinates to keep the Bayer phase. The converted samples are
+// 'bytesPerSample' (1 or 2) bytes wide and 'channels' make up a pixel.
+// 'temp' holds the converted margin and region.
+static void PylonConvertRegion(
+    CImageFormatConverter& converter, const PylonConversionSource& src, const PylonConversionRegion& region,
+    uint32_t scale, size_t channels, size_t bytesPerSample, std::vector<uint8_t>& temp)
+{
+    if (region.width == 0 || region.height == 0
+        || region.x >= src.width || region.width > src.width - region.x
+        || region.y >= src.height || region.height > src.height - region.y)
+    {
+        throw INVALID_ARGUMENT_EXCEPTION("The region is empty or exceeds the image.");
+    }
+    if (src.orientation != ImageOrientation_TopDown)
+    {
+        throw INVALID_ARGUMENT_EXCEPTION("Only top down images are supported.");
+    }
+    const uint32_t x = static_cast<uint32_t>(region.x);
+    const uint32_t y = static_cast<uint32_t>(region.y);
+    const uint32_t width = static_cast<uint32_t>(region.width);
+    const uint32_t height = static_cast<uint32_t>(region.height);
+    const size_t outWidth = width / scale;
+    const size_t outHeight = height / scale;
+    const size_t pixelSize = channels * bytesPerSample;
+    if (outWidth == 0 || outHeight == 0)
+    {
+        throw INVALID_ARGUMENT_EXCEPTION("The region is smaller than the scale factor.");
+    }
+    if (region.rowStride < outWidth * pixelSize || region.size < region.rowStride * (outHeight - 1) + outWidth * pixelSize)
+    {
+        throw INVALID_ARGUMENT_EXCEPTION("The destination buffer of the region is too small.");
+    }
+
+    // The margin must start and end at byte boundaries of packed formats,
+    // otherwise the whole row width is converted.
+    const size_t bitsPerPixel = BitPerPixel(src.pixelType);
+    uint32_t left = (x - std::min(x, PylonConversionHaloRows)) & ~1u;
+    uint32_t right = std::min(src.width, x + width + PylonConversionHaloRows);
+    const uint32_t top = (y - std::min(y, PylonConversionHaloRows)) & ~1u;
+    const uint32_t bottom = std::min(src.height, y + height + PylonConversionHaloRows);
+    if ((bitsPerPixel * left) % 8 != 0 || (bitsPerPixel * right) % 8 != 0)
+    {
+        left = 0;
+        right = src.width;
+    }
+    const uint32_t subWidth = right - left;
+    const uint32_t subHeight = bottom - top;
+    const size_t srcStride = PylonImageRowSize(src.pixelType, src.width) + src.paddingX;
+    const size_t subRowSize = PylonImageRowSize(src.pixelType, subWidth);
+    const size_t subOffset = top * srcStride + bitsPerPixel * left / 8;
+    const size_t subSize = srcStride * (subHeight - 1) + subRowSize;
+    if (subOffset + subSize > src.size)
+    {
+        throw INVALID_ARGUMENT_EXCEPTION("The source buffer is too small for the image geometry.");
+    }
+
+    const size_t required = converter.GetBufferSizeForConversion(src.pixelType, subWidth, subHeight);
+    const size_t tempStride = required / subHeight;
+    if (required % subHeight != 0 || tempStride < subWidth * pixelSize)
+    {
+        throw INVALID_ARGUMENT_EXCEPTION("The output format of the converter doesn't match the destination of the region.");
+    }
+    temp.resize(required);
+    converter.Convert(
+        temp.data(), temp.size(),
+        static_cast<const uint8_t*>(src.buffer) + subOffset, subSize,
+        src.pixelType, subWidth, subHeight, srcStride - subRowSize, ImageOrientation_TopDown
+        );
+
+    uint8_t* dst = reinterpret_cast<uint8_t*>(static_cast<size_t>(region.address));
+    const uint8_t* converted = temp.data() + (y - top) * tempStride + (x - left) * pixelSize;
+    if (scale == 1)
+    {
+        PylonCopyRows(dst, static_cast<size_t>(region.rowStride), converted, tempStride, outWidth * pixelSize, outHeight);
+    }
+    else if (bytesPerSample == 1)
+    {
+        PylonDownscaleRows<uint8_t>(dst, static_cast<size_t>(region.rowStride), converted, tempStride, outWidth, outHeight, channels, scale);
+    }
+    else if (bytesPerSample == 2)
+    {
+        PylonDownscaleRows<uint16_t>(dst, static_cast<size_t>(region.rowStride), converted, tempStride, outWidth, outHeight, channels, scale);
+    }
+    else
+    {
+        throw INVALID_ARGUMENT_EXCEPTION("Downscaling supports 8 and 16 bit samples only.");
+    }
+}
+
+// Converts the 'count' regions at 'regions' of 'src' using up to
+// 'numThreads' threads, one converter per thread. The first error is thrown
+// after all regions have been processed.
+static void PylonConvertRegionsTo(
+    CImageFormatConverter& converter, const PylonConversionSource& src, size_t regions, size_t count,
+    uint32_t scale, size_t channels, size_t bytesPerSample, size_t numThreads)
+{
+    if (scale == 0)
+    {
+        throw INVALID_ARGUMENT_EXCEPTION("The scale factor must be at least 1.");
+    }
+    const std::string outputOrientation = converter.OutputOrientation.ToString().c_str();
+    if ((outputOrientation != "Unchanged" && outputOrientation != "TopDown") || converter.OutputPaddingX.GetValue() != 0)
+    {
+        throw INVALID_ARGUMENT_EXCEPTION("Regions require top down output without padding.");
+    }
+    if (numThreads == 0)
+    {
+        numThreads = PylonThreadPool::GetDefaultNumThreads();
+    }
+    const PylonConversionRegion* items = reinterpret_cast<const PylonConversionRegion*>(regions);
+    const size_t numTasks = std::min(numThreads, count);
+    std::vector<std::unique_ptr<CImageFormatConverter> > converters;
+    if (numTasks > 1)
+    {
+        converters = PylonCloneConverters(converter, numTasks);
+    }
+    // Task t converts the regions t, t + numTasks, ...
+    PylonThreadPool::Instance().Run(numTasks, numThreads, [&](size_t task)
+    {
+        CImageFormatConverter& taskConverter = converters.empty() ? converter : *converters[task];
+        std::vector<uint8_t> temp;
+        for (size_t i = task; i < count; i += numTasks)
+        {
+            PylonConvertRegion(taskConverter, src, items[i], scale, channels, bytesPerSample, temp);
+        }
+    });
+}
+%}
+
+// Convert is defined in Python below to support the 'out' argument.
+%feature("shadow", "0") Pylon::CImageFormatConverter::Convert;
+
 // Not all overloads of 'Convert' and 'ImageHasDestinationFormat' are usable. So we ignore all of them and
 // redefine those that we want.
+%nothread Pylon::CImageFormatConverter::_ConvertBatchTo;
+
 %extend Pylon::CImageFormatConverter {
 
     // Repeat conversion from IImage.
@@ -20,6 +510,57 @@
         $self->Convert(dst, src);
     }
 
+    // Convert into a caller owned image, whose buffer is reused if it is large
+    // enough.
+    void _ConvertInto(CPylonImage& dst, const IImage& src)
+    {
+        $self->Convert(dst, src);
+    }
+    void _ConvertInto(CPylonImage& dst, const CGrabResultPtr& src)
+    {
+        $self->Convert(dst, src);
+    }
+
+    // Convert into caller owned memory, e.g. a numpy array, using up to
+    // 'numThreads' threads. No Python object is touched, so the GIL is
+    // released.
+    void _ConvertTo(size_t address, size_t size, const IImage& src, size_t numThreads = 1)
+    {
+        PylonConvertTo(*$self, reinterpret_cast<void*>(address), size, PylonConversionSource(src), numThreads);
+    }
+    void _ConvertTo(size_t address, size_t size, const CGrabResultPtr& src, size_t numThreads = 1)
+    {
+        PylonConvertTo(*$self, reinterpret_cast<void*>(address), size, PylonConversionSource(src), numThreads);
+    }
+
+    // Convert into an image reset to the output format, using up to
+    // 'numThreads' threads.
+    void _ConvertParallelInto(CPylonImage& dst, const IImage& src, size_t numThreads)
+    {
+        PylonConvertParallelInto(*$self, dst, PylonConversionSource(src), numThreads);
+    }
+    void _ConvertParallelInto(CPylonImage& dst, const CGrabResultPtr& src, size_t numThreads)
+    {
+        PylonConvertParallelInto(*$self, dst, PylonConversionSource(src), numThreads);
+    }
+
+    // Convert 'count' regions described by a PylonConversionRegion array at
+    // 'regions'.
+    void _ConvertRegionsTo(const IImage& src, size_t regions, size_t count, uint32_t scale, size_t channels, size_t bytesPerSample, size_t numThreads)
+    {
+        PylonConvertRegionsTo(*$self, PylonConversionSource(src), regions, count, scale, channels, bytesPerSample, numThreads);
+    }
+    void _ConvertRegionsTo(const CGrabResultPtr& src, size_t regions, size_t count, uint32_t scale, size_t channels, size_t bytesPerSample, size_t numThreads)
+    {
+        PylonConvertRegionsTo(*$self, PylonConversionSource(src), regions, count, scale, channels, bytesPerSample, numThreads);
+    }
+
+    // Needs the GIL for accessing 'sources', releases it while converting.
+    PyObject* _ConvertBatchTo(PyObject* sources, size_t address, size_t size, size_t frameStride, size_t frameSize, uint32_t width, uint32_t height, size_t numThreads)
+    {
+        return PylonConvertBatchTo(*$self, sources, address, size, frameStride, frameSize, width, height, numThreads);
+    }
+
     // Make sure IImage can be converted directly
     bool ImageHasDestinationFormat(const IImage& src)
     {
@@ -42,6 +583,144 @@
         return $self->OutputPixelFormat.GetValue();
     }
     PROP_GETSET(OutputPixelFormat)
+
+%pythoncode %{
+    def SetNumThreads(self, numThreads):
+        '''
+        Set the number of threads a conversion may use, 0 uses one thread per
+        core. Large images are split into horizontal bands converted in
+        parallel. The result is identical to a conversion by one thread.
+        '''
+        if numThreads < 0:
+            raise ValueError("numThreads must not be negative")
+        self.__dict__["_num_threads"] = int(numThreads)
+
+    def GetNumThreads(self):
+        return self.__dict__.get("_num_threads", 1)
+
+    NumThreads = property(GetNumThreads, SetNumThreads)
+
+    def Convert(self, src, out = None):
+        '''
+        Convert 'src', a GrabResult or image, to the OutputPixelFormat and
+        return a new PylonImage. If 'out' is given, the result is written to it
+        and 'out' is returned:
+          PylonImage  -- its buffer is reused if it is large enough
+          numpy array -- must be C-contiguous with the shape and dtype GetArray
+                         returns for the converted image, the data is written
+                         to it directly
+        The conversion runs without the GIL, using up to NumThreads threads.
+        '''
+        numThreads = self.GetNumThreads()
+        if out is None:
+            if numThreads == 1:
+                return _pylon.ImageFormatConverter_Convert(self, src)
+            out = PylonImage()
+        if isinstance(out, PylonImage):
+            if numThreads == 1:
+                self._ConvertInto(out, src)
+            else:
+                self._ConvertParallelInto(out, src, numThreads)
+            return out
+        shape, dtype, format = _GetImageFormat(self.GetOutputPixelFormat(), src.GetWidth(), src.GetHeight())
+        address, size, stride = _GetOutArrayInfo(out, shape, dtype)
+        if not out.flags.c_contiguous:
+            raise ValueError("out must be C-contiguous")
+        self._ConvertTo(address, size, src, numThreads)
+        return out
+
+    @needs_numpy
+    def ConvertBatch(self, sources, out = None, numThreads = 0):
+        '''
+        Convert a sequence of GrabResults or images of the same size, e.g. a
+        GrabResultBatch, to the OutputPixelFormat in a single call. The frames
+        are stacked along the first axis of a numpy array of shape
+        (len(sources),) + the shape GetArray returns for a converted frame.
+        'out' may be given as such an array, the frames of it may be strided,
+        otherwise a new array is created using the size of the first valid
+        source.
+        The frames are converted in parallel without the GIL, using up to
+        'numThreads' threads, 0 uses one thread per core.
+        Returns the tuple (out, errors). A source that can't be converted, e.g.
+        a failed grab, doesn't abort the batch. Its frame is zeroed and
+        errors maps its index to the error message.
+        '''
+        if numThreads < 0:
+            raise ValueError("numThreads must not be negative")
+        sources = list(sources)
+        width = height = 0
+        for src in sources:
+            if isinstance(src, GrabResult):
+                if not (src.IsValid() and src.GrabSucceeded()):
+                    continue
+            elif not (isinstance(src, Image) and src.IsValid()):
+                continue
+            width, height = src.GetWidth(), src.GetHeight()
+            break
+        if out is None:
+            if width == 0 and sources:
+                raise ValueError("sources contains no valid GrabResult or image")
+            shape, dtype, format = _GetImageFormat(self.GetOutputPixelFormat(), width, height)
+            out = _pylon_numpy.empty((len(sources),) + tuple(shape), dtype = dtype)
+        else:
+            if not isinstance(out, _pylon_numpy.ndarray):
+                raise TypeError("out must be a numpy.ndarray")
+            if width == 0:
+                # Nothing can be converted, the size is taken from out.
+                shape, dtype = out.shape[1:], out.dtype
+            else:
+                shape, dtype, format = _GetImageFormat(self.GetOutputPixelFormat(), width, height)
+        address, size, stride = _GetOutArrayInfo(out, (len(sources),) + tuple(shape), dtype)
+        frameSize = _pylon_numpy.dtype(dtype).itemsize * int(_pylon_numpy.prod(shape))
+        errors = self._ConvertBatchTo(sources, address, size, stride, frameSize, width, height, numThreads)
+        return out, errors
+
+    @needs_numpy
+    def ConvertRegions(self, src, regions, scale = 1, out = None, numThreads = 0):
+        '''
+        Convert the regions of 'src', a GrabResult or image, to the
+        OutputPixelFormat without converting the whole image. 'regions' is a
+        sequence of (x, y, width, height) tuples. Every region is reduced by
+        the integer factor 'scale' by averaging blocks of scale x scale pixels,
+        remaining rows and columns are dropped. The result is the same as
+        converting the whole image, cropping and averaging.
+        Returns a list with one array per region, shaped like GetArray returns
+        an image of (width // scale, height // scale) pixels. 'out' may be
+        given as a list of such arrays, their rows may be strided.
+        The regions are converted in parallel without the GIL, using up to
+        'numThreads' threads, 0 uses one thread per core.
+        '''
+        if scale < 1:
+            raise ValueError("scale must be at least 1")
+        if numThreads < 0:
+            raise ValueError("numThreads must not be negative")
+        regions = [tuple(int(v) for v in region) for region in regions]
+        if out is None:
+            out = [None] * len(regions)
+        elif len(out) != len(regions):
+            raise ValueError("out must have one array per region")
+        pt = self.GetOutputPixelFormat()
+        descriptor = GetPixelFormatDescriptor(pt)
+        table = _pylon_numpy.zeros((len(regions), 7), dtype = _pylon_numpy.uint64)
+        arrays = []
+        for i, region in enumerate(regions):
+            if len(region) != 4:
+                raise ValueError("a region must be given as (x, y, width, height)")
+            x, y, width, height = region
+            if min(region) < 0:
+                raise ValueError("region %r must not be negative" % (region,))
+            shape, dtype, format = _GetImageFormat(pt, width // scale, height // scale)
+            array = out[i]
+            if array is None:
+                array = _pylon_numpy.empty(shape, dtype = dtype)
+            address, size, stride = _GetOutArrayInfo(array, shape, dtype)
+            table[i] = (x, y, width, height, address, size, stride)
+            arrays.append(array)
+        self._ConvertRegionsTo(
+            src, table.__array_interface__["data"][0], len(regions), scale,
+            descriptor.channels, _pylon_numpy.dtype(descriptor.dtype).itemsize, numThreads)
+        return arrays
+%}
 };
 
 %ignore Pylon::CImageFormatConverter::Convert;
@@ -49,3 +728,166 @@
 %ignore Pylon::CImageFormatConverter::OutputPixelFormat;
 
 %include <pylon/ImageFormatConverter.h>;
+
+%pythoncode %{
+from collections import OrderedDict as _OrderedDict
+import threading as _threading
+
+class ImageFormatConverterPoolStatistics(_namedtuple("ImageFormatConverterPoolStatistics", (
+        "hits", "misses", "evictions", "numEntries"
+        ))):
+    '''
+    Counters of an ImageFormatConverterPool, see
+    ImageFormatConverterPool.GetStatistics.
+    '''
+    __slots__ = ()
+
+class _ImageFormatConverterPoolEntry(object):
+    # Converters and output images of one key. A converter is used by one
+    # thread at a time, threads converting concurrently get a converter each.
+    def __init__(self, outputPixelFormat, outputBitAlignment, sourcePixelType, width, height, numImages):
+        self.outputPixelFormat = outputPixelFormat
+        self.outputBitAlignment = outputBitAlignment
+        self.sourcePixelType = sourcePixelType
+        self.converters = [self.CreateConverter()]
+        self.images = []
+        # Indices of the images being converted into.
+        self.busy = set()
+        for i in range(numImages):
+            image = PylonImage()
+            image.Reset(outputPixelFormat, width, height)
+            self.images.append(image)
+        self.next = 0
+
+    def CreateConverter(self):
+        converter = ImageFormatConverter()
+        converter.OutputPixelFormat = self.outputPixelFormat
+        if self.outputBitAlignment is not None:
+            converter.OutputBitAlignment = self.outputBitAlignment
+        # Prepares the conversion of the source format up front.
+        converter.Initialize(self.sourcePixelType)
+        return converter
+
+class ImageFormatConverterPool(object):
+    '''
+    Pool of configured ImageFormatConverters and reusable output images,
+    shared e.g. by the cameras of a process, see GetInstance.
+    An entry is kept for every combination of source pixel type, output pixel
+    format, width, height, padding and output bit alignment. It holds a
+    converter initialized for the source format and a ring of 'numImages'
+    PylonImages the results are converted into, so switching between formats
+    and ROIs doesn't reallocate. Images still referenced by a caller are
+    never overwritten. At most 'maxEntries' entries are kept, the
+    least recently used one is evicted.
+    The pool is thread safe.
+    '''
+    _instance = None
+    _instance_lock = _threading.Lock()
+
+    def __init__(self, maxEntries = 16, numImages = 4):
+        if maxEntries < 1:
+            raise ValueError("maxEntries must be at least 1")
+        if numImages < 1:
+            raise ValueError("numImages must be at least 1")
+        self._maxEntries = maxEntries
+        self._numImages = numImages
+        self._entries = _OrderedDict()
+        self._lock = _threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @classmethod
+    def GetInstance(cls):
+        '''
+        Return the pool shared by the process.
+        '''
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def Convert(self, src, outputPixelFormat, outputBitAlignment = None):
+        '''
+        Convert 'src', a GrabResult or image, to 'outputPixelFormat' and return
+        the PylonImage holding the result. 'outputBitAlignment' is a value of
+        ImageFormatConverter.OutputBitAlignment, None uses the default.
+        The returned image shares the buffer of an image of the ring of the
+        entry. The buffer is reused by a later conversion with the same key
+        once neither the returned image nor an array exported from it is
+        alive, a fresh image is returned while all buffers of the ring are in
+        use.
+        '''
+        pt = src.GetPixelType()
+        width = src.GetWidth()
+        height = src.GetHeight()
+        key = (pt, outputPixelFormat, width, height, src.GetPaddingX(), outputBitAlignment)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._hits += 1
+                self._entries.move_to_end(key)
+                converter = entry.converters.pop() if entry.converters else None
+            else:
+                self._misses += 1
+                converter = None
+        if entry is None:
+            # Created without the lock, two threads may create an entry for the
+            # same key, the second replaces the first.
+            entry = _ImageFormatConverterPoolEntry(
+                outputPixelFormat, outputBitAlignment, pt, width, height, self._numImages)
+            converter = entry.converters.pop()
+            with self._lock:
+                self._entries[key] = entry
+                while len(self._entries) > self._maxEntries:
+                    self._entries.popitem(last = False)
+                    self._evictions += 1
+        if converter is None:
+            converter = entry.CreateConverter()
+        index = None
+        with self._lock:
+            for _ in range(len(entry.images)):
+                candidate = entry.next
+                entry.next = (entry.next + 1) % len(entry.images)
+                # The buffer is neither shared with a returned image or array
+                # nor being converted into.
+                if candidate not in entry.busy and entry.images[candidate].IsUnique():
+                    index = candidate
+                    entry.busy.add(index)
+                    break
+        if index is None:
+            # All buffers of the ring are in use, they must not be overwritten.
+            image = PylonImage()
+            image.Reset(outputPixelFormat, width, height)
+        else:
+            # Converted into while unique, so the buffer is reused.
+            image = entry.images[index]
+        try:
+            converter.Convert(src, out = image)
+            if index is not None:
+                image = PylonImage(image)
+        finally:
+            with self._lock:
+                entry.busy.discard(index)
+                # Converters of evicted or replaced entries are dropped.
+                if self._entries.get(key) is entry:
+                    entry.converters.append(converter)
+        return image
+
+    def GetStatistics(self):
+        with self._lock:
+            return ImageFormatConverterPoolStatistics(self._hits, self._misses, self._evictions, len(self._entries))
+
+    def ResetStatistics(self):
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def Clear(self):
+        '''
+        Remove all entries, releasing their converters and images.
+        '''
+        with self._lock:
+            self._entries.clear()
+%}
@@ -1,5 +1,108 @@
 %rename (InstantCamera) Pylon::CInstantCamera;
 
+%{
+namespace Pylon
+{
+    class CGrabStatisticsCollector;
+
+    // State the wrapper keeps per native camera. It is shared by all proxies
+    // of a camera, e.g. the ones returned by InstantCameraArray.__getitem__,
+    // and removed when the wrapper destroys the camera or its array.
+    struct PylonCameraState
+    {
+        PylonCameraState() : frameFilter(NULL) {}
+        std::shared_ptr<CGrabStatisticsCollector> grabStatistics;
+        // Reference to the Python FrameFilter, see SetFrameFilter.
+        PyObject* frameFilter;
+    };
+
+    class PylonCameraStates
+    {
+    public:
+        // Calls 'function(state)' under the lock, the state of 'camera' is
+        // created if required. 'function' must neither call pylon nor
+        // acquire the GIL.
+        template <typename Function>
+        static void Update(const CInstantCamera* camera, Function function)
+        {
+            std::lock_guard<std::mutex> guard(Lock());
+            function(States()[camera]);
+        }
+
+        static std::shared_ptr<CGrabStatisticsCollector> GetGrabStatistics(const CInstantCamera* camera)
+        {
+            std::lock_guard<std::mutex> guard(Lock());
+            std::map<const CInstantCamera*, PylonCameraState>::const_iterator it = States().find(camera);
+            return it != States().end() ? it->second.grabStatistics : std::shared_ptr<CGrabStatisticsCollector>();
+        }
+
+        // Replaces the frame filter of 'camera' by 'frameFilter', NULL for
+        // none. Called with the GIL held.
+        static void SetFrameFilter(const CInstantCamera* camera, PyObject* frameFilter)
+        {
+            Py_XINCREF(frameFilter);
+            PyObject* previous = NULL;
+            {
+                std::lock_guard<std::mutex> guard(Lock());
+                PylonCameraState& state = States()[camera];
+                previous = state.frameFilter;
+                state.frameFilter = frameFilter;
+            }
+            // Released outside the lock, it may destroy the filter.
+            Py_XDECREF(previous);
+        }
+
+        // Returns a new reference to the frame filter of 'camera' or NULL.
+        // Called with the GIL held.
+        static PyObject* GetFrameFilter(const CInstantCamera* camera)
+        {
+            std::lock_guard<std::mutex> guard(Lock());
+            std::map<const CInstantCamera*, PylonCameraState>::const_iterator it = States().find(camera);
+            PyObject* frameFilter = it != States().end() ? it->second.frameFilter : NULL;
+            Py_XINCREF(frameFilter);
+            return frameFilter;
+        }
+
+        // Called before the wrapper destroys 'camera', with or without the
+        // GIL.
+        static void Erase(const CInstantCamera* camera)
+        {
+            PylonCameraState state;
+            {
+                std::lock_guard<std::mutex> guard(Lock());
+                std::map<const CInstantCamera*, PylonCameraState>::iterator it = States().find(camera);
+                if (it == States().end())
+                {
+                    return;
+                }
+                state = it->second;
+                States().erase(it);
+            }
+            // 'state' is released outside the lock.
+            if (state.frameFilter != NULL && Py_IsInitialized())
+            {
+                PyGILState_STATE gil = PyGILState_Ensure();
+                Py_DECREF(state.frameFilter);
+                PyGILState_Release(gil);
+            }
+        }
+
+    private:
+        static std::mutex& Lock()
+        {
+            static std::mutex lock;
+            return lock;
+        }
+
+        static std::map<const CInstantCamera*, PylonCameraState>& States()
+        {
+            static std::map<const CInstantCamera*, PylonCameraState> states;
+            return states;
+        }
+    };
+}
+%}
+
 %ignore IInstantCameraExtensions;
 %ignore GetExtensionInterface;
 %ignore CGrabResultDataFactory;
@@ -12,6 +115,11 @@
 %rename(ConfigurationEventHandler) Pylon::CConfigurationEventHandler;
 %rename(ImageEventHandler) Pylon::CImageEventHandler;
 %rename(CameraEventHandler) Pylon::CCameraEventHandler;
+// Replaced by the version applying the frame filter, see FrameFilter.i.
+// Replaced by the version taking an ArrayBufferFactory.
+%ignore Pylon::CInstantCamera::SetBufferFactory;
+%ignore Pylon::CInstantCamera::RetrieveResult;
+%rename(RetrieveResult) Pylon::CInstantCamera::_RetrieveFilteredResult;
 %rename(StartGrabbingMax) StartGrabbing( size_t maxImages, EGrabStrategy strategy = GrabStrategy_OneByOne, EGrabLoop grabLoopType = GrabLoop_ProvidedByUser);
 
 namespace Pylon {
@@ -60,9 +168,230 @@ namespace Pylon {
         except:
             pass
         return sorted(set(l))
+
+    def SetBufferFactory(self, factory, cleanupProcedure = Cleanup_Delete):
+        '''
+        Allocate the grab buffers with the ArrayBufferFactory 'factory', None
+        restores the default allocation. Must be called before grabbing is
+        started. 'factory' stays owned by Python, 'cleanupProcedure' is only
+        accepted for compatibility. The camera keeps the memory of the factory
+        until it has freed the last buffer.
+        '''
+        if factory is not None and not isinstance(factory, _ArrayBufferFactory):
+            raise TypeError("factory must be an ArrayBufferFactory or None")
+        self._SetArrayBufferFactory(factory)
+
+    def SetFrameFilter(self, frameFilter):
+        '''
+        Set the FrameFilter applied by RetrieveResult, RetrieveResults,
+        Prefetch, RetrieveResultAsync and Results of this camera, or remove it
+        with None. Filtering runs without the GIL and dropped buffers are
+        queued again immediately. The filter is kept for the native camera, so
+        every InstantCamera object referring to it, e.g. the ones returned by
+        InstantCameraArray, uses it. The grab loop thread of the camera
+        retrieves the results inside pylon, so image event handlers called
+        by it see all results.
+        A filter must only be used by one camera at a time.
+        '''
+        if frameFilter is not None and not isinstance(frameFilter, FrameFilter):
+            raise TypeError("frameFilter must be a FrameFilter or None")
+        previous = self.GetFrameFilter()
+        if previous is not None and previous is not frameFilter:
+            previous.Reset()
+        self._SetFrameFilter(frameFilter)
+
+    def GetFrameFilter(self):
+        return self._GetFrameFilter()
+
+    def EnableGrabStatistics(self):
+        '''
+        Start collecting the statistics returned by GetGrabStatistics. The
+        counters are updated in C++ for every retrieved result, no Python code
+        runs and no node is read per frame. The statistics belong to the
+        camera, so every InstantCamera object referring to it shares them.
+        '''
+        self._EnableGrabStatistics()
+
+    def GetGrabStatistics(self):
+        '''
+        Return the GrabStatistics collected since EnableGrabStatistics, the
+        first call of this method or ResetGrabStatistics. Results released by
+        the FrameFilter are counted as requeued, all other results,
+        including failed ones, as delivered.
+        '''
+        self.EnableGrabStatistics()
+        self._SampleGrabStatistics()
+        (numRetrieved, numFailed, numSkipped, maxNumReadyBuffers, maxNumEmptyBuffers,
+         latencySumUs, latencyBoundsUs, latencyCounts) = self._GetGrabStatisticsCounters()
+        numRequeued = 0
+        frameFilter = self.GetFrameFilter()
+        if frameFilter is not None:
+            s = frameFilter.GetStatistics()
+            numRequeued = s.numDroppedDecimation + s.numDroppedRate + s.numDroppedNewest
+        return GrabStatistics(
+            numRetrieved, max(0, numRetrieved - numRequeued), numFailed, numSkipped,
+            numRequeued, maxNumReadyBuffers, maxNumEmptyBuffers,
+            latencyBoundsUs, latencyCounts, latencySumUs
+            )
+
+    def ResetGrabStatistics(self):
+        '''
+        Reset the grab statistics and the statistics of the FrameFilter.
+        '''
+        self._ResetGrabStatistics()
+        frameFilter = self.GetFrameFilter()
+        if frameFilter is not None:
+            frameFilter.ResetStatistics()
+
+    @needs_numpy
+    def RetrieveResults(self, n, timeoutMs, out = None, metadata = None):
+        '''
+        Retrieve up to 'n' grab results within 'timeoutMs' and copy their image
+        data into one array of shape (N, H, W[, C]), N <= n. Packed formats are
+        unpacked. The geometry is taken from the first successful result, frames
+        that failed or differ from it are zero filled.
+        Returns (images, metadata), 'metadata' is a structured array of
+        GrabResultMetadataDtype with one record per frame. 'out' and 'metadata'
+        may be preallocated arrays of at least n frames, views of their first N
+        frames are returned. Waiting, copying and unpacking run without the GIL.
+        '''
+        if out is not None:
+            n = min(n, len(out))
+        if metadata is not None:
+            n = min(n, len(metadata))
+
+        with GrabResultBatch() as batch:
+            count = batch.Retrieve(self, n, timeoutMs, self.GetFrameFilter())
+
+            if metadata is None:
+                metadata = _pylon_numpy.empty(count, dtype = GrabResultMetadataDtype)
+            else:
+                metadata = metadata[:count]
+            address, size, stride = _GetOutArrayInfo(metadata, (count,), GrabResultMetadataDtype)
+            batch._FillMetadata(address, size, GrabResultMetadataDtype.itemsize)
+
+            succeeded = _pylon_numpy.flatnonzero(metadata["grabSucceeded"])
+            if len(succeeded) == 0:
+                if out is None:
+                    return _pylon_numpy.zeros((count, 0, 0), dtype = _pylon_numpy.uint8), metadata
+                out = out[:count]
+                out[...] = 0
+                return out, metadata
+
+            first = metadata[succeeded[0]]
+            pt = int(first["pixelType"])
+            width, height = int(first["width"]), int(first["height"])
+            descriptor = _pixel_format_registry.get(pt)
+            target_pt = descriptor.unpackedType if descriptor is not None and descriptor.packed else pt
+            shape, dtype, format = _GetImageFormat(target_pt, width, height)
+            shape = (count,) + tuple(shape)
+            if out is None:
+                out = _pylon_numpy.empty(shape, dtype = dtype)
+            else:
+                out = out[:count]
+            address, size, stride = _GetOutArrayInfo(out, shape, dtype)
+            batch._CopyTo(address, size, stride, pt, width, height)
+        return out, metadata
+
+    @needs_numpy
+    def Prefetch(self, depth = 2, convertTo = PixelType_Undefined, timeoutMs = 5000):
+        '''
+        Return a ResultPrefetcher iterating over the grab results as
+        PrefetchedFrame objects until the camera stops grabbing. A worker
+        thread retrieves the results, converts them to 'convertTo' (packed
+        formats are unpacked if no format is given) and keeps up to 'depth'
+        frames ready, all without the GIL. The grab buffers are returned to
+        the camera right after conversion. The FrameFilter set by
+        SetFrameFilter is applied.
+        A TimeoutException is raised if no result arrives within 'timeoutMs'.
+        RetrieveResult must not be called while the prefetcher is open, use
+        it as context manager or call Close() to stop it.
+        '''
+        frameFilter = self.GetFrameFilter()
+        prefetcher = ResultPrefetcher(self, depth, convertTo, timeoutMs, frameFilter)
+        # used by the worker thread
+        prefetcher._keepalive = (self, frameFilter)
+        return prefetcher
+
+    async def RetrieveResultAsync(self, timeoutMs, timeoutHandling = TimeoutHandling_ThrowException):
+        '''
+        Awaitable version of RetrieveResult. The grab result wait object is
+        registered with the running event loop, so no thread is blocked while
+        waiting. Cancelling the call never loses a grab result, since results
+        are only taken from the output queue after the wait has finished.
+        Concurrent calls for the same camera are served in order. The
+        FrameFilter is applied.
+        '''
+        import asyncio
+        loop = asyncio.get_running_loop()
+        # asyncio.Lock is bound to an event loop
+        lock_loop, lock = self.__dict__.get("_retrieve_result_async_lock", (None, None))
+        if lock_loop is not loop:
+            lock = asyncio.Lock()
+            object.__setattr__(self, "_retrieve_result_async_lock", (loop, lock))
+        deadline = None if timeoutMs is None else loop.time() + timeoutMs / 1000.0
+        async with lock:
+            while True:
+                result = self.RetrieveResult(0, TimeoutHandling_Return)
+                if result.IsValid() or not self.IsGrabbing():
+                    return result
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    return self.RetrieveResult(0, timeoutHandling)
+                await _WaitForWaitObjectAsync(loop, self.GetGrabResultWaitObject(), remaining)
+
+    async def Results(self, timeoutMs = None):
+        '''
+        Asynchronous iterator over the grab results, ends when the camera stops
+        grabbing. A result is only retrieved when the consumer asks for the next
+        one, so a slow consumer leaves the frames in the camera's queue and the
+        grab strategy and MaxNumBuffer bound the backlog. A TimeoutException is
+        raised if no result arrives within 'timeoutMs', None waits forever.
+        '''
+        while self.IsGrabbing():
+            result = await self.RetrieveResultAsync(timeoutMs)
+            if result.IsValid():
+                yield result
 %}
 }
 
+%pythoncode %{
+def _GetWaitObjectFd(waitObject):
+    try:
+        return waitObject.GetFd()
+    except AttributeError:
+        return None
+
+async def _WaitForWaitObjectAsync(loop, waitObject, timeout):
+    # Waits until 'waitObject' is signaled or 'timeout' seconds elapsed, but
+    # at most 0.1 seconds, so the caller can notice e.g. that the camera
+    # stopped grabbing, which doesn't signal the wait object. Only readiness
+    # is reported, the caller fetches the data afterwards.
+    timeout = 0.1 if timeout is None else max(0.0, min(0.1, timeout))
+    fd = _GetWaitObjectFd(waitObject)
+    if fd is not None:
+        future = loop.create_future()
+        def wake():
+            if not future.done():
+                future.set_result(None)
+        try:
+            loop.add_reader(fd, wake)
+        except NotImplementedError:
+            # e.g. the proactor event loop on Windows
+            fd = None
+        else:
+            timer = loop.call_later(timeout, wake)
+            try:
+                await future
+            finally:
+                loop.remove_reader(fd)
+                timer.cancel()
+            return
+    # Wait objects without a file descriptor are waited for in an executor,
+    # the short slices keep a cancelled wait from blocking a thread for long.
+    await loop.run_in_executor(None, waitObject.Wait, int(timeout * 1000))
+%}
+
 %pythonprepend Pylon::CInstantCamera::RegisterConfiguration %{
     if cleanupProcedure == Cleanup_Delete:
         pConfigurator.__disown__()
@@ -98,3 +427,30 @@ namespace Pylon {
 #endif
 
 %include <pylon/InstantCamera.h>;
+
+%extend Pylon::CInstantCamera {
+    void _SetArrayBufferFactory(const CArrayBufferFactory* factory)
+    {
+        if (factory == NULL)
+        {
+            $self->SetBufferFactory(NULL, Cleanup_None);
+            return;
+        }
+        IBufferFactory* link = factory->CreateLink();
+        try
+        {
+            $self->SetBufferFactory(link, Cleanup_Delete);
+        }
+        catch (...)
+        {
+            link->DestroyBufferFactory();
+            throw;
+        }
+    }
+
+    ~CInstantCamera()
+    {
+        PylonCameraStates::Erase($self);
+        delete $self;
+    }
+}
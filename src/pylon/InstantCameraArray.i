@@ -1,5 +1,20 @@
 %rename(InstantCameraArray) Pylon::CInstantCameraArray;
 
+%{
+namespace Pylon
+{
+    // Forgets the state the wrapper keeps for the cameras of 'cameras', see
+    // PylonCameraStates.
+    static void PylonInstantCameraArrayEraseStates(CInstantCameraArray& cameras)
+    {
+        for (size_t i = 0; i < cameras.GetSize(); ++i)
+        {
+            PylonCameraStates::Erase(&cameras[i]);
+        }
+    }
+}
+%}
+
 %pythonprepend Pylon::CInstantCameraArray::operator[]( size_t index) %{
     if index >= self.GetSize():
         raise IndexError
@@ -7,5 +22,149 @@
 %ignore Pylon::CInstantCameraArray::operator[]( size_t index) const;
 %rename(__getitem__) Pylon::CInstantCameraArray::operator[]( size_t index);
 
+// The array doesn't see grabs started by StartGrabbingParallel.
+%pythonprepend Pylon::CInstantCameraArray::RetrieveResult %{
+    if self.__dict__.get("_grabbing_parallel"):
+        raise RuntimeError("Grabbing was started by StartGrabbingParallel, retrieve the results from the cameras of the array.")
+%}
+%pythonprepend Pylon::CInstantCameraArray::StartGrabbing %{
+    self.__dict__.pop("_grabbing_parallel", None)
+%}
+%pythonprepend Pylon::CInstantCameraArray::StopGrabbing %{
+    self.__dict__.pop("_grabbing_parallel", None)
+%}
+
+
+%pythonprepend Pylon::CInstantCameraArray::Initialize %{
+    # the cameras are replaced
+    self._EraseCameraStates()
+%}
+
+%include <pylon/InstantCameraArray.h>;
+
+%extend Pylon::CInstantCameraArray {
+    ~CInstantCameraArray()
+    {
+        PylonInstantCameraArrayEraseStates(*$self);
+        delete $self;
+    }
+
+    void _EraseCameraStates()
+    {
+        PylonInstantCameraArrayEraseStates(*$self);
+    }
+}
 
-%include <pylon/InstantCameraArray.h>;
\ No newline at end of file
+%extend Pylon::CInstantCameraArray {
+%pythoncode %{
+    def _ForEachCamera(self, function, numThreads = None):
+        # Calls function(index, camera) for every camera in a thread pool and
+        # returns the results. The pylon calls release the GIL, so the cameras
+        # are handled in parallel.
+        from concurrent.futures import ThreadPoolExecutor
+        cameras = [self[i] for i in range(self.GetSize())]
+        if not cameras:
+            return []
+        workers = len(cameras) if numThreads is None else max(1, min(numThreads, len(cameras)))
+        with ThreadPoolExecutor(max_workers = workers, thread_name_prefix = "InstantCameraArray") as executor:
+            futures = [executor.submit(function, i, camera) for i, camera in enumerate(cameras)]
+        results = []
+        errors = {}
+        for i, future in enumerate(futures):
+            error = future.exception()
+            if error is None:
+                results.append(future.result())
+            else:
+                results.append(None)
+                errors[i] = error
+        if errors:
+            raise InstantCameraArrayException(errors)
+        return results
+
+    def OpenParallel(self, numThreads = None):
+        '''
+        Open all cameras in parallel, using up to 'numThreads' threads, one
+        per camera by default. Configurations registered with
+        RegisterConfiguration are applied while opening. Raises an
+        InstantCameraArrayException listing every camera that failed, the
+        others stay open.
+        '''
+        self._ForEachCamera(lambda i, camera: camera.Open(), numThreads)
+
+    def LoadFeaturesParallel(self, filenames, validate = True, numThreads = None):
+        '''
+        Load a feature file saved with FeaturePersistence.Save into every
+        camera in parallel. 'filenames' is a single file used for all cameras
+        or a sequence with one file per camera. Raises an
+        InstantCameraArrayException listing every camera that failed.
+        '''
+        if isinstance(filenames, (str, bytes)) or hasattr(filenames, "__fspath__"):
+            filenames = [filenames] * self.GetSize()
+        filenames = [str(f) if hasattr(f, "__fspath__") else f for f in filenames]
+        if len(filenames) != self.GetSize():
+            raise ValueError("expected %d file names, got %d" % (self.GetSize(), len(filenames)))
+        self._ForEachCamera(
+            lambda i, camera: FeaturePersistence.Load(filenames[i], camera.GetNodeMap(), validate),
+            numThreads
+            )
+
+    def StartGrabbingParallel(self, strategy = GrabStrategy_OneByOne, grabLoopType = GrabLoop_ProvidedByUser, maxImages = None, numThreads = None):
+        '''
+        Start grabbing on all cameras in parallel and return the start skew in
+        seconds, i.e. the time between the first and the last camera having
+        started. All threads call StartGrabbing at the same moment, so the
+        skew is bounded by the variation of the StartGrabbing duration of the
+        cameras, not by their sum. If a camera fails to start, the others are
+        stopped again and an InstantCameraArrayException is raised.
+        The grabs are started on the individual cameras, so the results must
+        be retrieved from them. The array itself isn't grabbing, its
+        RetrieveResult raises a RuntimeError until StopGrabbing or StartGrabbing
+        of the array is called, see IsGrabbingParallel.
+        '''
+        import threading
+        import time
+        size = self.GetSize()
+        if size == 0:
+            return 0.0
+        workers = size if numThreads is None else max(1, min(numThreads, size))
+        # Only threads that all run at once can wait for each other.
+        barrier = threading.Barrier(workers) if workers == size else None
+
+        def start(index, camera):
+            if barrier is not None:
+                barrier.wait()
+            if maxImages is None:
+                camera.StartGrabbing(strategy, grabLoopType)
+            else:
+                camera.StartGrabbingMax(maxImages, strategy, grabLoopType)
+            return time.perf_counter()
+
+        try:
+            started = self._ForEachCamera(start, numThreads)
+        except InstantCameraArrayException:
+            self._ForEachCamera(lambda i, camera: camera.StopGrabbing(), numThreads)
+            raise
+        object.__setattr__(self, "_grabbing_parallel", True)
+        return max(started) - min(started) if started else 0.0
+
+    def IsGrabbingParallel(self):
+        '''
+        Return True if grabbing was started by StartGrabbingParallel and a
+        camera of the array is still grabbing.
+        '''
+        return bool(self.__dict__.get("_grabbing_parallel")) and any(self[i].IsGrabbing() for i in range(self.GetSize()))
+%}
+}
+
+%pythoncode %{
+class InstantCameraArrayException(RuntimeError):
+    '''
+    Raised by the parallel operations of InstantCameraArray. 'errors' maps
+    the index of every camera that failed to its exception.
+    '''
+
+    def __init__(self, errors):
+        self.errors = dict(errors)
+        message = "; ".join("camera %d: %s" % (i, e) for i, e in sorted(self.errors.items()))
+        super().__init__("%d of the cameras failed: %s" % (len(self.errors), message))
+%}
@@ -0,0 +1,852 @@
+%{
+namespace Pylon
+{
+    // Behavior of a Pipeline stage when its input queue is full.
+    enum EQueuePolicy
+    {
+        QueuePolicy_Block,      // wait until the queue has room
+        QueuePolicy_DropOldest, // drop the oldest queued item
+        QueuePolicy_DropNewest  // drop the new item
+    };
+
+    // Pipeline stage converting grab results in native worker threads, see
+    // NativeConvertStage. The workers never touch Python objects. Grab
+    // results are put into a bounded input queue, the images are taken from a
+    // bounded output queue, which blocks the workers when it is full.
+    class CPipelineNativeStage
+    {
+    public:
+        CPipelineNativeStage(size_t workers, size_t queueSize, EQueuePolicy policy, EPixelType convertTo)
+            : m_queueSize(queueSize)
+            , m_policy(policy)
+            , m_convertTo(convertTo)
+            , m_maxQueueDepth(0)
+            , m_processed(0)
+            , m_dropped(0)
+            , m_errors(0)
+            , m_busySeconds(0.0)
+            , m_numRunning(0)
+            , m_closed(false)
+            , m_stop(false)
+        {
+            if (workers == 0)
+            {
+                throw INVALID_ARGUMENT_EXCEPTION("The number of workers must not be zero.");
+            }
+            if (queueSize == 0)
+            {
+                throw INVALID_ARGUMENT_EXCEPTION("The queue size must not be zero.");
+            }
+            try
+            {
+                for (size_t i = 0; i < workers; ++i)
+                {
+                    {
+                        std::lock_guard<std::mutex> guard(m_lock);
+                        ++m_numRunning;
+                    }
+                    m_workers.push_back(std::thread(&CPipelineNativeStage::Run, this));
+                }
+            }
+            catch (...)
+            {
+                Stop();
+                throw;
+            }
+        }
+
+        ~CPipelineNativeStage()
+        {
+            Stop();
+        }
+
+        // Queues a copy of 'result'. Waits for room with QueuePolicy_Block.
+        // Results dropped by the policy or because the stage has been closed
+        // are counted as dropped.
+        void Put(const CGrabResultPtr& result)
+        {
+            // Released after the lock.
+            CGrabResultPtr dropped;
+            std::unique_lock<std::mutex> lock(m_lock);
+            if (!m_closed && m_input.size() >= m_queueSize)
+            {
+                if (m_policy == QueuePolicy_DropNewest)
+                {
+                    ++m_dropped;
+                    return;
+                }
+                if (m_policy == QueuePolicy_DropOldest)
+                {
+                    dropped = m_input.front().result;
+                    m_input.pop_front();
+                    ++m_dropped;
+                }
+                else
+                {
+                    m_spaceCondition.wait(lock, [this] { return m_closed || m_input.size() < m_queueSize; });
+                }
+            }
+            if (m_closed)
+            {
+                ++m_dropped;
+                return;
+            }
+            Entry entry;
+            entry.result = result;
+            entry.enqueued = std::chrono::steady_clock::now();
+            m_input.push_back(entry);
+            m_maxQueueDepth = std::max(m_maxQueueDepth, m_input.size());
+            m_inputCondition.notify_one();
+        }
+
+        // Lets the workers finish after the queued results have been
+        // converted. Results put afterwards are dropped.
+        void Close()
+        {
+            std::lock_guard<std::mutex> guard(m_lock);
+            m_closed = true;
+            m_inputCondition.notify_all();
+            m_spaceCondition.notify_all();
+        }
+
+        // Drops the queued results.
+        void Clear()
+        {
+            std::deque<Entry> dropped;
+            std::lock_guard<std::mutex> guard(m_lock);
+            m_dropped += m_input.size();
+            dropped.swap(m_input);
+            m_spaceCondition.notify_all();
+        }
+
+        size_t GetQueueDepth()
+        {
+            std::lock_guard<std::mutex> guard(m_lock);
+            return m_input.size();
+        }
+
+        size_t GetMaxQueueDepth()
+        {
+            std::lock_guard<std::mutex> guard(m_lock);
+            return m_maxQueueDepth;
+        }
+
+        // Waits for a converted image. Returns false if all workers have
+        // finished and every image has been taken.
+        bool _WaitOutput()
+        {
+            std::unique_lock<std::mutex> lock(m_lock);
+            m_outputCondition.wait(lock, [this] { return !m_output.empty() || m_numRunning == 0; });
+            return !m_output.empty();
+        }
+
+        // Takes the oldest converted image, see _WaitOutput.
+        CPylonImage* _TakeOutput()
+        {
+            CPylonImage* image = new CPylonImage();
+            std::lock_guard<std::mutex> guard(m_lock);
+            if (!m_output.empty())
+            {
+                *image = m_output.front();
+                m_output.pop_front();
+                m_outputSpaceCondition.notify_one();
+            }
+            return image;
+        }
+
+        // Returns (processed, dropped, errors, busySeconds, latencyP50Us,
+        // latencyP90Us, latencyP99Us, queueDepth, maxQueueDepth).
+        PyObject* _GetStatisticsTuple()
+        {
+            std::vector<double> latencies;
+            size_t processed, dropped, errors, queueDepth, maxQueueDepth;
+            double busySeconds;
+            {
+                std::lock_guard<std::mutex> guard(m_lock);
+                latencies.assign(m_latencies.begin(), m_latencies.end());
+                processed = m_processed;
+                dropped = m_dropped;
+                errors = m_errors;
+                busySeconds = m_busySeconds;
+                queueDepth = m_input.size();
+                maxQueueDepth = m_maxQueueDepth;
+            }
+            std::sort(latencies.begin(), latencies.end());
+            return Py_BuildValue(
+                "(nnnddddnn)",
+                static_cast<Py_ssize_t>(processed), static_cast<Py_ssize_t>(dropped), static_cast<Py_ssize_t>(errors),
+                busySeconds, Percentile(latencies, 0.5), Percentile(latencies, 0.9), Percentile(latencies, 0.99),
+                static_cast<Py_ssize_t>(queueDepth), static_cast<Py_ssize_t>(maxQueueDepth)
+                );
+        }
+
+        // Throws the first error of the workers once.
+        void _RethrowError()
+        {
+            std::exception_ptr error;
+            {
+                std::lock_guard<std::mutex> guard(m_lock);
+                error = m_error;
+                m_error = std::exception_ptr();
+            }
+            if (error)
+            {
+                std::rethrow_exception(error);
+            }
+        }
+
+        // Stops the workers and drops all queued results and images.
+        void Stop()
+        {
+            {
+                std::lock_guard<std::mutex> guard(m_lock);
+                m_stop = true;
+                m_closed = true;
+                m_inputCondition.notify_all();
+                m_spaceCondition.notify_all();
+                m_outputSpaceCondition.notify_all();
+            }
+            for (size_t i = 0; i < m_workers.size(); ++i)
+            {
+                if (m_workers[i].joinable())
+                {
+                    m_workers[i].join();
+                }
+            }
+            std::deque<Entry> input;
+            std::deque<CPylonImage> output;
+            std::lock_guard<std::mutex> guard(m_lock);
+            m_dropped += m_input.size();
+            input.swap(m_input);
+            output.swap(m_output);
+            m_outputCondition.notify_all();
+        }
+
+    private:
+        CPipelineNativeStage(const CPipelineNativeStage&);
+        CPipelineNativeStage& operator=(const CPipelineNativeStage&);
+
+        // Same as _PIPELINE_LATENCY_SAMPLES.
+        static const size_t LatencySamples = 1024;
+
+        struct Entry
+        {
+            CGrabResultPtr result;
+            std::chrono::steady_clock::time_point enqueued;
+        };
+
+        static double Percentile(const std::vector<double>& sorted, double p)
+        {
+            if (sorted.empty())
+            {
+                return 0.0;
+            }
+            return sorted[std::min(sorted.size() - 1, static_cast<size_t>(p * sorted.size()))] * 1e6;
+        }
+
+        void SetError(std::exception_ptr error)
+        {
+            std::lock_guard<std::mutex> guard(m_lock);
+            ++m_errors;
+            if (!m_error)
+            {
+                m_error = error;
+            }
+        }
+
+        // Takes the next queued result. Returns false if the stage has been
+        // stopped, or closed and all results have been taken.
+        bool Next(Entry& entry)
+        {
+            std::unique_lock<std::mutex> lock(m_lock);
+            m_inputCondition.wait(lock, [this] { return m_stop || m_closed || !m_input.empty(); });
+            if (m_stop || m_input.empty())
+            {
+                return false;
+            }
+            entry = m_input.front();
+            m_input.pop_front();
+            m_spaceCondition.notify_one();
+            return true;
+        }
+
+        void Run()
+        {
+            try
+            {
+                CImageFormatConverter converter;
+                if (m_convertTo != PixelType_Undefined)
+                {
+                    converter.OutputPixelFormat.SetValue(m_convertTo);
+                }
+                Entry entry;
+                while (Next(entry))
+                {
+                    const std::chrono::steady_clock::time_point start = std::chrono::steady_clock::now();
+                    CPylonImage image;
+                    try
+                    {
+                        if (entry.result->GrabSucceeded())
+                        {
+                            PylonMaterializeResult(converter, m_convertTo, entry.result, image);
+                        }
+                    }
+                    catch (...)
+                    {
+                        image.Release();
+                        SetError(std::current_exception());
+                    }
+                    // The buffer goes back to the camera before the image is
+                    // handed out.
+                    entry.result.Release();
+                    const std::chrono::steady_clock::time_point end = std::chrono::steady_clock::now();
+
+                    std::unique_lock<std::mutex> lock(m_lock);
+                    ++m_processed;
+                    m_busySeconds += std::chrono::duration<double>(end - start).count();
+                    if (m_latencies.size() == LatencySamples)
+                    {
+                        m_latencies.pop_front();
+                    }
+                    m_latencies.push_back(std::chrono::duration<double>(end - entry.enqueued).count());
+                    if (image.IsValid())
+                    {
+                        m_outputSpaceCondition.wait(lock, [this] { return m_stop || m_output.size() < m_queueSize; });
+                        if (!m_stop)
+                        {
+                            m_output.push_back(image);
+                            m_outputCondition.notify_one();
+                        }
+                    }
+                }
+            }
+            catch (...)
+            {
+                SetError(std::current_exception());
+            }
+            std::deque<Entry> dropped;
+            std::lock_guard<std::mutex> guard(m_lock);
+            if (--m_numRunning == 0)
+            {
+                // Nobody converts the queued results anymore.
+                m_closed = true;
+                m_dropped += m_input.size();
+                dropped.swap(m_input);
+                m_spaceCondition.notify_all();
+                m_outputCondition.notify_all();
+            }
+        }
+
+        const size_t m_queueSize;
+        const EQueuePolicy m_policy;
+        const EPixelType m_convertTo;
+        std::mutex m_lock;
+        std::condition_variable m_inputCondition;
+        std::condition_variable m_spaceCondition;
+        std::condition_variable m_outputCondition;
+        std::condition_variable m_outputSpaceCondition;
+        std::deque<Entry> m_input;
+        std::deque<CPylonImage> m_output;
+        std::deque<double> m_latencies;
+        size_t m_maxQueueDepth;
+        size_t m_processed;
+        size_t m_dropped;
+        size_t m_errors;
+        double m_busySeconds;
+        size_t m_numRunning;
+        std::exception_ptr m_error;
+        bool m_closed;
+        bool m_stop;
+        std::vector<std::thread> m_workers;
+    };
+}
+%}
+
+namespace Pylon
+{
+    enum EQueuePolicy
+    {
+        QueuePolicy_Block,
+        QueuePolicy_DropOldest,
+        QueuePolicy_DropNewest
+    };
+}
+
+%rename(_PipelineNativeStage) Pylon::CPipelineNativeStage;
+%newobject Pylon::CPipelineNativeStage::_TakeOutput;
+%nothread Pylon::CPipelineNativeStage::_GetStatisticsTuple;
+
+namespace Pylon
+{
+    class CPipelineNativeStage
+    {
+    public:
+        CPipelineNativeStage(size_t workers, size_t queueSize, EQueuePolicy policy, EPixelType convertTo);
+        ~CPipelineNativeStage();
+        void Put(const CGrabResultPtr& result);
+        void Close();
+        void Clear();
+        size_t GetQueueDepth();
+        size_t GetMaxQueueDepth();
+        bool _WaitOutput();
+        CPylonImage* _TakeOutput();
+        PyObject* _GetStatisticsTuple();
+        void _RethrowError();
+        void Stop();
+    };
+}
+
+%pythoncode %{
+_PIPELINE_LATENCY_SAMPLES = 1024
+
+def _ReleaseItem(item):
+    # Returns the buffer of a dropped grab result to the camera right away.
+    if isinstance(item, GrabResult):
+        item.Release()
+
+class _PipelineQueue(object):
+    # Bounded queue with a drop or block policy. Closing it lets the consumers
+    # finish after the remaining items have been taken.
+
+    def __init__(self, maxSize, policy):
+        import collections
+        import threading
+        if maxSize < 1:
+            raise ValueError("queueSize must be at least 1")
+        if policy not in (QueuePolicy_Block, QueuePolicy_DropOldest, QueuePolicy_DropNewest):
+            raise ValueError("unknown queue policy %r" % (policy,))
+        self.maxSize = maxSize
+        self.policy = policy
+        self.maxDepth = 0
+        self._items = collections.deque()
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def Put(self, item):
+        # Returns the dropped item or None.
+        import time
+        with self._condition:
+            # a closed queue keeps its items for the consumers
+            if self._closed:
+                return item
+            dropped = None
+            if len(self._items) >= self.maxSize:
+                if self.policy == QueuePolicy_DropNewest:
+                    return item
+                if self.policy == QueuePolicy_DropOldest:
+                    dropped = self._items.popleft()[0]
+                else:
+                    while len(self._items) >= self.maxSize and not self._closed:
+                        self._condition.wait()
+                    if self._closed:
+                        return item
+            self._items.append((item, time.perf_counter()))
+            self.maxDepth = max(self.maxDepth, len(self._items))
+            self._condition.notify_all()
+            return dropped
+
+    def Get(self):
+        # Returns (item, enqueueTime) or None when closed and empty.
+        with self._condition:
+            while not self._items:
+                if self._closed:
+                    return None
+                self._condition.wait()
+            entry = self._items.popleft()
+            self._condition.notify_all()
+            return entry
+
+    def Close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def Clear(self):
+        with self._condition:
+            items = [entry[0] for entry in self._items]
+            self._items.clear()
+            self._condition.notify_all()
+        return items
+
+    def __len__(self):
+        with self._condition:
+            return len(self._items)
+
+class PipelineStageStatistics(_namedtuple("PipelineStageStatistics", (
+        "name", "workers", "processed", "dropped", "errors", "queueDepth",
+        "maxQueueDepth", "throughput", "utilization",
+        "latencyP50Us", "latencyP90Us", "latencyP99Us"
+        ))):
+    '''
+    Counters of one Pipeline stage, see Pipeline.GetStatistics.
+    'throughput' is in items per second since the pipeline was started,
+    'utilization' the fraction of time its workers were busy. The latency of
+    an item is the time from entering the queue of the stage until the stage
+    function returned, the percentiles cover the most recent items.
+    '''
+    __slots__ = ()
+
+class PipelineStage(object):
+    '''
+    One stage of a Pipeline, see Pipeline.AddStage.
+    '''
+
+    def __init__(self, name, function, workers, queueSize, policy):
+        import collections
+        import threading
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.name = name
+        self.function = function
+        self.workers = workers
+        self.queue = _PipelineQueue(queueSize, policy)
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.firstError = None
+        self._busy = 0.0
+        self._latencies = collections.deque(maxlen = _PIPELINE_LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+
+    def _Dropped(self, item):
+        if item is not None:
+            _ReleaseItem(item)
+            with self._lock:
+                self.dropped += 1
+
+    def _Failed(self, error):
+        with self._lock:
+            self.errors += 1
+            if self.firstError is None:
+                self.firstError = error
+
+    def _RaiseError(self):
+        # Raises the first exception of the stage function once.
+        with self._lock:
+            error, self.firstError = self.firstError, None
+        if error is not None:
+            raise error
+
+    def GetStatistics(self, elapsed):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            processed, dropped, errors, busy = self.processed, self.dropped, self.errors, self._busy
+
+        def percentile(p):
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1e6
+
+        return PipelineStageStatistics(
+            self.name, self.workers, processed, dropped, errors,
+            len(self.queue), self.queue.maxDepth,
+            processed / elapsed if elapsed > 0 else 0.0,
+            busy / (elapsed * self.workers) if elapsed > 0 else 0.0,
+            percentile(0.5), percentile(0.9), percentile(0.99)
+            )
+
+class _NativePipelineQueue(object):
+    # The input queue of a _NativePipelineStage. The queued grab results are
+    # only referenced by the native stage.
+
+    def __init__(self, stage):
+        self._stage = stage
+
+    def Put(self, item):
+        if not isinstance(item, GrabResult):
+            self._stage._Failed(TypeError("a NativeConvertStage takes GrabResult objects, not %s" % type(item).__name__))
+            return None
+        # Dropped results are released and counted by the native stage.
+        self._stage.native.Put(item)
+        item.Release()
+        return None
+
+    def Close(self):
+        self._stage.native.Close()
+
+    def Clear(self):
+        self._stage.native.Clear()
+        return []
+
+    @property
+    def maxDepth(self):
+        return self._stage.native.GetMaxQueueDepth()
+
+    def __len__(self):
+        return self._stage.native.GetQueueDepth()
+
+class _NativePipelineStage(PipelineStage):
+    # Pipeline stage run by the native worker threads of a
+    # _PipelineNativeStage. A single Python thread hands the converted images
+    # to the next stage, see Pipeline._RunNativeStage.
+
+    def __init__(self, name, function, workers, queueSize, policy):
+        PipelineStage.__init__(self, name, function, workers, queueSize, policy)
+        self.native = _PipelineNativeStage(workers, queueSize, policy, function.outputPixelFormat)
+        self.queue = _NativePipelineQueue(self)
+
+    def GetStatistics(self, elapsed):
+        (processed, dropped, errors, busy, latencyP50Us, latencyP90Us, latencyP99Us,
+         queueDepth, maxQueueDepth) = self.native._GetStatisticsTuple()
+        with self._lock:
+            errors += self.errors
+        return PipelineStageStatistics(
+            self.name, self.workers, processed, dropped, errors,
+            queueDepth, maxQueueDepth,
+            processed / elapsed if elapsed > 0 else 0.0,
+            busy / (elapsed * self.workers) if elapsed > 0 else 0.0,
+            latencyP50Us, latencyP90Us, latencyP99Us
+            )
+
+    def _RaiseError(self):
+        PipelineStage._RaiseError(self)
+        self.native._RethrowError()
+
+class NativeConvertStage(object):
+    '''
+    Pipeline stage converting GrabResult objects to numpy arrays of
+    'outputPixelFormat' in native worker threads, which neither call Python
+    nor need the GIL. With PixelType_Undefined packed formats are unpacked
+    and others copied, like GrabResult.GetArray(). The grab result is
+    released right after conversion, failed grabs are dropped. The input of
+    the stage must be GrabResult objects, so it is usually the first stage.
+    '''
+
+    def __init__(self, outputPixelFormat = PixelType_Undefined):
+        self.outputPixelFormat = outputPixelFormat
+
+class ConvertStage(object):
+    '''
+    Pipeline stage converting a GrabResult or PylonImage to a numpy array of
+    'outputPixelFormat'. The stage itself is Python, the conversion runs in
+    ImageFormatConverter without the GIL. The grab result is released
+    afterwards. See NativeConvertStage for a stage without Python workers.
+    '''
+
+    def __init__(self, outputPixelFormat):
+        import threading
+        self.outputPixelFormat = outputPixelFormat
+        self._local = threading.local()
+
+    def __call__(self, item):
+        converter = getattr(self._local, "converter", None)
+        if converter is None:
+            converter = self._local.converter = ImageFormatConverter()
+            converter.OutputPixelFormat = self.outputPixelFormat
+        if isinstance(item, GrabResult) and not item.GrabSucceeded():
+            item.Release()
+            return None
+        image = converter.Convert(item)
+        _ReleaseItem(item)
+        return _pylon_numpy.asarray(image)
+
+class ArrayStage(object):
+    '''
+    Pipeline stage copying a GrabResult to a numpy array, packed formats are
+    unpacked. The stage itself is Python, the copy runs in GetArray without
+    the GIL. The grab result is released afterwards. Failed grabs are
+    dropped.
+    '''
+
+    def __call__(self, item):
+        if not item.GrabSucceeded():
+            item.Release()
+            return None
+        array = item.GetArray()
+        item.Release()
+        return array
+
+class Pipeline(object):
+    '''
+    Runs the grab results of an InstantCamera or InstantCameraArray through a
+    chain of stages. Every stage has a bounded input queue, a number of
+    worker threads and a policy for a full queue: QueuePolicy_Block waits,
+    QueuePolicy_DropOldest and QueuePolicy_DropNewest drop an item.
+    A stage is either native or Python. A NativeConvertStage runs in native
+    worker threads without the GIL. Any other stage function is called by
+    Python worker threads. It receives the output of the previous stage, the
+    first stage receives GrabResult objects. Returning None ends the
+    processing of an item. ConvertStage and ArrayStage spend most of their
+    time in C++ without the GIL, but still need it for every item.
+
+        pipeline = pylon.Pipeline(camera)
+        pipeline.AddStage("convert", pylon.NativeConvertStage(pylon.PixelType_BGR8packed), workers = 2)
+        pipeline.AddStage("detect", detect, queueSize = 4, policy = pylon.QueuePolicy_DropOldest)
+        camera.StartGrabbing()
+        with pipeline:
+            ...
+    '''
+
+    def __init__(self, source, timeoutMs = 1000):
+        self.source = source
+        self.timeoutMs = timeoutMs
+        self._stages = []
+        self._threads = []
+        self._stop = False
+        self._startTime = None
+        self._endTime = None
+
+    def AddStage(self, name, function, workers = 1, queueSize = 8, policy = QueuePolicy_Block):
+        '''
+        Append a stage calling 'function' for every item, or a native stage
+        if 'function' is a NativeConvertStage. Returns the PipelineStage.
+        Must be called before Start.
+        '''
+        if self._startTime is not None:
+            raise RuntimeError("stages must be added before the pipeline is started")
+        if isinstance(function, NativeConvertStage):
+            stage = _NativePipelineStage(name, function, workers, queueSize, policy)
+        else:
+            stage = PipelineStage(name, function, workers, queueSize, policy)
+        self._stages.append(stage)
+        return stage
+
+    def GetStages(self):
+        return list(self._stages)
+
+    def Start(self):
+        '''
+        Start the worker threads and the thread retrieving the grab results.
+        Grabbing must be started separately. The pipeline finishes when the
+        source stops grabbing or Stop is called.
+        '''
+        import threading
+        import time
+        if not self._stages:
+            raise RuntimeError("the pipeline has no stages")
+        if self._startTime is not None:
+            raise RuntimeError("the pipeline has already been started")
+        if isinstance(self.source, InstantCameraArray) and self.source.IsGrabbingParallel():
+            raise RuntimeError("the grabs of an InstantCameraArray started by StartGrabbingParallel can't be retrieved from the array, use a camera as source")
+        self._startTime = time.perf_counter()
+        workers = []
+        for index, stage in enumerate(self._stages):
+            if isinstance(stage, _NativePipelineStage):
+                stage_workers = [threading.Thread(target = self._RunNativeStage, args = (index,), name = "Pipeline-%s" % stage.name, daemon = True)]
+            else:
+                stage_workers = [
+                    threading.Thread(target = self._RunStage, args = (index,), name = "Pipeline-%s-%d" % (stage.name, i), daemon = True)
+                    for i in range(stage.workers)
+                    ]
+            workers.append(stage_workers)
+        closers = [
+            threading.Thread(target = self._CloseAfter, args = (index, stage_workers), daemon = True)
+            for index, stage_workers in enumerate(workers)
+            ]
+        source = threading.Thread(target = self._RunSource, name = "Pipeline-source", daemon = True)
+        self._threads = [source] + [t for stage_workers in workers for t in stage_workers] + closers
+        for t in self._threads:
+            t.start()
+
+    def Stop(self):
+        '''
+        Stop retrieving, drop the queued items and wait for the workers.
+        '''
+        self._stop = True
+        for stage in self._stages:
+            stage.queue.Close()
+            for item in stage.queue.Clear():
+                stage._Dropped(item)
+        self.Join()
+
+    def Join(self, timeout = None):
+        '''
+        Wait until all items have passed the pipeline after the source stopped
+        grabbing. Returns False on timeout. Raises the first exception raised
+        by a stage function, which otherwise doesn't stop the pipeline.
+        '''
+        import time
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for t in self._threads:
+            t.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+            if t.is_alive():
+                return False
+        if self._endTime is None and self._startTime is not None:
+            self._endTime = time.perf_counter()
+        for stage in self._stages:
+            stage._RaiseError()
+        return True
+
+    def GetStatistics(self):
+        '''
+        Return a PipelineStageStatistics for every stage.
+        '''
+        import time
+        if self._startTime is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self._endTime or time.perf_counter()) - self._startTime
+        return [stage.GetStatistics(elapsed) for stage in self._stages]
+
+    def GetBottleneck(self):
+        '''
+        Return the name of the stage with the highest utilization.
+        '''
+        statistics = self.GetStatistics()
+        return max(statistics, key = lambda s: s.utilization).name if statistics else None
+
+    def __enter__(self):
+        self.Start()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        if type is None:
+            self.Join()
+        else:
+            self.Stop()
+
+    def _RunSource(self):
+        first = self._stages[0]
+        try:
+            while not self._stop and self.source.IsGrabbing():
+                result = self.source.RetrieveResult(self.timeoutMs, TimeoutHandling_Return)
+                if result.IsValid():
+                    first._Dropped(first.queue.Put(result))
+        except Exception as e:
+            first._Failed(e)
+        finally:
+            first.queue.Close()
+
+    def _RunStage(self, index):
+        import time
+        stage = self._stages[index]
+        following = self._stages[index + 1] if index + 1 < len(self._stages) else None
+        while True:
+            entry = stage.queue.Get()
+            if entry is None:
+                return
+            item, enqueued = entry
+            start = time.perf_counter()
+            try:
+                output = stage.function(item)
+            except Exception as e:
+                output = None
+                _ReleaseItem(item)
+                stage._Failed(e)
+            end = time.perf_counter()
+            del item
+            with stage._lock:
+                stage.processed += 1
+                stage._busy += end - start
+                stage._latencies.append(end - enqueued)
+            if output is not None:
+                if following is None:
+                    _ReleaseItem(output)
+                else:
+                    following._Dropped(following.queue.Put(output))
+
+    def _RunNativeStage(self, index):
+        stage = self._stages[index]
+        following = self._stages[index + 1] if index + 1 < len(self._stages) else None
+        while stage.native._WaitOutput():
+            array = _pylon_numpy.asarray(stage.native._TakeOutput())
+            if following is not None:
+                following._Dropped(following.queue.Put(array))
+
+    def _CloseAfter(self, index, workers):
+        # The next queue is closed when all workers of this stage are done.
+        for t in workers:
+            t.join()
+        if index + 1 < len(self._stages):
+            self._stages[index + 1].queue.Close()
+%}
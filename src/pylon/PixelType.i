@@ -3,3 +3,246 @@
 %ignore PixelSize;
 %ignore PixelType;
 %include<pylon/PixelType.h>;
+
+////////////////////////////////////////////////////////////////////////////////
+//
+// Pixel format registry
+//
+// Maps an EPixelType to the numpy layout used by GetImageFormat and GetArray
+// of GrabResult, PylonImage and PylonDataComponent. The registry is built once
+// when the module is imported, so the per frame format lookup boils down to a
+// single dictionary access.
+//
+
+%pythoncode %{
+from collections import namedtuple as _namedtuple
+
+class PixelFormatDescriptor(_namedtuple("PixelFormatDescriptor", (
+        "bitsPerPixel", "channels", "dtype", "format", "packed", "unpackedType", "channelAxis"
+        ))):
+    '''
+    Describes how the pixel data of a pixel type is mapped to a numpy array.
+
+    bitsPerPixel: number of bits per pixel in the buffer
+    channels:     number of samples per pixel
+    dtype:        numpy scalar type of a sample (None if numpy is not installed)
+    format:       buffer protocol format character of a sample
+    packed:       True if the buffer has to be unpacked before it can be mapped
+    unpackedType: pixel type of the unpacked data (packed formats only)
+    channelAxis:  True if the samples are mapped to a separate last axis,
+                  False if they are appended to the rows
+    '''
+    __slots__ = ()
+
+    def GetShape(self, height, width):
+        if self.channelAxis:
+            return (height, width, self.channels)
+        return (height, width * self.channels)
+
+_pixel_format_registry = {}
+
+def _GetNumpyScalarType(format):
+    try:
+        return _pylon_numpy.dtype(format).type
+    except NameError:
+        return None
+
+def RegisterPixelFormat(pixelType, format, channels = 1, channelAxis = False, unpackedType = None, bitsPerPixel = None):
+    '''
+    Register (or replace) the numpy mapping of 'pixelType'.
+    For packed pixel types 'format', 'channels' and 'channelAxis' describe the
+    data after unpacking it to 'unpackedType'.
+    '''
+    if bitsPerPixel is None:
+        bitsPerPixel = BitPerPixel(pixelType)
+    descriptor = PixelFormatDescriptor(
+        bitsPerPixel,
+        channels,
+        _GetNumpyScalarType(format),
+        format,
+        unpackedType is not None,
+        unpackedType,
+        channelAxis
+        )
+    _pixel_format_registry[pixelType] = descriptor
+    return descriptor
+
+def GetPixelFormatDescriptor(pixelType):
+    '''
+    Return the PixelFormatDescriptor of 'pixelType' or None if the pixel type
+    is not supported by the numpy interface.
+    '''
+    return _pixel_format_registry.get(pixelType)
+
+def _GetImageFormat(pt, width, height):
+    descriptor = _pixel_format_registry.get(pt)
+    if descriptor is None or descriptor.packed:
+        if descriptor is not None or IsPacked(pt):
+            raise ValueError("Packed Formats are not supported with numpy interface")
+        raise ValueError("Pixel format currently not supported")
+    return (descriptor.GetShape(height, width), descriptor.dtype, descriptor.format)
+
+def _RegisterPixelFormats(names, format, channels = 1, channelAxis = False):
+    # Pixel types that are unknown to the pylon version used for the build are skipped.
+    for name in names:
+        pt = globals().get("PixelType_" + name)
+        if pt is not None:
+            RegisterPixelFormat(pt, format, channels, channelAxis)
+
+def _RegisterPackedPixelFormats(pairs, format):
+    for name, unpacked_name in pairs:
+        pt = globals().get("PixelType_" + name)
+        unpacked_pt = globals().get("PixelType_" + unpacked_name)
+        if pt is not None and unpacked_pt is not None:
+            RegisterPixelFormat(pt, format, unpackedType = unpacked_pt)
+
+_RegisterPixelFormats(
+    ("Mono8", "BayerGR8", "BayerRG8", "BayerGB8", "BayerBG8", "Confidence8", "Coord3D_C8"),
+    "B")
+_RegisterPixelFormats(
+    ("Mono10", "BayerGR10", "BayerRG10", "BayerGB10", "BayerBG10",
+     "Mono12", "BayerGR12", "BayerRG12", "BayerGB12", "BayerBG12",
+     "Mono16", "BayerGR16", "BayerRG16", "BayerGB16", "BayerBG16", "Confidence16", "Coord3D_C16"),
+    "H")
+_RegisterPixelFormats(("RGB8packed", "BGR8packed"), "B", 3, True)
+_RegisterPixelFormats(("RGB12packed", "BGR12packed", "RGB10packed", "BGR10packed"), "H", 3, True)
+_RegisterPixelFormats(("YUV422_YUYV_Packed", "YUV422packed"), "B", 2, True)
+_RegisterPixelFormats(("Coord3D_ABC32f",), "f", 3, True)
+_RegisterPixelFormats(("Data32f",), "f", 1, True)
+_RegisterPixelFormats(("BiColorRGBG8", "BiColorBGRG8"), "B", 2)
+_RegisterPixelFormats(("BiColorRGBG10", "BiColorBGRG10", "BiColorRGBG12", "BiColorBGRG12"), "H", 2)
+_RegisterPackedPixelFormats(
+    (("Mono10packed", "Mono10"), ("Mono10p", "Mono10"),
+     ("BayerGR10p", "BayerGR10"), ("BayerRG10p", "BayerRG10"),
+     ("BayerGB10p", "BayerGB10"), ("BayerBG10p", "BayerBG10"),
+     ("Mono12packed", "Mono12"), ("Mono12p", "Mono12"),
+     ("BayerGR12Packed", "BayerGR12"), ("BayerRG12Packed", "BayerRG12"),
+     ("BayerGB12Packed", "BayerGB12"), ("BayerBG12Packed", "BayerBG12"),
+     ("BayerGR12p", "BayerGR12"), ("BayerRG12p", "BayerRG12"),
+     ("BayerGB12p", "BayerGB12"), ("BayerBG12p", "BayerBG12")),
+    "H")
+
+def _GetOutArrayInfo(out, shape, dtype):
+    # Validates a caller owned destination array and returns its address,
+    # the size of the addressed memory in bytes and the stride of its rows.
+    # The rows may be strided, the pixels within a row must be contiguous.
+    if not isinstance(out, _pylon_numpy.ndarray):
+        raise TypeError("out must be a numpy.ndarray")
+    shape = tuple(shape)
+    if out.shape != shape:
+        raise ValueError("out has shape %s, expected %s" % (out.shape, shape))
+    if out.dtype != dtype:
+        raise ValueError("out has dtype %s, expected %s" % (out.dtype, _pylon_numpy.dtype(dtype)))
+    if not out.flags.writeable:
+        raise ValueError("out must be writeable")
+    if out.ndim == 1:
+        if out.strides[0] != out.itemsize:
+            raise ValueError("out must be contiguous")
+        return out.__array_interface__["data"][0], out.nbytes, out.nbytes
+    row_size = out.itemsize
+    for dim in range(out.ndim - 1, 0, -1):
+        if out.strides[dim] != row_size:
+            raise ValueError("the rows of out must be contiguous")
+        row_size *= out.shape[dim]
+    row_stride = out.strides[0]
+    if row_stride < row_size:
+        raise ValueError("the rows of out must not overlap")
+    rows = out.shape[0]
+    size = row_stride * (rows - 1) + row_size if rows > 0 else 0
+    return out.__array_interface__["data"][0], size, row_stride
+
+def _GetImageStrides(pt, width, paddingX):
+    # Strides in bytes matching the shape returned by _GetImageFormat for an
+    # image with 'paddingX' bytes of padding at the end of each line.
+    shape, dtype, format = _GetImageFormat(pt, width, 1)
+    descriptor = _pixel_format_registry[pt]
+    itemsize = _pylon_numpy.dtype(dtype).itemsize
+    pixel_stride = itemsize * descriptor.channels
+    row_stride = width * pixel_stride + paddingX
+    if descriptor.channelAxis:
+        return (row_stride, pixel_stride, itemsize)
+    return (row_stride, itemsize)
+
+def _GetArrayInterface(pt, width, height, paddingX, address, size):
+    # Describes the image data at 'address' as numpy array interface.
+    shape, dtype, format = _GetImageFormat(pt, width, height)
+    if address == 0:
+        raise RuntimeError("No image data available.")
+    strides = _GetImageStrides(pt, width, paddingX)
+    row_size = strides[0] - paddingX
+    if height > 0 and size < strides[0] * (height - 1) + row_size:
+        raise ValueError("Buffer is too small for the image geometry")
+    return {
+        "version": 3,
+        "shape": shape,
+        "typestr": _pylon_numpy.dtype(dtype).str,
+        "data": (address, False),
+        "strides": strides,
+        }
+
+class _ArrayExporter(object):
+    # Exports image data to numpy. 'owner' is a copy of the grab result, image
+    # or data component holding the data, so the buffer stays valid as long as
+    # any array references it, independent of the object it was exported from.
+    __slots__ = ("__array_interface__", "_owner", "_keepalive")
+
+    def __init__(self, owner, interface, keepalive = None):
+        self.__array_interface__ = interface
+        self._owner = owner
+        self._keepalive = keepalive
+
+def _ExportArray(source, owner, address, size, dtype = None, copy = None, keepalive = None):
+    # Implementation of __array__ for objects holding image data.
+    pt = source.GetPixelType()
+    descriptor = _pixel_format_registry.get(pt)
+    if copy or (descriptor is not None and descriptor.packed):
+        if copy is False:
+            raise ValueError("Packed pixel formats can't be exported without a copy")
+        array = source.GetArray()
+    else:
+        interface = _GetArrayInterface(pt, source.GetWidth(), source.GetHeight(), source.GetPaddingX(), address, size)
+        array = _pylon_numpy.asarray(_ArrayExporter(owner, interface, keepalive))
+    if dtype is not None and array.dtype != dtype:
+        if copy is False:
+            raise ValueError("Unable to avoid a copy when converting to %s" % _pylon_numpy.dtype(dtype))
+        array = array.astype(dtype)
+    return array
+
+def _ExportBuffer(source):
+    # Implementation of __buffer__ (Python 3.12+) based on __array__.
+    try:
+        return memoryview(source.__array__(copy = False))
+    except ValueError as e:
+        raise BufferError(str(e)) from e
+
+_DLPACK_CPU = 1
+_DLPACK_TYPE_CODES = {"i": 0, "u": 1, "f": 2}
+
+def _ExportDLPack(source, stream, dl_device, copy, keepalive = None):
+    # Implementation of __dlpack__ for objects holding image data. Returns a
+    # legacy "dltensor" capsule, which all DLPack consumers accept.
+    if stream is not None:
+        raise BufferError("Only stream=None is supported for CPU data")
+    if dl_device is not None and tuple(dl_device) != (_DLPACK_CPU, 0):
+        raise BufferError("Only export to the CPU is supported")
+    pt = source.GetPixelType()
+    descriptor = _pixel_format_registry.get(pt)
+    if copy or (descriptor is not None and descriptor.packed):
+        if copy is False:
+            raise BufferError("Packed pixel formats can't be exported without a copy")
+        return source.GetArray().__dlpack__()
+    width = source.GetWidth()
+    shape, dtype, format = _GetImageFormat(pt, width, source.GetHeight())
+    strides = _GetImageStrides(pt, width, source.GetPaddingX())
+    dtype = _pylon_numpy.dtype(dtype)
+    if any(stride % dtype.itemsize for stride in strides):
+        # DLPack strides count elements, odd line padding can't be expressed.
+        if copy is False:
+            raise BufferError("Line padding is not a multiple of the pixel size")
+        return _pylon_numpy.ascontiguousarray(source.GetArray()).__dlpack__()
+    unused = (0,) * (3 - len(shape))
+    return source._GetDLPackCapsule(
+        len(shape), *(tuple(shape) + unused), *(strides + unused),
+        _DLPACK_TYPE_CODES[dtype.kind], dtype.itemsize * 8, keepalive
+        )
+%}
@@ -8,14 +8,15 @@
 
 %extend Pylon::CPylonImage{
 
-    // Since 'GetBuffer' and 'GetMemoryView'allocate memory, they must not be called without
-    // the GIL being held. Therefore we have to tell SWIG not to release the GIL
-    // when calling them (%nothread).
-    %nothread GetBuffer;
+    // Since 'GetMemoryView' and '_Unpack10or12BitPacked' allocate memory,
+    // they must not be called without the GIL being held. Therefore we have to tell SWIG
+    // not to release the GIL when calling them (%nothread). They release it
+    // themselves while copying.
     %nothread GetMemoryView;
-    %nothread GetArrayZeroCopy;
+    %nothread _Unpack10or12BitPacked;
 
-    // Create an overload for 'GetBuffer' for easier type mapping.
+    // Create an overload for 'GetBuffer' for easier type mapping. The bytearray
+    // is created by the argout typemap after the GIL has been reacquired.
     void GetBuffer(void **buf_mem, size_t *length) {
         *buf_mem = $self->GetBuffer();
         *length = $self->GetImageSize();
@@ -36,6 +37,81 @@
 %#endif
     }
 
+    // Copy the image data into caller owned memory (e.g. a numpy array).
+    // These don't allocate Python objects, so the GIL is released.
+    void _CopyImageTo(size_t address, size_t size, size_t stride)
+    {
+        PylonCopyImageTo(
+            address, size, stride,
+            $self->GetBuffer(), $self->GetImageSize(),
+            $self->GetPixelType(), $self->GetWidth(), $self->GetHeight(), $self->GetPaddingX()
+            );
+    }
+
+    void _CopyBufferTo(size_t address, size_t size)
+    {
+        PylonCopyBufferTo(address, size, $self->GetBuffer(), $self->GetImageSize());
+    }
+
+    // Address of the data for exporting it without a copy, see __array__.
+    size_t _GetBufferAddress()
+    {
+        return reinterpret_cast<size_t>($self->GetBuffer());
+    }
+
+    // Export as DLPack capsule keeping a copy of the image alive, see __dlpack__.
+    // Creates Python objects, so the GIL must be held.
+    %nothread _GetDLPackCapsule;
+    PyObject* _GetDLPackCapsule(
+        int ndim, size_t shape0, size_t shape1, size_t shape2,
+        size_t stride0, size_t stride1, size_t stride2,
+        int typeCode, int bits, PyObject* keepalive
+        )
+    {
+        const size_t shape[3] = {shape0, shape1, shape2};
+        const size_t strides[3] = {stride0, stride1, stride2};
+        return PylonCreateDLPackCapsule(
+            *$self, $self->GetBuffer(), keepalive,
+            ndim, shape, strides, typeCode, bits
+            );
+    }
+
+    // Unpack into caller owned memory of lsb aligned 16 bit pixels. Runs without
+    // holding the GIL. Returns the pixel type of the unpacked data.
+    EPixelType _UnpackTo(size_t address, size_t size, size_t stride)
+    {
+        return PylonUnpackTo(
+            address, size, stride,
+            $self->GetBuffer(), $self->GetImageSize(),
+            $self->GetPixelType(), $self->GetWidth(), $self->GetHeight(), $self->GetPaddingX()
+            );
+    }
+
+    PyObject * _Unpack10or12BitPacked()
+    {
+        EPixelType ret_pt = PixelType_Undefined;
+        PyObject * data = PylonUnpackToByteArray(
+            ret_pt,
+            $self->GetBuffer(), $self->GetImageSize(),
+            $self->GetPixelType(), $self->GetWidth(), $self->GetHeight(), $self->GetPaddingX()
+            );
+        if (data == NULL)
+        {
+            return NULL;
+        }
+
+        // Build python return object
+        PyObject * result = 0;
+        // workaround for using AppendOutput outside of template for swig >= 4.3
+        const int IS_VOID = 1;
+        result = SWIG_Python_AppendOutput(result, data, IS_VOID);
+
+        PyObject * tp = PyInt_FromLong((long) ret_pt);
+        result = SWIG_Python_AppendOutput(result, tp, IS_VOID);
+
+        return result;
+    }
+
     PyObject* AttachMemoryView(PyObject* object, Pylon::EPixelType pixelType, unsigned int width, unsigned int height, size_t paddingX) {
 %#if !defined(Py_LIMITED_API) || Py_LIMITED_API+0 >= 0x030b0000
         Py_buffer buffer;
@@ -93,56 +169,7 @@
     def GetImageFormat(self, pt = None):
         if pt is None:
             pt = self.GetPixelType()
-        if IsPacked(pt):
-            raise ValueError("Packed Formats are not supported with numpy interface")
-        if pt in ( PixelType_Mono8, PixelType_BayerGR8, PixelType_BayerRG8, PixelType_BayerGB8, PixelType_BayerBG8, PixelType_Confidence8, PixelType_Coord3D_C8 ):
-            shape = (self.GetHeight(), self.GetWidth())
-            format = "B"
-            dtype = _pylon_numpy.uint8
-        elif pt in ( PixelType_Mono10, PixelType_BayerGR10, PixelType_BayerRG10, PixelType_BayerGB10, PixelType_BayerBG10 ):
-            shape = (self.GetHeight(), self.GetWidth())
-            format = "H"
-            dtype = _pylon_numpy.uint16
-        elif pt in ( PixelType_Mono12, PixelType_BayerGR12, PixelType_BayerRG12, PixelType_BayerGB12, PixelType_BayerBG12 ):
-            shape = (self.GetHeight(), self.GetWidth())
-            format = "H"
-            dtype = _pylon_numpy.uint16
-        elif pt in ( PixelType_Mono16, PixelType_BayerGR16, PixelType_BayerRG16, PixelType_BayerGB16, PixelType_BayerBG16, PixelType_Confidence16, PixelType_Coord3D_C16 ):
-            shape = (self.GetHeight(), self.GetWidth())
-            format = "H"
-            dtype = _pylon_numpy.uint16
-        elif pt in ( PixelType_RGB8packed, PixelType_BGR8packed ):
-            shape = (self.GetHeight(), self.GetWidth(), 3)
-            dtype = _pylon_numpy.uint8
-            format = "B"
-        elif pt in ( PixelType_RGB12packed, PixelType_BGR12packed, PixelType_RGB10packed, PixelType_BGR10packed ):
-            shape = (self.GetHeight(), self.GetWidth(), 3)
-            format = "H"
-            dtype = _pylon_numpy.uint16            
-        elif pt in ( PixelType_YUV422_YUYV_Packed, PixelType_YUV422packed ):
-            shape = (self.GetHeight(), self.GetWidth(), 2)
-            dtype = _pylon_numpy.uint8
-            format = "B"
-        elif pt in ( PixelType_Coord3D_ABC32f, ):
-            shape = (self.GetHeight(), self.GetWidth(), 3)
-            dtype = _pylon_numpy.float32
-            format = "f"
-        elif pt in ( PixelType_Data32f, ):
-            shape = (self.GetHeight(), self.GetWidth(), 1)
-            dtype = _pylon_numpy.float32
-            format = "f"
-        elif pt in ( PixelType_BiColorRGBG8, PixelType_BiColorBGRG8 ):
-            shape = (self.GetHeight(), self.GetWidth() * 2)
-            format = "B"
-            dtype = _pylon_numpy.uint8
-        elif pt in ( PixelType_BiColorRGBG10, PixelType_BiColorBGRG10, PixelType_BiColorRGBG12, PixelType_BiColorBGRG12 ):
-            shape = (self.GetHeight(), self.GetWidth() * 2)
-            format = "H"
-            dtype = _pylon_numpy.uint16
-        else:
-            raise ValueError("Pixel format currently not supported")
-
-        return (shape, dtype, format)
+        return _GetImageFormat(pt, self.GetWidth(), self.GetHeight())
 
     def __enter__(self):
         return self
@@ -158,24 +185,72 @@
         self.AttachMemoryView(array.data, pixeltype, width, height, paddingX)
 
     @needs_numpy
-    def GetArray(self, raw = False):
+    def GetArray(self, raw = False, out = None):
+        '''
+        Get a numpy array holding a copy of the image data.
+        If 'out' is given, the data is copied into this caller owned array,
+        which must have the shape and dtype of the image, and 'out' is returned.
+        '''
 
         # Raw case => Simple byte wrapping of buffer
         if raw:
-            shape, dtype, format = ( self.GetPayloadSize() ), _pylon_numpy.uint8, "B"
+            if out is not None:
+                address, size, stride = _GetOutArrayInfo(out, (self.GetImageSize(),), _pylon_numpy.uint8)
+                self._CopyBufferTo(address, size)
+                return out
+            shape, dtype, format = ( self.GetImageSize() ), _pylon_numpy.uint8, "B"
             buf = self.GetBuffer()
             return _pylon_numpy.ndarray(shape, dtype = dtype, buffer=buf)
 
         pt = self.GetPixelType()
-        if IsPacked(pt):
-            buf, new_pt = self._Unpack10or12BitPacked()
-            shape, dtype, format = self.GetImageFormat(new_pt)
+        descriptor = _pixel_format_registry.get(pt)
+        if descriptor is not None and descriptor.packed:
+            # Unpack straight into the destination array, the GIL is released meanwhile.
+            shape, dtype, format = _GetImageFormat(descriptor.unpackedType, self.GetWidth(), self.GetHeight())
+            if out is None:
+                out = _pylon_numpy.empty(shape, dtype = dtype)
+            address, size, stride = _GetOutArrayInfo(out, shape, dtype)
+            self._UnpackTo(address, size, stride)
+            return out
         else:
-            shape, dtype, format = self.GetImageFormat(pt)
+            shape, dtype, format = _GetImageFormat(pt, self.GetWidth(), self.GetHeight())
+            if out is not None:
+                # Single copy into the caller's array, the GIL is released meanwhile.
+                address, size, stride = _GetOutArrayInfo(out, shape, dtype)
+                self._CopyImageTo(address, size, stride)
+                return out
             buf = self.GetBuffer()
+            # Lines may be padded, the strides skip the padding bytes.
+            strides = _GetImageStrides(pt, self.GetWidth(), self.GetPaddingX())
 
         # Now we will copy the data into an array:
-        return _pylon_numpy.ndarray(shape, dtype = dtype, buffer=buf)
+        return _pylon_numpy.ndarray(shape, dtype = dtype, buffer=buf, strides=strides)
+
+    @needs_numpy
+    def __array__(self, dtype = None, copy = None):
+        '''
+        Export the image data to numpy without a copy, e.g. by numpy.asarray(obj).
+        The array holds a reference to the image buffer, so the data stays valid after
+        releasing or reusing this PylonImage.
+        Packed pixel formats are unpacked into a new array.
+        '''
+        return _ExportArray(self, PylonImage(self), self._GetBufferAddress(), self.GetImageSize(), dtype, copy,
+            (self.__dict__.get("_memory_view"), self.__dict__.get("_memory_view_buffer")))
+
+    def __buffer__(self, flags):
+        return _ExportBuffer(self)
+
+    @needs_numpy
+    def __dlpack__(self, *, stream = None, max_version = None, dl_device = None, copy = None):
+        '''
+        Export the image data as DLPack capsule, e.g. for torch.from_dlpack(obj).
+        The capsule keeps the image buffer alive until the consumer releases it.
+        '''
+        return _ExportDLPack(self, stream, dl_device, copy,
+            (self.__dict__.get("_memory_view"), self.__dict__.get("_memory_view_buffer")))
+
+    def __dlpack_device__(self):
+        return (_DLPACK_CPU, 0)
 
     @contextmanager
     @needs_numpy
@@ -187,16 +262,20 @@
 
         # For packed formats, we cannot zero-copy, so use GetArray
         pt = self.GetPixelType()
-        if IsPacked(pt):
+        descriptor = _pixel_format_registry.get(pt)
+        if descriptor is not None and descriptor.packed:
             yield self.GetArray()
             return
 
         mv = self.GetMemoryView()
-        if not raw:
-            shape, dtype, format = self.GetImageFormat()
-            mv = mv.cast(format, shape)
-
-        ar = _pylon_numpy.asarray(mv)
+        if raw:
+            ar = _pylon_numpy.asarray(mv)
+        else:
+            # Lines may be padded, the strides skip the padding bytes.
+            width = self.GetWidth()
+            shape, dtype, format = _GetImageFormat(pt, width, self.GetHeight())
+            strides = _GetImageStrides(pt, width, self.GetPaddingX())
+            ar = _pylon_numpy.ndarray(shape, dtype = dtype, buffer=mv, strides=strides)
 
         # trace external references to array
         initial_refcount = sys.getrefcount(ar)
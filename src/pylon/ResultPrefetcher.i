@@ -0,0 +1,363 @@
+%{
+namespace Pylon
+{
+    // Fills 'image' with the data of the successful grab 'result', converted
+    // to 'convertTo' by 'converter'. If 'convertTo' is PixelType_Undefined,
+    // packed formats are unpacked and others copied, like GrabResult.GetArray().
+    // Doesn't touch Python objects.
+    static void PylonMaterializeResult(CImageFormatConverter& converter, EPixelType convertTo, const CGrabResultPtr& result, CPylonImage& image)
+    {
+        const EPixelType pt = result->GetPixelType();
+        PylonUnpackInfo info;
+        if (convertTo != PixelType_Undefined)
+        {
+            converter.Convert(image, result);
+        }
+        else if (PylonGetUnpackInfo(pt, info))
+        {
+            image.Reset(info.unpackedType, result->GetWidth(), result->GetHeight());
+            PylonUnpackTo(
+                reinterpret_cast<size_t>(image.GetBuffer()), image.GetImageSize(), 0,
+                result->GetBuffer(), result->GetImageSize(),
+                pt, result->GetWidth(), result->GetHeight(), result->GetPaddingX()
+                );
+        }
+        else
+        {
+            image.CopyImage(result);
+        }
+    }
+
+    // Retrieves the grab results of a camera in a worker thread and converts
+    // them into images owned by the prefetcher, keeping up to 'depth' frames
+    // ready. The worker thread never touches Python objects. The images are
+    // taken from a pool of 'depth' + 2 images and refilled once Python has
+    // released the frame, so the pixel buffers aren't reallocated per frame.
+    class CResultPrefetcher
+    {
+    public:
+        CResultPrefetcher(CInstantCamera& camera, size_t depth = 2, EPixelType convertTo = PixelType_Undefined, unsigned int timeoutMs = 5000, CFrameFilter* filter = NULL)
+            : m_camera(camera)
+            , m_depth(depth)
+            , m_convertTo(convertTo)
+            , m_timeoutMs(timeoutMs)
+            , m_filter(filter)
+            , m_stopEvent(WaitObjectEx::Create())
+            , m_stop(false)
+            , m_finished(false)
+        {
+            if (depth == 0)
+            {
+                throw INVALID_ARGUMENT_EXCEPTION("The prefetch depth must not be zero.");
+            }
+            m_thread = std::thread(&CResultPrefetcher::Run, this);
+        }
+
+        ~CResultPrefetcher()
+        {
+            Close();
+        }
+
+        size_t GetDepth() const
+        {
+            return m_depth;
+        }
+
+        EPixelType GetConvertTo() const
+        {
+            return m_convertTo;
+        }
+
+        size_t GetNumReady()
+        {
+            std::lock_guard<std::mutex> guard(m_lock);
+            return m_ready.size();
+        }
+
+        // Waits up to 'timeoutMs' for the next frame. Returns 1 if a frame
+        // became the current frame of the calling thread, 0 on timeout and -1
+        // if the worker has finished. An error of the worker is thrown after all frames
+        // retrieved before it have been taken.
+        int _WaitNext(unsigned int timeoutMs)
+        {
+            std::unique_lock<std::mutex> lock(m_lock);
+            m_readyCondition.wait_for(lock, std::chrono::milliseconds(timeoutMs), [this] { return !m_ready.empty() || m_finished; });
+            if (!m_ready.empty())
+            {
+                m_current[std::this_thread::get_id()] = m_ready.front();
+                m_ready.pop_front();
+                m_spaceCondition.notify_one();
+                return 1;
+            }
+            if (!m_finished)
+            {
+                return 0;
+            }
+            if (m_error)
+            {
+                std::exception_ptr error = m_error;
+                m_error = std::exception_ptr();
+                std::rethrow_exception(error);
+            }
+            return -1;
+        }
+
+        // Hands the image of the current frame to the caller and drops the
+        // frame. The returned image references the buffer of the pool, which
+        // is refilled after the caller and all arrays exported from it are
+        // gone.
+        CPylonImage* _TakeImage()
+        {
+            std::lock_guard<std::mutex> guard(m_lock);
+            std::map<std::thread::id, Frame>::iterator it = m_current.find(std::this_thread::get_id());
+            CPylonImage* image = new CPylonImage();
+            if (it != m_current.end())
+            {
+                *image = it->second.image;
+                m_current.erase(it);
+            }
+            return image;
+        }
+
+        PyObject* _GetMetadataTuple()
+        {
+            PylonGrabResultMetadata metadata = PylonGrabResultMetadata();
+            {
+                std::lock_guard<std::mutex> guard(m_lock);
+                std::map<std::thread::id, Frame>::const_iterator it = m_current.find(std::this_thread::get_id());
+                if (it != m_current.end())
+                {
+                    metadata = it->second.metadata;
+                }
+            }
+            return PylonGrabResultMetadataToTuple(metadata);
+        }
+
+        // Stops the worker thread and drops the frames not taken yet.
+        void Close()
+        {
+            {
+                std::lock_guard<std::mutex> guard(m_lock);
+                m_stop = true;
+                m_spaceCondition.notify_one();
+            }
+            m_stopEvent.Signal();
+            if (m_thread.joinable())
+            {
+                m_thread.join();
+            }
+            std::lock_guard<std::mutex> guard(m_lock);
+            m_ready.clear();
+            m_current.clear();
+        }
+
+    private:
+        CResultPrefetcher(const CResultPrefetcher&);
+        CResultPrefetcher& operator=(const CResultPrefetcher&);
+
+        struct Frame
+        {
+            CPylonImage image;
+            PylonGrabResultMetadata metadata;
+        };
+
+        // Waits for a result passing the filter. Returns false if the
+        // prefetcher has been closed or the camera stopped grabbing.
+        bool Retrieve(CGrabResultPtr& result)
+        {
+            WaitObjects waitObjects;
+            waitObjects.Add(m_camera.GetGrabResultWaitObject());
+            waitObjects.Add(m_stopEvent);
+            const std::chrono::steady_clock::time_point deadline =
+                std::chrono::steady_clock::now() + std::chrono::milliseconds(m_timeoutMs);
+            for (;;)
+            {
+                if (!m_camera.IsGrabbing())
+                {
+                    return false;
+                }
+                const std::chrono::steady_clock::time_point now = std::chrono::steady_clock::now();
+                if (now >= deadline)
+                {
+                    throw TIMEOUT_EXCEPTION("Grab timed out after %u ms.", m_timeoutMs);
+                }
+                unsigned int index = 0;
+                const unsigned int remaining = static_cast<unsigned int>(std::chrono::duration_cast<std::chrono::milliseconds>(deadline - now).count());
+                if (!waitObjects.WaitForAny(remaining, &index))
+                {
+                    continue;
+                }
+                if (index == 1)
+                {
+                    return false;
+                }
+                const bool retrieved = m_filter != NULL
+                    ? m_filter->Retrieve(m_camera, 0, result, TimeoutHandling_Return)
+                    : m_camera.RetrieveResult(0, result, TimeoutHandling_Return);
+                if (retrieved)
+                {
+                    return true;
+                }
+            }
+        }
+
+        // Returns an image of the pool whose buffer is neither held by a frame
+        // nor by Python, so refilling it doesn't allocate, or NULL if all of
+        // them are in use. Only called by the worker thread.
+        CPylonImage* AcquireImage()
+        {
+            for (size_t i = 0; i < m_images.size(); ++i)
+            {
+                if (!m_images[i].IsValid() || m_images[i].IsUnique())
+                {
+                    return &m_images[i];
+                }
+            }
+            // Room for the ready frames, the one the consumer is processing
+            // and the one being filled.
+            if (m_images.size() < m_depth + 2)
+            {
+                m_images.push_back(CPylonImage());
+                return &m_images.back();
+            }
+            return NULL;
+        }
+
+        void Run()
+        {
+            try
+            {
+                CImageFormatConverter converter;
+                if (m_convertTo != PixelType_Undefined)
+                {
+                    converter.OutputPixelFormat.SetValue(m_convertTo);
+                }
+                for (;;)
+                {
+                    {
+                        std::unique_lock<std::mutex> lock(m_lock);
+                        m_spaceCondition.wait(lock, [this] { return m_stop || m_ready.size() < m_depth; });
+                        if (m_stop)
+                        {
+                            break;
+                        }
+                    }
+                    CGrabResultPtr result;
+                    if (!Retrieve(result))
+                    {
+                        break;
+                    }
+                    Frame frame;
+                    PylonFillGrabResultMetadata(frame.metadata, result);
+                    if (result->GrabSucceeded())
+                    {
+                        CPylonImage* image = AcquireImage();
+                        if (image != NULL)
+                        {
+                            // Materialized while unique, so the buffer is reused.
+                            PylonMaterializeResult(converter, m_convertTo, result, *image);
+                            frame.image = *image;
+                        }
+                        else
+                        {
+                            PylonMaterializeResult(converter, m_convertTo, result, frame.image);
+                        }
+                    }
+                    // The buffer goes back to the camera before the frame is
+                    // handed out.
+                    result.Release();
+                    std::lock_guard<std::mutex> guard(m_lock);
+                    m_ready.push_back(frame);
+                    m_readyCondition.notify_one();
+                }
+            }
+            catch (...)
+            {
+                std::lock_guard<std::mutex> guard(m_lock);
+                m_error = std::current_exception();
+            }
+            std::lock_guard<std::mutex> guard(m_lock);
+            m_finished = true;
+            m_readyCondition.notify_all();
+        }
+
+        CInstantCamera& m_camera;
+        const size_t m_depth;
+        const EPixelType m_convertTo;
+        const unsigned int m_timeoutMs;
+        CFrameFilter* m_filter;
+        WaitObjectEx m_stopEvent;
+        std::mutex m_lock;
+        std::condition_variable m_readyCondition;
+        std::condition_variable m_spaceCondition;
+        std::deque<Frame> m_ready;
+        // The current frame of every consuming thread, so threads iterating
+        // concurrently don't get each other's frames.
+        std::map<std::thread::id, Frame> m_current;
+        // Only used by the worker thread.
+        std::vector<CPylonImage> m_images;
+        std::exception_ptr m_error;
+        bool m_stop;
+        bool m_finished;
+        std::thread m_thread;
+    };
+}
+%}
+
+%rename(ResultPrefetcher) Pylon::CResultPrefetcher;
+%newobject Pylon::CResultPrefetcher::_TakeImage;
+%nothread Pylon::CResultPrefetcher::_GetMetadataTuple;
+
+namespace Pylon
+{
+    class CResultPrefetcher
+    {
+    public:
+        CResultPrefetcher(CInstantCamera& camera, size_t depth = 2, EPixelType convertTo = PixelType_Undefined, unsigned int timeoutMs = 5000, CFrameFilter* filter = NULL);
+        ~CResultPrefetcher();
+        size_t GetDepth() const;
+        EPixelType GetConvertTo() const;
+        size_t GetNumReady();
+        int _WaitNext(unsigned int timeoutMs);
+        CPylonImage* _TakeImage();
+        PyObject* _GetMetadataTuple();
+        void Close();
+    };
+}
+
+%extend Pylon::CResultPrefetcher {
+%pythoncode %{
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        # Wait in short slices, so the wait can be interrupted by signals.
+        while True:
+            state = self._WaitNext(100)
+            if state > 0:
+                break
+            if state < 0:
+                raise StopIteration
+        metadata = GrabResultMetadata._make(self._GetMetadataTuple())
+        image = self._TakeImage()
+        array = _pylon_numpy.asarray(image) if metadata.grabSucceeded else None
+        return PrefetchedFrame(array, metadata)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.Close()
+%}
+}
+
+%pythoncode %{
+class PrefetchedFrame(_namedtuple("PrefetchedFrame", ("array", "metadata"))):
+    '''
+    Frame delivered by InstantCamera.Prefetch. 'array' references a pooled
+    buffer of the prefetcher, which stays valid and isn't refilled while the
+    array or a view of it is alive. It is None if the grab failed.
+    'metadata' is a GrabResultMetadata.
+    '''
+    __slots__ = ()
+%}
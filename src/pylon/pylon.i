@@ -80,6 +80,18 @@ ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 %{
 
 #include <vector>
+#include <chrono>
+#include <cstring>
+#include <mutex>
+#include <thread>
+#include <condition_variable>
+#include <deque>
+#include <map>
+#include <algorithm>
+#include <exception>
+#include <atomic>
+#include <functional>
+#include <memory>
 
 // python defines own version of COMPILER macro which collides with genicam logic
 #define _PYTHON_COMPILER COMPILER
@@ -130,6 +142,8 @@ ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 using namespace Pylon;
 
+// Set once during module initialization and only read afterwards, so it can
+// be used from any thread, also in free-threaded builds.
 static PyObject* _genicam_translate = NULL;
 
 // Translates the C++ exception to a Python exception by calling into _genicam.
@@ -157,6 +171,733 @@ void TranslateGenicamException(const GenericException* e)
     }
 }
 
+// Copies the image data of a buffer into caller owned memory. The source rows
+// may contain padding bytes that are skipped, the destination rows may have a
+// stride that is larger than a row of pixel data. These helpers don't touch
+// any Python object, so the wrappers using them run without holding the GIL.
+
+static size_t PylonImageRowSize(EPixelType pt, uint32_t width)
+{
+    return (static_cast<size_t>(BitPerPixel(pt)) * width + 7) / 8;
+}
+
+static void PylonCopyRows(
+    void* dst, size_t dstStride,
+    const void* src, size_t srcStride,
+    size_t rowSize, size_t rows
+    )
+{
+    if (dstStride == rowSize && srcStride == rowSize)
+    {
+        memcpy(dst, src, rowSize * rows);
+        return;
+    }
+    uint8_t* d = static_cast<uint8_t*>(dst);
+    const uint8_t* s = static_cast<const uint8_t*>(src);
+    for (size_t y = 0; y < rows; ++y, d += dstStride, s += srcStride)
+    {
+        memcpy(d, s, rowSize);
+    }
+}
+
+static void PylonCopyImageTo(
+    size_t dstAddress, size_t dstSize, size_t dstStride,
+    const void* src, size_t srcSize,
+    EPixelType pt, uint32_t width, uint32_t height, size_t paddingX
+    )
+{
+    const size_t rowSize = PylonImageRowSize(pt, width);
+    const size_t srcStride = rowSize + paddingX;
+    if (dstStride == 0)
+    {
+        dstStride = rowSize;
+    }
+    if (src == NULL || height == 0)
+    {
+        throw RUNTIME_EXCEPTION("No image data available.");
+    }
+    if (dstStride < rowSize || dstSize < dstStride * (height - 1) + rowSize)
+    {
+        throw INVALID_ARGUMENT_EXCEPTION("Destination buffer is too small.");
+    }
+    if (srcSize < srcStride * (height - 1) + rowSize)
+    {
+        throw INVALID_ARGUMENT_EXCEPTION("Source buffer is too small for the image geometry.");
+    }
+    PylonCopyRows(
+        reinterpret_cast<void*>(dstAddress), dstStride,
+        src, srcStride,
+        rowSize, height
+        );
+}
+
+static void PylonCopyBufferTo(size_t dstAddress, size_t dstSize, const void* src, size_t srcSize)
+{
+    if (src == NULL)
+    {
+        throw RUNTIME_EXCEPTION("No buffer available.");
+    }
+    if (dstSize < srcSize)
+    {
+        throw INVALID_ARGUMENT_EXCEPTION("Destination buffer is too small.");
+    }
+    memcpy(reinterpret_cast<void*>(dstAddress), src, srcSize);
+}
+
+// Releases the GIL for the lifetime of the object. Must only be created while
+// holding the GIL. No Python object must be touched within its scope.
+class PylonGilRelease
+{
+public:
+    PylonGilRelease() : m_state(PyEval_SaveThread()) {}
+    ~PylonGilRelease() { PyEval_RestoreThread(m_state); }
+private:
+    PylonGilRelease(const PylonGilRelease&);
+    PylonGilRelease& operator=(const PylonGilRelease&);
+    PyThreadState* m_state;
+};
+
+// Copies 'size' bytes into a new bytearray. The bytearray is allocated with
+// the GIL held, the copy runs without it. Returns NULL with a Python error
+// set if the allocation fails.
+static PyObject* PylonCopyToByteArray(const void* src, size_t size)
+{
+    PyObject* data = PyByteArray_FromStringAndSize(NULL, static_cast<Py_ssize_t>(size));
+    if (data == NULL)
+    {
+        return NULL;
+    }
+    char* dst = PyByteArray_AsString(data);
+    {
+        PylonGilRelease release;
+        memcpy(dst, src, size);
+    }
+    return data;
+}
+
+// Native worker threads for splitting work like image conversion into tasks.
+// Tasks must not touch Python objects. The pool is created on first use and
+// intentionally never destroyed, joining threads during process exit can
+// deadlock.
+class PylonThreadPool
+{
+public:
+    static PylonThreadPool& Instance()
+    {
+        static PylonThreadPool* pool = new PylonThreadPool();
+        return *pool;
+    }
+
+    // Returns the number of threads used for 'numThreads' = 0.
+    static size_t GetDefaultNumThreads()
+    {
+        return std::max<size_t>(1, std::thread::hardware_concurrency());
+    }
+
+    // Runs task(0) ... task(numTasks - 1) on up to 'numThreads' threads and
+    // waits for them. The calling thread runs tasks as well. The first
+    // exception thrown by a task is rethrown after all tasks have finished.
+    void Run(size_t numTasks, size_t numThreads, const std::function<void(size_t)>& task)
+    {
+        if (numThreads == 0)
+        {
+            numThreads = GetDefaultNumThreads();
+        }
+        numThreads = std::min(numThreads, numTasks);
+        if (numThreads <= 1)
+        {
+            for (size_t i = 0; i < numTasks; ++i)
+            {
+                task(i);
+            }
+            return;
+        }
+
+        Job job(numTasks, task);
+        {
+            std::lock_guard<std::mutex> guard(m_lock);
+            while (m_workers.size() < numThreads - 1)
+            {
+                m_workers.push_back(std::thread(&PylonThreadPool::Work, this));
+                m_workers.back().detach();
+            }
+            for (size_t i = 0; i < numThreads - 1; ++i)
+            {
+                m_jobs.push_back(&job);
+            }
+        }
+        m_jobCondition.notify_all();
+        job.Execute();
+
+        // Helpers still running a task hold a reference to the job.
+        std::unique_lock<std::mutex> lock(m_lock);
+        m_jobs.erase(std::remove(m_jobs.begin(), m_jobs.end(), &job), m_jobs.end());
+        m_doneCondition.wait(lock, [&job] { return job.numActive == 0; });
+        lock.unlock();
+        if (job.error)
+        {
+            std::rethrow_exception(job.error);
+        }
+    }
+
+private:
+    struct Job
+    {
+        Job(size_t numTasks_, const std::function<void(size_t)>& task_)
+            : numTasks(numTasks_), task(task_), next(0), numActive(0)
+        {
+        }
+
+        // Runs tasks until none is left.
+        void Execute()
+        {
+            for (size_t i = next++; i < numTasks; i = next++)
+            {
+                try
+                {
+                    task(i);
+                }
+                catch (...)
+                {
+                    std::lock_guard<std::mutex> guard(errorLock);
+                    if (!error)
+                    {
+                        error = std::current_exception();
+                    }
+                }
+            }
+        }
+
+        const size_t numTasks;
+        const std::function<void(size_t)>& task;
+        std::atomic<size_t> next;
+        size_t numActive; // guarded by the lock of the pool
+        std::mutex errorLock;
+        std::exception_ptr error;
+    };
+
+    PylonThreadPool() {}
+
+    void Work()
+    {
+        std::unique_lock<std::mutex> lock(m_lock);
+        for (;;)
+        {
+            m_jobCondition.wait(lock, [this] { return !m_jobs.empty(); });
+            Job* job = m_jobs.front();
+            m_jobs.pop_front();
+            ++job->numActive;
+            lock.unlock();
+            job->Execute();
+            lock.lock();
+            --job->numActive;
+            m_doneCondition.notify_all();
+        }
+    }
+
+    std::mutex m_lock;
+    std::condition_variable m_jobCondition;
+    std::condition_variable m_doneCondition;
+    std::deque<Job*> m_jobs;
+    std::vector<std::thread> m_workers;
+};
+
+// Unpack kernels for the packed 10 and 12 bit mono formats. Every kernel
+// converts one row of 'width' pixels to lsb aligned 16 bit values. 'width'
+// must be a multiple of the pixel group size of the format.
+
+static void PylonUnpackRowMono10p(uint16_t* dst, const uint8_t* src, uint32_t width)
+{
+    // 4 pixels in 5 bytes, lsb first
+    for (uint32_t x = 0; x < width; x += 4, src += 5, dst += 4)
+    {
+        const uint32_t b0 = src[0], b1 = src[1], b2 = src[2], b3 = src[3], b4 = src[4];
+        dst[0] = static_cast<uint16_t>(b0 | ((b1 & 0x03) << 8));
+        dst[1] = static_cast<uint16_t>((b1 >> 2) | ((b2 & 0x0F) << 6));
+        dst[2] = static_cast<uint16_t>((b2 >> 4) | ((b3 & 0x3F) << 4));
+        dst[3] = static_cast<uint16_t>((b3 >> 6) | (b4 << 2));
+    }
+}
+
+static void PylonUnpackRowMono12p(uint16_t* dst, const uint8_t* src, uint32_t width)
+{
+    // 2 pixels in 3 bytes, lsb first
+    for (uint32_t x = 0; x < width; x += 2, src += 3, dst += 2)
+    {
+        const uint32_t b0 = src[0], b1 = src[1], b2 = src[2];
+        dst[0] = static_cast<uint16_t>(b0 | ((b1 & 0x0F) << 8));
+        dst[1] = static_cast<uint16_t>((b1 >> 4) | (b2 << 4));
+    }
+}
+
+static void PylonUnpackRowMono10packed(uint16_t* dst, const uint8_t* src, uint32_t width)
+{
+    // 2 pixels in 3 bytes, the middle byte holds the low bits of both pixels
+    for (uint32_t x = 0; x < width; x += 2, src += 3, dst += 2)
+    {
+        const uint32_t b0 = src[0], b1 = src[1], b2 = src[2];
+        dst[0] = static_cast<uint16_t>((b0 << 2) | (b1 & 0x03));
+        dst[1] = static_cast<uint16_t>((b2 << 2) | ((b1 >> 4) & 0x03));
+    }
+}
+
+static void PylonUnpackRowMono12packed(uint16_t* dst, const uint8_t* src, uint32_t width)
+{
+    // 2 pixels in 3 bytes, the middle byte holds the low nibbles of both pixels
+    for (uint32_t x = 0; x < width; x += 2, src += 3, dst += 2)
+    {
+        const uint32_t b0 = src[0], b1 = src[1], b2 = src[2];
+        dst[0] = static_cast<uint16_t>((b0 << 4) | (b1 & 0x0F));
+        dst[1] = static_cast<uint16_t>((b2 << 4) | (b1 >> 4));
+    }
+}
+
+typedef void (*PylonUnpackRowFunc)(uint16_t* dst, const uint8_t* src, uint32_t width);
+
+struct PylonUnpackInfo
+{
+    EPixelType unpackedType;        // pixel type of the unpacked data
+    EPixelType converterType;       // pixel type passed to the fallback converter
+    PylonUnpackRowFunc unpackRow;   // kernel for one row
+    uint32_t groupSize;             // number of pixels filling whole bytes
+};
+
+/*
+ * Hack: Image format converter does not allow Bayer* as output format
+ *       so we treat Bayer* as Mono* as we only are interested in the
+ *       unpack operation.
+ */
+static bool PylonGetUnpackInfo(EPixelType pt, PylonUnpackInfo& info)
+{
+    switch (pt)
+    {
+    case PixelType_Mono12packed:
+        info = PylonUnpackInfo{PixelType_Mono12, PixelType_Mono12packed, PylonUnpackRowMono12packed, 2};
+        return true;
+    case PixelType_BayerBG12Packed:
+        info = PylonUnpackInfo{PixelType_BayerBG12, PixelType_Mono12packed, PylonUnpackRowMono12packed, 2};
+        return true;
+    case PixelType_BayerGB12Packed:
+        info = PylonUnpackInfo{PixelType_BayerGB12, PixelType_Mono12packed, PylonUnpackRowMono12packed, 2};
+        return true;
+    case PixelType_BayerRG12Packed:
+        info = PylonUnpackInfo{PixelType_BayerRG12, PixelType_Mono12packed, PylonUnpackRowMono12packed, 2};
+        return true;
+    case PixelType_BayerGR12Packed:
+        info = PylonUnpackInfo{PixelType_BayerGR12, PixelType_Mono12packed, PylonUnpackRowMono12packed, 2};
+        return true;
+    case PixelType_Mono12p:
+        info = PylonUnpackInfo{PixelType_Mono12, PixelType_Mono12p, PylonUnpackRowMono12p, 2};
+        return true;
+    case PixelType_BayerBG12p:
+        info = PylonUnpackInfo{PixelType_BayerBG12, PixelType_Mono12p, PylonUnpackRowMono12p, 2};
+        return true;
+    case PixelType_BayerGB12p:
+        info = PylonUnpackInfo{PixelType_BayerGB12, PixelType_Mono12p, PylonUnpackRowMono12p, 2};
+        return true;
+    case PixelType_BayerRG12p:
+        info = PylonUnpackInfo{PixelType_BayerRG12, PixelType_Mono12p, PylonUnpackRowMono12p, 2};
+        return true;
+    case PixelType_BayerGR12p:
+        info = PylonUnpackInfo{PixelType_BayerGR12, PixelType_Mono12p, PylonUnpackRowMono12p, 2};
+        return true;
+    case PixelType_Mono10packed:
+        info = PylonUnpackInfo{PixelType_Mono10, PixelType_Mono10packed, PylonUnpackRowMono10packed, 2};
+        return true;
+    case PixelType_Mono10p:
+        info = PylonUnpackInfo{PixelType_Mono10, PixelType_Mono10p, PylonUnpackRowMono10p, 4};
+        return true;
+    case PixelType_BayerBG10p:
+        info = PylonUnpackInfo{PixelType_BayerBG10, PixelType_Mono10p, PylonUnpackRowMono10p, 4};
+        return true;
+    case PixelType_BayerGB10p:
+        info = PylonUnpackInfo{PixelType_BayerGB10, PixelType_Mono10p, PylonUnpackRowMono10p, 4};
+        return true;
+    case PixelType_BayerRG10p:
+        info = PylonUnpackInfo{PixelType_BayerRG10, PixelType_Mono10p, PylonUnpackRowMono10p, 4};
+        return true;
+    case PixelType_BayerGR10p:
+        info = PylonUnpackInfo{PixelType_BayerGR10, PixelType_Mono10p, PylonUnpackRowMono10p, 4};
+        return true;
+    default:
+        return false;
+    }
+}
+
+// Rows that don't end on a byte boundary are rare, they are left to the pylon
+// converter. The converter is created once and kept for the lifetime of the
+// process. It is deliberately never deleted, since that could happen after
+// PylonTerminate has been called.
+static void PylonUnpackWithConverter(
+    uint8_t* dst, size_t dstStride,
+    const void* src, size_t srcSize,
+    EPixelType converterType, uint32_t width, uint32_t height, size_t paddingX
+    )
+{
+    static std::mutex converter_lock;
+    static CImageFormatConverter* converter = NULL;
+
+    std::lock_guard<std::mutex> guard(converter_lock);
+    if (converter == NULL)
+    {
+        converter = new CImageFormatConverter();
+        converter->OutputPixelFormat = PixelType_Mono16;
+        converter->OutputBitAlignment = OutputBitAlignment_LsbAligned;
+    }
+
+    const size_t rowSize = static_cast<size_t>(width) * sizeof(uint16_t);
+    const size_t size = converter->GetBufferSizeForConversion(converterType, width, height);
+    try
+    {
+        if (dstStride == rowSize && size == rowSize * height)
+        {
+            converter->Convert(dst, size, src, srcSize, converterType, width, height, paddingX, ImageOrientation_TopDown);
+        }
+        else
+        {
+            std::vector<uint8_t> tmp(size);
+            converter->Convert(&tmp[0], size, src, srcSize, converterType, width, height, paddingX, ImageOrientation_TopDown);
+            PylonCopyRows(dst, dstStride, &tmp[0], size / height, rowSize, height);
+        }
+    }
+    catch (...)
+    {
+        throw LOGICAL_ERROR_EXCEPTION( "Failed to unpack!");
+    }
+}
+
+// Unpacks a 10 or 12 bit packed image to lsb aligned 16 bit pixels into
+// caller owned memory. Returns the pixel type of the unpacked data.
+static EPixelType PylonUnpackTo(
+    size_t dstAddress, size_t dstSize, size_t dstStride,
+    const void* src, size_t srcSize,
+    EPixelType pt, uint32_t width, uint32_t height, size_t paddingX
+    )
+{
+    PylonUnpackInfo info;
+    if (!PylonGetUnpackInfo(pt, info))
+    {
+        throw INVALID_ARGUMENT_EXCEPTION( "Invalid PixelFormat, unable to unpack.");
+    }
+    const size_t dstRowSize = static_cast<size_t>(width) * sizeof(uint16_t);
+    if (dstStride == 0)
+    {
+        dstStride = dstRowSize;
+    }
+    if (src == NULL || height == 0)
+    {
+        throw RUNTIME_EXCEPTION("No image data available.");
+    }
+    if (dstStride < dstRowSize || dstSize < dstStride * (height - 1) + dstRowSize)
+    {
+        throw INVALID_ARGUMENT_EXCEPTION("Destination buffer is too small.");
+    }
+
+    uint8_t* dst = reinterpret_cast<uint8_t*>(dstAddress);
+    if (width % info.groupSize != 0)
+    {
+        PylonUnpackWithConverter(dst, dstStride, src, srcSize, info.converterType, width, height, paddingX);
+        return info.unpackedType;
+    }
+
+    const size_t srcRowSize = PylonImageRowSize(pt, width);
+    const size_t srcStride = srcRowSize + paddingX;
+    if (srcSize < srcStride * (height - 1) + srcRowSize)
+    {
+        throw INVALID_ARGUMENT_EXCEPTION("Source buffer is too small for the image geometry.");
+    }
+    const uint8_t* s = static_cast<const uint8_t*>(src);
+    for (uint32_t y = 0; y < height; ++y, s += srcStride, dst += dstStride)
+    {
+        info.unpackRow(reinterpret_cast<uint16_t*>(dst), s, width);
+    }
+    return info.unpackedType;
+}
+
+// Unpacks into a new bytearray. Must be called with the GIL held, the GIL is
+// released while unpacking.
+static PyObject* PylonUnpackToByteArray(
+    EPixelType& unpackedType,
+    const void* src, size_t srcSize,
+    EPixelType pt, uint32_t width, uint32_t height, size_t paddingX
+    )
+{
+    const size_t size = static_cast<size_t>(width) * height * sizeof(uint16_t);
+    PyObject* data = PyByteArray_FromStringAndSize(NULL, static_cast<Py_ssize_t>(size));
+    if (data == NULL)
+    {
+        return NULL;
+    }
+    const size_t address = reinterpret_cast<size_t>(PyByteArray_AsString(data));
+    try
+    {
+        PylonGilRelease release;
+        unpackedType = PylonUnpackTo(address, size, 0, src, srcSize, pt, width, height, paddingX);
+    }
+    catch (...)
+    {
+        Py_DECREF(data);
+        throw;
+    }
+    return data;
+}
+
+// Fixed layout snapshot of the per frame information of a grab result. The
+// layout matches the numpy dtype GrabResultMetadataDtype (align=True).
+struct PylonGrabResultMetadata
+{
+    uint64_t timeStamp;
+    int64_t id;
+    int64_t imageNumber;
+    uint64_t blockId;
+    int64_t cameraContext;
+    uint32_t width;
+    uint32_t height;
+    uint32_t paddingX;
+    uint32_t pixelType;
+    uint32_t errorCode;
+    uint8_t grabSucceeded;
+};
+
+static void PylonFillGrabResultMetadata(PylonGrabResultMetadata& m, const CGrabResultPtr& result)
+{
+    memset(&m, 0, sizeof(m));
+    if (!result.IsValid())
+    {
+        return;
+    }
+    m.timeStamp = result->GetTimeStamp();
+    m.id = result->GetID();
+    m.imageNumber = result->GetImageNumber();
+    m.blockId = result->GetBlockID();
+    m.cameraContext = static_cast<int64_t>(result->GetCameraContext());
+    m.width = result->GetWidth();
+    m.height = result->GetHeight();
+    m.paddingX = static_cast<uint32_t>(result->GetPaddingX());
+    m.pixelType = static_cast<uint32_t>(result->GetPixelType());
+    m.errorCode = result->GetErrorCode();
+    m.grabSucceeded = result->GrabSucceeded() ? 1 : 0;
+}
+
+// Returns the record as tuple in the field order of GrabResultMetadata.
+static PyObject* PylonGrabResultMetadataToTuple(const PylonGrabResultMetadata& m)
+{
+    return Py_BuildValue(
+        "(KLLKLIIIIIN)",
+        static_cast<unsigned long long>(m.timeStamp),
+        static_cast<long long>(m.id),
+        static_cast<long long>(m.imageNumber),
+        static_cast<unsigned long long>(m.blockId),
+        static_cast<long long>(m.cameraContext),
+        m.width, m.height, m.paddingX, m.pixelType, m.errorCode,
+        PyBool_FromLong(m.grabSucceeded)
+        );
+}
+
+// Copies 'count' metadata records into caller owned memory, e.g. a numpy
+// structured array of GrabResultMetadataDtype.
+static void PylonFillGrabResultMetadataTo(
+    size_t dstAddress, size_t dstSize, size_t itemSize,
+    const CGrabResultPtr* results, size_t count
+    )
+{
+    if (itemSize != sizeof(PylonGrabResultMetadata))
+    {
+        throw LOGICAL_ERROR_EXCEPTION("Metadata record size mismatch.");
+    }
+    if (dstSize < count * itemSize)
+    {
+        throw INVALID_ARGUMENT_EXCEPTION("Destination buffer is too small.");
+    }
+    PylonGrabResultMetadata* dst = reinterpret_cast<PylonGrabResultMetadata*>(dstAddress);
+    for (size_t i = 0; i < count; ++i)
+    {
+        PylonFillGrabResultMetadata(dst[i], results[i]);
+    }
+}
+
+// Copies or unpacks image data of a grab result into caller owned memory.
+// Returns false if the result doesn't match the given geometry.
+static bool PylonCopyResultTo(
+    size_t dstAddress, size_t dstSize, size_t dstStride,
+    const CGrabResultPtr& result,
+    EPixelType pt, uint32_t width, uint32_t height
+    )
+{
+    if (!result.IsValid() || !result->GrabSucceeded() || result->GetPixelType() != pt
+        || result->GetWidth() != width || result->GetHeight() != height)
+    {
+        return false;
+    }
+    PylonUnpackInfo info;
+    if (PylonGetUnpackInfo(pt, info))
+    {
+        PylonUnpackTo(
+            dstAddress, dstSize, dstStride,
+            result->GetBuffer(), result->GetImageSize(),
+            pt, width, height, result->GetPaddingX()
+            );
+    }
+    else
+    {
+        PylonCopyImageTo(
+            dstAddress, dstSize, dstStride,
+            result->GetBuffer(), result->GetImageSize(),
+            pt, width, height, result->GetPaddingX()
+            );
+    }
+    return true;
+}
+
+// Minimal DLPack (https://github.com/dmlc/dlpack) definitions for exporting
+// image data as legacy "dltensor" capsules. They are layout compatible with
+// DLManagedTensor of dlpack.h, which is not required for building pypylon.
+
+struct PylonDLDevice
+{
+    int32_t device_type;            // 1 == kDLCPU
+    int32_t device_id;
+};
+
+struct PylonDLDataType
+{
+    uint8_t code;                   // 0 == kDLInt, 1 == kDLUInt, 2 == kDLFloat
+    uint8_t bits;
+    uint16_t lanes;
+};
+
+struct PylonDLTensor
+{
+    void* data;
+    PylonDLDevice device;
+    int32_t ndim;
+    PylonDLDataType dtype;
+    int64_t* shape;
+    int64_t* strides;               // in elements, not bytes
+    uint64_t byte_offset;
+};
+
+struct PylonDLManagedTensor
+{
+    PylonDLTensor dl_tensor;
+    void* manager_ctx;
+    void (*deleter)(PylonDLManagedTensor* self);
+};
+
+// Owns everything a DLPack tensor refers to. 'keepalive' is an optional Python
+// object holding memory the owner doesn't manage itself (e.g. a memory view
+// attached to a PylonImage).
+struct PylonDLPackContext
+{
+    PylonDLPackContext() : keepalive(NULL) {}
+    virtual ~PylonDLPackContext() {}
+
+    PylonDLManagedTensor tensor;
+    int64_t shape[3];
+    int64_t strides[3];
+    PyObject* keepalive;
+};
+
+template <class T>
+struct PylonDLPackOwner : public PylonDLPackContext
+{
+    explicit PylonDLPackOwner(const T& o) : owner(o) {}
+    T owner;
+};
+
+// The consumer may call the deleter from any thread, with or without the GIL.
+// The owner copy (e.g. a CGrabResultPtr) is released without the GIL, only
+// the keepalive object needs it.
+static void PylonDLPackDeleter(PylonDLManagedTensor* self)
+{
+    PylonDLPackContext* ctx = static_cast<PylonDLPackContext*>(self->manager_ctx);
+    PyObject* keepalive = ctx->keepalive;
+    delete ctx;
+    if (keepalive != NULL && Py_IsInitialized())
+    {
+        PyGILState_STATE state = PyGILState_Ensure();
+        Py_DECREF(keepalive);
+        PyGILState_Release(state);
+    }
+}
+
+// Called when the capsule dies. If a consumer took the tensor, it renamed
+// the capsule to "used_dltensor" and is responsible for calling the deleter.
+static void PylonDLPackCapsuleDestructor(PyObject* capsule)
+{
+    if (PyCapsule_IsValid(capsule, "used_dltensor"))
+    {
+        return;
+    }
+    PylonDLManagedTensor* tensor = static_cast<PylonDLManagedTensor*>(PyCapsule_GetPointer(capsule, "dltensor"));
+    if (tensor == NULL)
+    {
+        PyErr_WriteUnraisable(capsule);
+        return;
+    }
+    tensor->deleter(tensor);
+}
+
+// Creates a "dltensor" capsule for 'data' keeping a copy of 'owner' alive.
+// 'shape' and 'strides' describe 'ndim' dimensions, strides in bytes.
+// Must be called with the GIL held.
+template <class T>
+static PyObject* PylonCreateDLPackCapsule(
+    const T& owner, void* data, PyObject* keepalive,
+    int ndim, const size_t* shape, const size_t* strides,
+    int typeCode, int bits
+    )
+{
+    if (data == NULL)
+    {
+        throw RUNTIME_EXCEPTION("No image data available.");
+    }
+    if (ndim < 1 || ndim > 3 || bits <= 0 || bits % 8 != 0)
+    {
+        throw INVALID_ARGUMENT_EXCEPTION("Invalid tensor layout.");
+    }
+    const size_t itemsize = static_cast<size_t>(bits / 8);
+
+    PylonDLPackOwner<T>* ctx = new PylonDLPackOwner<T>(owner);
+    for (int i = 0; i < ndim; ++i)
+    {
+        if (strides[i] % itemsize != 0)
+        {
+            delete ctx;
+            throw INVALID_ARGUMENT_EXCEPTION("Strides must be a multiple of the item size.");
+        }
+        ctx->shape[i] = static_cast<int64_t>(shape[i]);
+        ctx->strides[i] = static_cast<int64_t>(strides[i] / itemsize);
+    }
+
+    PylonDLTensor& t = ctx->tensor.dl_tensor;
+    t.data = data;
+    t.device.device_type = 1;
+    t.device.device_id = 0;
+    t.ndim = ndim;
+    t.dtype.code = static_cast<uint8_t>(typeCode);
+    t.dtype.bits = static_cast<uint8_t>(bits);
+    t.dtype.lanes = 1;
+    t.shape = ctx->shape;
+    t.strides = ctx->strides;
+    t.byte_offset = 0;
+    ctx->tensor.manager_ctx = ctx;
+    ctx->tensor.deleter = PylonDLPackDeleter;
+
+    PyObject* capsule = PyCapsule_New(&ctx->tensor, "dltensor", PylonDLPackCapsuleDestructor);
+    if (capsule == NULL)
+    {
+        delete ctx;
+        return NULL;
+    }
+    if (keepalive != NULL && keepalive != Py_None)
+    {
+        Py_INCREF(keepalive);
+        ctx->keepalive = keepalive;
+    }
+    return capsule;
+}
+
 //  For copy deployment of pylon DLLs:
 //
 //  Version 5.0.5 of Pylon started to use LoadLibraryEx in order to load its
@@ -280,6 +1021,13 @@ static void FixPylonDllLoadingIfNecessary()
 
 %init %{
 
+#ifdef Py_GIL_DISABLED
+    // The SWIG runtime (type lookup, ownership flags, directors) and the
+    // state the wrappers keep in Python objects still rely on the GIL, so
+    // free-threaded builds keep it enabled while the module is loaded.
+    PyUnstable_Module_SetGIL(m, Py_MOD_GIL_USED);
+#endif
+
     Pylon::PylonInitialize();
 
     // register PylonTerminate on interpreter shutdown
@@ -454,9 +1202,11 @@ def needs_numpy(func):
 
 %typemap(argout, noblock=1) (void ** buf_mem, size_t *length) {
   if (*$1) {
-    %append_output(PyByteArray_FromStringAndSize(
-        (const char *)*$1, %numeric_cast(*$2, int))
-        );
+    PyObject* data = PylonCopyToByteArray(*$1, *$2);
+    if (data == NULL) {
+      SWIG_fail;
+    }
+    %append_output(data);
   }
 };
 
@@ -618,9 +1368,13 @@ const Pylon::StringList_t & (Pylon::StringList_t str_list)
 %include "GrabResultPtr.i"
 %include "WaitObject.i"
 %include "WaitObjects.i"
+%include "BufferFactory.i"
 %include "InstantCameraParams.i"
 %include "InstantCamera.i"
+%include "FrameFilter.i"
+%include "GrabStatistics.i"
 %include "InstantCameraArray.i"
+%include "GrabResultBatch.i"
 %include "ImageEventHandler.i"
 %include "ConfigurationEventHandler.i"
 %include "CameraEventHandler.i"
@@ -634,6 +1388,8 @@ const Pylon::StringList_t & (Pylon::StringList_t str_list)
 %include "PylonImage.i"
 %include "_ImageFormatConverterParams.i"
 %include "ImageFormatConverter.i"
+%include "ResultPrefetcher.i"
+%include "Pipeline.i"
 #ifdef HAVE_PYLON_GUI
 %include "PylonGUI.i"
 #endif
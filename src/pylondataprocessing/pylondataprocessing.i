@@ -171,6 +171,8 @@ namespace Pylon
 
 using namespace Pylon;
 
+// Set once during module initialization and only read afterwards, so it can
+// be used from any thread, also in free-threaded builds.
 static PyObject* _genicam_translate = NULL;
 
 // Translates the C++ exception to a Python exception by calling into _genicam.
@@ -202,6 +204,13 @@ void TranslateGenicamException(const GenericException* e)
 
 %init %{
 
+#ifdef Py_GIL_DISABLED
+    // The SWIG runtime (type lookup, ownership flags, directors) and the
+    // state the wrappers keep in Python objects still rely on the GIL, so
+    // free-threaded builds keep it enabled while the module is loaded.
+    PyUnstable_Module_SetGIL(m, Py_MOD_GIL_USED);
+#endif
+
     Pylon::PylonInitialize();
 
     // register PylonTerminate on interpreter shutdown
@@ -0,0 +1,254 @@
+"""
+Scaling of ImageFormatConverter.Convert() with the number of threads.
+
+A large frame is grabbed from the camera emulator and converted --frames times
+for 1, 2, 4, ... threads up to the number of cores. The best of --repeat runs
+is reported. Every conversion is checked to be identical to the conversion by
+one thread.
+
+With --regions, producing a thumbnail downscaled by --scale and four ROIs
+of a quarter of the width and height each is compared for converting the
+whole frame followed by cropping and averaging in numpy, and a single
+ConvertRegions() call.
+
+With --batch N, converting N frames by a loop of Convert() calls is compared
+with a single ConvertBatch() call for the same thread counts.
+
+Usage: python conversion_benchmark.py [--width W] [--height H]
+           [--formats BayerRG8,Mono8] [--output-format BGR8packed]
+           [--frames N] [--repeat R] [--batch N] [--regions] [--scale S]
+           [--output results.json]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault("PYLON_CAMEMU", "1")
+
+import numpy as np
+import pypylon
+from pypylon import genicam, pylon
+
+
+def create_camera():
+    di = pylon.DeviceInfo()
+    di.SetDeviceClass("BaslerCamEmu")
+    camera = pylon.InstantCamera(pylon.TlFactory.GetInstance().CreateFirstDevice(di))
+    camera.Open()
+    if genicam.IsAvailable(camera.GetNodeMap().GetNode("AcquisitionFrameRateEnable")):
+        camera.AcquisitionFrameRateEnable.Value = False
+    return camera
+
+
+def grab_one(camera, width, height, pixel_format):
+    camera.PixelFormat.Value = pixel_format
+    camera.Width.Value = min(width, camera.Width.Max)
+    camera.Height.Value = min(height, camera.Height.Max)
+    camera.StartGrabbingMax(1)
+    result = camera.RetrieveResult(5000)
+    camera.StopGrabbing()
+    if not result.GrabSucceeded():
+        raise RuntimeError("grab failed: %s" % result.GetErrorDescription())
+    return result
+
+
+def thread_counts(maximum):
+    counts = []
+    n = 1
+    while n < maximum:
+        counts.append(n)
+        n *= 2
+    counts.append(maximum)
+    return counts
+
+
+def measure(func, repeat):
+    # Returns the seconds of the best of 'repeat' runs.
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return min(runs)
+
+
+def bench(result, pixel_format, output_format, args):
+    converter = pylon.ImageFormatConverter()
+    converter.OutputPixelFormat = getattr(pylon, "PixelType_" + output_format)
+    expected = converter.Convert(result).GetArray()
+    out = np.empty_like(expected)
+    records = []
+    base = None
+    for count in thread_counts(os.cpu_count() or 1):
+        converter.NumThreads = count
+        converter.Convert(result, out=out)
+        if not np.array_equal(out, expected):
+            raise RuntimeError("conversion with %d threads differs from one thread" % count)
+
+        def run():
+            for _ in range(args.frames):
+                converter.Convert(result, out=out)
+
+        best = measure(run, args.repeat) / args.frames
+        if base is None:
+            base = best
+        records.append({
+            "pixelFormat": pixel_format,
+            "outputPixelFormat": output_format,
+            "width": result.GetWidth(),
+            "height": result.GetHeight(),
+            "threads": count,
+            "bestUs": best * 1e6,
+            "megapixelsPerSecond": result.GetWidth() * result.GetHeight() / best / 1e6,
+            "speedup": base / best,
+        })
+        print("%-9s -> %-10s %4dx%-4d %3d threads %10.1f us/frame %8.1f MP/s  speedup %5.2f" % (
+            pixel_format, output_format, result.GetWidth(), result.GetHeight(), count, best * 1e6,
+            records[-1]["megapixelsPerSecond"], base / best))
+    return records
+
+
+def bench_batch(result, pixel_format, output_format, args):
+    converter = pylon.ImageFormatConverter()
+    converter.OutputPixelFormat = getattr(pylon, "PixelType_" + output_format)
+    sources = [result] * args.batch
+    out, errors = converter.ConvertBatch(sources, numThreads=1)
+    if errors:
+        raise RuntimeError("batch conversion failed: %r" % errors)
+    records = []
+    for count in thread_counts(os.cpu_count() or 1):
+        converter.NumThreads = count
+
+        def run_loop():
+            for i in range(args.batch):
+                converter.Convert(result, out=out[i])
+
+        def run_batch():
+            converter.ConvertBatch(sources, out=out, numThreads=count)
+
+        for variant, func in (("loop", run_loop), ("batch", run_batch)):
+            best = measure(func, args.repeat) / args.batch
+            records.append({
+                "pixelFormat": pixel_format,
+                "outputPixelFormat": output_format,
+                "width": result.GetWidth(),
+                "height": result.GetHeight(),
+                "variant": variant,
+                "batch": args.batch,
+                "threads": count,
+                "bestUs": best * 1e6,
+                "megapixelsPerSecond": result.GetWidth() * result.GetHeight() / best / 1e6,
+            })
+            print("%-9s -> %-10s %4dx%-4d %-5s %3d threads %10.1f us/frame %8.1f MP/s" % (
+                pixel_format, output_format, result.GetWidth(), result.GetHeight(), variant, count,
+                best * 1e6, records[-1]["megapixelsPerSecond"]))
+    return records
+
+
+def numpy_regions(full, regions, scale):
+    arrays = []
+    for x, y, w, h in regions:
+        h, w = h // scale, w // scale
+        crop = full[y:y + h * scale, x:x + w * scale].astype(np.uint32)
+        if scale > 1:
+            crop = (crop.reshape(h, scale, w, scale, -1).sum(axis=(1, 3)) + scale * scale // 2) // (scale * scale)
+        arrays.append(crop.astype(full.dtype))
+    return arrays
+
+
+def bench_regions(result, pixel_format, output_format, args):
+    converter = pylon.ImageFormatConverter()
+    converter.OutputPixelFormat = getattr(pylon, "PixelType_" + output_format)
+    width, height = result.GetWidth(), result.GetHeight()
+    rw, rh = width // 4, height // 4
+    workloads = (
+        ("thumbnail", [(0, 0, width, height)], args.scale),
+        ("rois", [(rw * i, rh * i, rw, rh) for i in range(4)], 1),
+    )
+    records = []
+    for name, regions, scale in workloads:
+        full = converter.Convert(result).GetArray()
+        expected = numpy_regions(full, regions, scale)
+        out = converter.ConvertRegions(result, regions, scale=scale, numThreads=1)
+        for a, b in zip(out, expected):
+            if not np.array_equal(a.reshape(b.shape), b):
+                raise RuntimeError("ConvertRegions differs from numpy for %s" % name)
+
+        def run_numpy():
+            for _ in range(args.frames):
+                numpy_regions(converter.Convert(result).GetArray(), regions, scale)
+
+        def run_fused():
+            for _ in range(args.frames):
+                converter.ConvertRegions(result, regions, scale=scale, out=out, numThreads=1)
+
+        for variant, func in (("numpy", run_numpy), ("fused", run_fused)):
+            best = measure(func, args.repeat) / args.frames
+            records.append({
+                "pixelFormat": pixel_format,
+                "outputPixelFormat": output_format,
+                "width": width,
+                "height": height,
+                "workload": name,
+                "variant": variant,
+                "scale": scale,
+                "bestUs": best * 1e6,
+            })
+            print("%-9s -> %-10s %4dx%-4d %-9s %-5s %10.1f us/frame" % (
+                pixel_format, output_format, width, height, name, variant, best * 1e6))
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--width", type=int, default=4096)
+    parser.add_argument("--height", type=int, default=3072)
+    parser.add_argument("--formats", default="BayerRG8,Mono8")
+    parser.add_argument("--output-format", default="BGR8packed")
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--batch", type=int, default=0, help="also compare ConvertBatch() for N frames")
+    parser.add_argument("--regions", action="store_true", help="also compare ConvertRegions() with numpy")
+    parser.add_argument("--scale", type=int, default=4, help="downscale factor of the thumbnail for --regions")
+    parser.add_argument("--output", default="conversion_benchmark.json")
+    args = parser.parse_args()
+
+    results = []
+    camera = create_camera()
+    try:
+        for pixel_format in args.formats.split(","):
+            if pixel_format not in camera.PixelFormat.Symbolics:
+                print("%s not supported by the camera, skipped" % pixel_format)
+                continue
+            with grab_one(camera, args.width, args.height, pixel_format) as result:
+                results.extend(bench(result, pixel_format, args.output_format, args))
+                if args.regions:
+                    results.extend(bench_regions(result, pixel_format, args.output_format, args))
+                if args.batch:
+                    results.extend(bench_batch(result, pixel_format, args.output_format, args))
+    finally:
+        camera.Close()
+
+    report = {
+        "environment": {
+            "pypylon": pypylon.__version__,
+            "pylon": pylon.GetPylonVersionString(),
+            "python": sys.version,
+            "cpuCount": os.cpu_count(),
+            "platform": platform.platform(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        },
+        "settings": {"frames": args.frames, "repeat": args.repeat, "batch": args.batch, "scale": args.scale},
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print("results written to %s" % args.output)
+
+
+if __name__ == "__main__":
+    main()
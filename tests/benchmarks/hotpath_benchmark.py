@@ -0,0 +1,342 @@
+"""
+Benchmark suite for the per frame hot paths, running on the camera emulator.
+
+  retrieve     -- RetrieveResult() loop, including the emulator generating frames
+  getarray     -- GrabResult.GetArray(), copying the buffer into a new array
+  zerocopy     -- GrabResult.GetArrayZeroCopy(), no copy
+  unpack       -- PylonImage.GetArray() of Mono12p frames, with and without out=
+  convert      -- ImageFormatConverter.Convert() to BGR8packed and Mono8
+  decompress   -- ImageDecompressor.DecompressImage(), if the camera supports
+                  image compression, otherwise reported as skipped
+  dispatch     -- grab loop thread calling an ImageEventHandler and a
+                  BatchingImageEventHandler
+
+Every benchmark runs for every resolution and pixel format given. The best of
+--repeat runs is reported. The results are printed and written as JSON, which
+can be passed to --compare in a later run to detect regressions.
+
+Usage: python hotpath_benchmark.py [--resolutions 640x480,1920x1080]
+           [--formats Mono8,Mono12,BayerRG8,RGB8Packed] [--frames N] [--repeat R]
+           [--only NAME,...] [--output results.json]
+           [--compare baseline.json] [--threshold 0.15]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+
+os.environ.setdefault("PYLON_CAMEMU", "1")
+
+import numpy as np
+import pypylon
+from pypylon import genicam, pylon
+
+from unpack_benchmark import pack_mono12p
+
+
+BENCHMARKS = ("retrieve", "getarray", "zerocopy", "unpack", "convert", "decompress", "dispatch")
+
+
+def create_camera():
+    di = pylon.DeviceInfo()
+    di.SetDeviceClass("BaslerCamEmu")
+    camera = pylon.InstantCamera(pylon.TlFactory.GetInstance().CreateFirstDevice(di))
+    camera.Open()
+    if genicam.IsAvailable(camera.GetNodeMap().GetNode("AcquisitionFrameRateEnable")):
+        camera.AcquisitionFrameRateEnable.Value = False
+    return camera
+
+
+def configure(camera, width, height, pixel_format):
+    # Returns False if the camera doesn't support the configuration.
+    if pixel_format not in camera.PixelFormat.Symbolics:
+        return False
+    if width > camera.Width.Max or height > camera.Height.Max:
+        return False
+    camera.PixelFormat.Value = pixel_format
+    camera.Width.Value = width
+    camera.Height.Value = height
+    return True
+
+
+def grab_one(camera):
+    camera.StartGrabbingMax(1)
+    result = camera.RetrieveResult(5000)
+    camera.StopGrabbing()
+    if not result.GrabSucceeded():
+        raise RuntimeError("grab failed: %s" % result.GetErrorDescription())
+    return result
+
+
+def measure(func, frames, repeat):
+    # Returns the seconds per frame of every run.
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append((time.perf_counter() - start) / frames)
+    return runs
+
+
+def record(name, variant, width, height, pixel_format, frames, runs):
+    best = min(runs)
+    return {
+        "name": name,
+        "variant": variant,
+        "width": width,
+        "height": height,
+        "pixelFormat": pixel_format,
+        "frames": frames,
+        "bestUs": best * 1e6,
+        "medianUs": statistics.median(runs) * 1e6,
+        "framesPerSecond": 1.0 / best,
+        "megapixelsPerSecond": width * height / best / 1e6,
+    }
+
+
+def skipped(name, width, height, pixel_format, reason):
+    return {
+        "name": name,
+        "width": width,
+        "height": height,
+        "pixelFormat": pixel_format,
+        "skipped": reason,
+    }
+
+
+def bench_retrieve(camera, args, width, height, pixel_format):
+    def run():
+        camera.StartGrabbingMax(args.frames, pylon.GrabStrategy_OneByOne)
+        while camera.IsGrabbing():
+            with camera.RetrieveResult(5000, pylon.TimeoutHandling_Return) as result:
+                pass
+
+    runs = measure(run, args.frames, args.repeat)
+    return [record("retrieve", "oneByOne", width, height, pixel_format, args.frames, runs)]
+
+
+def bench_getarray(camera, args, width, height, pixel_format):
+    with grab_one(camera) as result:
+        def run():
+            for _ in range(args.frames):
+                result.GetArray()
+
+        runs = measure(run, args.frames, args.repeat)
+    return [record("getarray", "copy", width, height, pixel_format, args.frames, runs)]
+
+
+def bench_zerocopy(camera, args, width, height, pixel_format):
+    with grab_one(camera) as result:
+        def run():
+            for _ in range(args.frames):
+                with result.GetArrayZeroCopy():
+                    pass
+
+        runs = measure(run, args.frames, args.repeat)
+    return [record("zerocopy", "zerocopy", width, height, pixel_format, args.frames, runs)]
+
+
+def bench_unpack(camera, args, width, height, pixel_format):
+    # Mono12p is built from a Mono12 frame, the emulator doesn't grab packed
+    # formats.
+    if pixel_format != "Mono12":
+        return []
+    with grab_one(camera) as result:
+        packed = pack_mono12p(result.GetArray() & 0x0FFF)
+    image = pylon.PylonImage()
+    image.AttachMemoryView(packed.data, pylon.PixelType_Mono12p, width, height, 0)
+    out = np.empty((height, width), dtype=np.uint16)
+
+    def run_new():
+        for _ in range(args.frames):
+            image.GetArray()
+
+    def run_out():
+        for _ in range(args.frames):
+            image.GetArray(out=out)
+
+    return [
+        record("unpack", "getarray", width, height, "Mono12p", args.frames, measure(run_new, args.frames, args.repeat)),
+        record("unpack", "getarray_out", width, height, "Mono12p", args.frames, measure(run_out, args.frames, args.repeat)),
+    ]
+
+
+def bench_convert(camera, args, width, height, pixel_format):
+    records = []
+    with grab_one(camera) as result:
+        for output in ("BGR8packed", "Mono8"):
+            converter = pylon.ImageFormatConverter()
+            converter.OutputPixelFormat = getattr(pylon, "PixelType_" + output)
+
+            def run():
+                for _ in range(args.frames):
+                    converter.Convert(result)
+
+            runs = measure(run, args.frames, args.repeat)
+            records.append(record("convert", "to" + output, width, height, pixel_format, args.frames, runs))
+    return records
+
+
+def bench_decompress(camera, args, width, height, pixel_format):
+    if not genicam.IsWritable(camera.GetNodeMap().GetNode("ImageCompressionMode")):
+        return [skipped("decompress", width, height, pixel_format, "camera has no ImageCompressionMode")]
+    camera.ImageCompressionMode.Value = "BaslerCompressionBeyond"
+    try:
+        decompressor = pylon.ImageDecompressor(camera.GetNodeMap())
+        with grab_one(camera) as result:
+            def run():
+                for _ in range(args.frames):
+                    decompressor.DecompressImage(result)
+
+            runs = measure(run, args.frames, args.repeat)
+    finally:
+        camera.ImageCompressionMode.Value = "Off"
+    return [record("decompress", "beyond", width, height, pixel_format, args.frames, runs)]
+
+
+class CountingHandler(pylon.ImageEventHandler):
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        self.done = threading.Event()
+        self.expected = 0
+
+    def OnImageGrabbed(self, camera, grabResult):
+        self.count += 1
+        if self.count >= self.expected:
+            self.done.set()
+
+
+class CountingBatchHandler(pylon.BatchingImageEventHandler):
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        self.done = threading.Event()
+        self.expected = 0
+
+    def OnImagesGrabbed(self, camera, grabResults):
+        self.count += len(grabResults)
+        for grabResult in grabResults:
+            grabResult.Release()
+        if self.count >= self.expected:
+            self.done.set()
+
+
+def bench_dispatch(camera, args, width, height, pixel_format):
+    records = []
+    for variant, handler in (("imageEventHandler", CountingHandler()), ("batching", CountingBatchHandler())):
+        camera.RegisterImageEventHandler(handler, pylon.RegistrationMode_ReplaceAll, pylon.Cleanup_None)
+        try:
+            def run():
+                handler.count = 0
+                handler.expected = args.frames
+                handler.done.clear()
+                camera.StartGrabbingMax(args.frames, pylon.GrabStrategy_OneByOne, pylon.GrabLoop_ProvidedByInstantCamera)
+                if not handler.done.wait(60):
+                    raise RuntimeError("%s: only %d of %d frames dispatched" % (variant, handler.count, args.frames))
+                camera.StopGrabbing()
+
+            runs = measure(run, args.frames, args.repeat)
+        finally:
+            camera.DeregisterImageEventHandler(handler)
+        records.append(record("dispatch", variant, width, height, pixel_format, args.frames, runs))
+    return records
+
+
+def run_all(args):
+    results = []
+    camera = create_camera()
+    try:
+        for resolution in args.resolutions.split(","):
+            width, height = (int(v) for v in resolution.lower().split("x"))
+            for pixel_format in args.formats.split(","):
+                if not configure(camera, width, height, pixel_format):
+                    for name in args.only:
+                        results.append(skipped(name, width, height, pixel_format, "not supported by the camera"))
+                    continue
+                for name in args.only:
+                    bench = globals()["bench_" + name]
+                    records = bench(camera, args, width, height, pixel_format)
+                    for r in records:
+                        print_record(r)
+                    results.extend(records)
+    finally:
+        camera.Close()
+    return results
+
+
+def print_record(r):
+    label = "%-10s %-18s %4dx%-4d %-11s" % (
+        r["name"], r.get("variant", ""), r["width"], r["height"], r["pixelFormat"])
+    if "skipped" in r:
+        print("%s skipped: %s" % (label, r["skipped"]))
+    else:
+        print("%s %10.1f us/frame %9.1f fps %8.1f MP/s" % (
+            label, r["bestUs"], r["framesPerSecond"], r["megapixelsPerSecond"]))
+
+
+def key(r):
+    return (r["name"], r.get("variant"), r["width"], r["height"], r["pixelFormat"])
+
+
+def compare(results, baseline_path, threshold):
+    # Returns the number of results slower than the baseline by more than
+    # 'threshold'.
+    with open(baseline_path) as f:
+        baseline = {key(r): r for r in json.load(f)["results"] if "skipped" not in r}
+    regressions = 0
+    for r in results:
+        base = baseline.get(key(r))
+        if base is None or "skipped" in r:
+            continue
+        change = r["bestUs"] / base["bestUs"] - 1.0
+        if change > threshold:
+            regressions += 1
+            print("REGRESSION %-10s %-18s %4dx%-4d %-11s %+.1f%%" % (key(r) + (change * 100,)))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resolutions", default="640x480,1920x1080")
+    parser.add_argument("--formats", default="Mono8,Mono12,BayerRG8,RGB8Packed")
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", default=",".join(BENCHMARKS))
+    parser.add_argument("--output", default="hotpath_benchmark.json")
+    parser.add_argument("--compare", help="JSON file of an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown against --compare")
+    args = parser.parse_args()
+    args.only = [name for name in args.only.split(",") if name]
+    unknown = set(args.only) - set(BENCHMARKS)
+    if unknown:
+        parser.error("unknown benchmarks: %s" % ", ".join(sorted(unknown)))
+
+    results = run_all(args)
+    report = {
+        "environment": {
+            "pypylon": pypylon.__version__,
+            "pylon": pylon.GetPylonVersionString(),
+            "python": sys.version,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        },
+        "settings": {"frames": args.frames, "repeat": args.repeat},
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print("results written to %s" % args.output)
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
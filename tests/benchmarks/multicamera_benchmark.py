@@ -0,0 +1,165 @@
+"""
+Scaling of grabbing with one Python thread per emulated camera.
+
+Every thread grabs from its own camera. Per frame it copies the image with
+GetArray(), reads chunk like attributes of the grab result and runs --work
+iterations of pure Python code, standing in for per frame processing. The run
+is repeated for 1, 2, 4, ... threads up to --cameras.
+
+The Python parts of the threads serialize on the GIL, also on a free-threaded
+build (e.g. python3.13t), where importing pypylon enables the GIL. The
+'cores' column is the CPU time of the process divided by the wall time, i.e.
+the number of cores kept busy.
+
+Usage: python multicamera_benchmark.py [--cameras N] [--frames N] [--work N]
+           [--width W] [--height H] [--output results.json]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import threading
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cameras", type=int, default=min(os.cpu_count() or 1, 16))
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--work", type=int, default=20000)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--output", default="multicamera_benchmark.json")
+    return parser.parse_args()
+
+
+# The number of emulated cameras must be set before pypylon is imported.
+args = parse_args()
+os.environ["PYLON_CAMEMU"] = str(args.cameras)
+
+import pypylon
+from pypylon import genicam, pylon
+
+
+def create_cameras(count, width, height):
+    di = pylon.DeviceInfo()
+    di.SetDeviceClass("BaslerCamEmu")
+    tlf = pylon.TlFactory.GetInstance()
+    cameras = []
+    for device in tlf.EnumerateDevices([di])[:count]:
+        camera = pylon.InstantCamera(tlf.CreateDevice(device))
+        camera.Open()
+        camera.PixelFormat.Value = "Mono8"
+        camera.Width.Value = width
+        camera.Height.Value = height
+        if genicam.IsAvailable(camera.GetNodeMap().GetNode("AcquisitionFrameRateEnable")):
+            camera.AcquisitionFrameRateEnable.Value = False
+        cameras.append(camera)
+    return cameras
+
+
+def python_work(iterations):
+    total = 0
+    for i in range(iterations):
+        total += i * i % 7
+    return total
+
+
+def grab(camera, frames, work, errors):
+    try:
+        camera.StartGrabbingMax(frames, pylon.GrabStrategy_OneByOne)
+        while camera.IsGrabbing():
+            with camera.RetrieveResult(5000) as result:
+                if not result.GrabSucceeded():
+                    errors.append(result.GetErrorDescription())
+                    continue
+                result.GetArray()
+                result.ImageNumber
+                result.TimeStamp
+                python_work(work)
+    except Exception as e:
+        errors.append(e)
+
+
+def run(cameras, args):
+    errors = []
+    threads = [threading.Thread(target=grab, args=(c, args.frames, args.work, errors)) for c in cameras]
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    if errors:
+        raise RuntimeError("grabbing failed: %r" % errors[0])
+    return wall, cpu
+
+
+def thread_counts(maximum):
+    counts = []
+    n = 1
+    while n < maximum:
+        counts.append(n)
+        n *= 2
+    counts.append(maximum)
+    return counts
+
+
+def main():
+    gil_enabled = sys._is_gil_enabled() if hasattr(sys, "_is_gil_enabled") else True
+    cameras = create_cameras(args.cameras, args.width, args.height)
+    if len(cameras) < args.cameras:
+        raise RuntimeError("only %d emulated cameras found" % len(cameras))
+    print("%d emulated cameras, %dx%d Mono8, GIL %s" % (
+        len(cameras), args.width, args.height, "enabled" if gil_enabled else "disabled"))
+    results = []
+    try:
+        base = None
+        for count in thread_counts(len(cameras)):
+            wall, cpu = run(cameras[:count], args)
+            fps = count * args.frames / wall
+            if base is None:
+                base = fps
+            results.append({
+                "threads": count,
+                "seconds": wall,
+                "framesPerSecond": fps,
+                "speedup": fps / base,
+                "efficiency": fps / base / count,
+                "cores": cpu / wall,
+            })
+            print("%3d threads %9.1f fps  speedup %5.2f  efficiency %4.0f%%  cores %5.2f" % (
+                count, fps, fps / base, 100 * fps / base / count, cpu / wall))
+    finally:
+        for camera in cameras:
+            camera.Close()
+
+    report = {
+        "environment": {
+            "pypylon": pypylon.__version__,
+            "pylon": pylon.GetPylonVersionString(),
+            "python": sys.version,
+            "gilEnabled": gil_enabled,
+            "cpuCount": os.cpu_count(),
+            "platform": platform.platform(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        },
+        "settings": {
+            "frames": args.frames,
+            "work": args.work,
+            "width": args.width,
+            "height": args.height,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print("results written to %s" % args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Throughput of handing emulated camera frames to a multiprocessing pool.
+
+  pickle  -- every frame is copied by GetArray() and pickled to a worker
+  shared  -- frames are grabbed into a SharedMemoryBufferFactory, workers get a
+             SharedFrameDescriptor and release the frame via the release queue
+
+Each worker computes the mean of the frame.
+
+Usage: python sharedmemory_benchmark.py [--frames N] [--workers W] [--width W] [--height H]
+"""
+import argparse
+import multiprocessing
+import os
+import time
+
+os.environ.setdefault("PYLON_CAMEMU", "1")
+
+import numpy as np
+from pypylon import pylon
+
+
+_release_queue = None
+
+
+def init_worker(release_queue):
+    global _release_queue
+    _release_queue = release_queue
+
+
+def process_array(image):
+    return float(image.mean())
+
+
+def process_shared(descriptor):
+    frame = pylon.OpenSharedFrame(descriptor)
+    value = float(frame.mean())
+    del frame
+    pylon.ReleaseSharedFrame(descriptor, _release_queue)
+    return value
+
+
+def create_camera(args):
+    di = pylon.DeviceInfo()
+    di.SetDeviceClass("BaslerCamEmu")
+    camera = pylon.InstantCamera(pylon.TlFactory.GetInstance().CreateFirstDevice(di))
+    camera.Open()
+    camera.PixelFormat.Value = "Mono8"
+    camera.Width.Value = args.width
+    camera.Height.Value = args.height
+    camera.MaxNumBuffer.Value = args.buffers
+    return camera
+
+
+def run_pickle(args, pool):
+    camera = create_camera(args)
+    try:
+        start = time.perf_counter()
+        pending = []
+        camera.StartGrabbingMax(args.frames)
+        while camera.IsGrabbing():
+            with camera.RetrieveResult(5000) as result:
+                if result.GrabSucceeded():
+                    pending.append(pool.apply_async(process_array, (result.GetArray(),)))
+        for p in pending:
+            p.get()
+        return time.perf_counter() - start
+    finally:
+        camera.Close()
+
+
+def run_shared(args, pool, factory):
+    camera = create_camera(args)
+    # The factory stays owned by Python and is reused by later runs.
+    camera.SetBufferFactory(factory)
+    try:
+        start = time.perf_counter()
+        pending = []
+        camera.StartGrabbingMax(args.frames)
+        while camera.IsGrabbing():
+            # Return released buffers before waiting for the next frame.
+            factory.ProcessReleases(timeout=0)
+            if camera.NumReadyBuffers.Value == 0 and factory.GetNumShared() >= args.buffers:
+                factory.ProcessReleases(timeout=1.0)
+                continue
+            with camera.RetrieveResult(5000) as result:
+                if result.GrabSucceeded():
+                    pending.append(pool.apply_async(process_shared, (factory.Share(result),)))
+        for p in pending:
+            p.get()
+        while factory.GetNumShared():
+            factory.ProcessReleases(timeout=1.0)
+        return time.perf_counter() - start
+    finally:
+        camera.Close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--buffers", type=int, default=16)
+    parser.add_argument("--width", type=int, default=1024)
+    parser.add_argument("--height", type=int, default=1024)
+    args = parser.parse_args()
+
+    frame_size = args.width * args.height
+    factory = pylon.SharedMemoryBufferFactory(args.buffers * (frame_size + 4096))
+    try:
+        with multiprocessing.Pool(args.workers, init_worker, (factory.releaseQueue,)) as pool:
+            results = {
+                "pickle": run_pickle(args, pool),
+                "shared": run_shared(args, pool, factory),
+            }
+    finally:
+        factory.Close()
+
+    print("%d frames of %dx%d Mono8, %d workers" % (args.frames, args.width, args.height, args.workers))
+    for name, seconds in results.items():
+        print("%-7s %8.1f frames/s  %7.1f MB/s" % (name, args.frames / seconds, args.frames * frame_size / seconds / 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark for unpacking Mono12p frames to 16 bit numpy arrays.
+
+Emulated Mono12 frames are grabbed, packed to Mono12p and attached to a
+PylonImage. The following paths are compared:
+
+  converter  -- a new ImageFormatConverter per frame, Convert() and GetArray()
+                (the behavior of GetArray() for packed formats in older releases)
+  getarray   -- PylonImage.GetArray(), allocating a new array per frame
+  getarray_out -- PylonImage.GetArray(out=...), reusing one caller owned array
+
+Usage: python unpack_benchmark.py [--frames N] [--repeat R]
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("PYLON_CAMEMU", "1")
+
+import numpy as np
+from pypylon import pylon
+
+
+def pack_mono12p(values):
+    v = values.astype(np.uint16).reshape(values.shape[0], -1, 2)
+    a, b = v[..., 0], v[..., 1]
+    packed = np.stack((a & 0xFF, (a >> 8) | ((b & 0x0F) << 4), b >> 4), axis=-1)
+    return np.ascontiguousarray(packed.astype(np.uint8).reshape(values.shape[0], -1))
+
+
+def grab_mono12p_frames(count):
+    tlf = pylon.TlFactory.GetInstance()
+    di = pylon.DeviceInfo()
+    di.SetDeviceClass("BaslerCamEmu")
+    camera = pylon.InstantCamera(tlf.CreateFirstDevice(di))
+    camera.Open()
+    try:
+        camera.PixelFormat.Value = "Mono12"
+        camera.Width.Value = camera.Width.Max - camera.Width.Max % 2
+        camera.Height.Value = camera.Height.Max
+        frames = []
+        camera.StartGrabbingMax(count)
+        while camera.IsGrabbing():
+            with camera.RetrieveResult(1000) as res:
+                if res.GrabSucceeded():
+                    frames.append(pack_mono12p(res.GetArray() & 0x0FFF))
+        return frames
+    finally:
+        camera.Close()
+
+
+def attach(frames):
+    images = []
+    for packed in frames:
+        height, row_size = packed.shape
+        img = pylon.PylonImage()
+        img.AttachMemoryView(packed.data, pylon.PixelType_Mono12p, row_size * 2 // 3, height, 0)
+        images.append(img)
+    return images
+
+
+def bench_converter(images):
+    for img in images:
+        converter = pylon.ImageFormatConverter()
+        converter.OutputPixelFormat = pylon.PixelType_Mono16
+        converter.Convert(img).GetArray()
+
+
+def bench_getarray(images):
+    for img in images:
+        img.GetArray()
+
+
+def bench_getarray_out(images):
+    out = np.empty((images[0].GetHeight(), images[0].GetWidth()), dtype=np.uint16)
+    for img in images:
+        img.GetArray(out=out)
+
+
+def run(frames, repeat):
+    images = attach(frames)
+    results = {}
+    for name, func in (
+        ("converter", bench_converter),
+        ("getarray", bench_getarray),
+        ("getarray_out", bench_getarray_out),
+    ):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(images)
+            best = min(best, time.perf_counter() - start)
+        results[name] = best / len(images)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    frames = grab_mono12p_frames(args.frames)
+    height, row_size = frames[0].shape
+    print("%d Mono12p frames of %dx%d" % (len(frames), row_size * 2 // 3, height))
+    results = run(frames, args.repeat)
+    base = results["converter"]
+    for name, seconds in results.items():
+        print("%-14s %9.1f us/frame  %5.2fx" % (name, seconds * 1e6, base / seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from pylonemutestcase import PylonEmuTestCase
 from pypylon import pylon
+from pypylon import genicam
 import numpy
 import unittest
 
@@ -46,6 +47,378 @@ class GrabTestSuite(PylonEmuTestCase):
         self.assertEqual(countOfImagesToGrab, imageCounter)
         camera.Close()
 
+    def test_retrieve_results(self):
+        camera = self.create_first()
+        camera.Open()
+        camera.Width.Value = 1024
+        camera.Height.Value = 1040
+        camera.PixelFormat.Value = "Mono8"
+        camera.StartGrabbingMax(8)
+        out = numpy.zeros((4, 1040, 1024), dtype=numpy.uint8)
+        images_grabbed = 0
+        image_numbers = []
+        while camera.IsGrabbing():
+            images, metadata = camera.RetrieveResults(4, 5000, out=out)
+            self.assertEqual(len(images), len(metadata))
+            self.assertLessEqual(len(images), 4)
+            self.assertTrue(numpy.shares_memory(images, out))
+            self.assertTrue(numpy.all(metadata["grabSucceeded"]))
+            self.assertTrue(numpy.all(metadata["width"] == 1024))
+            self.assertTrue(numpy.all(metadata["pixelType"] == pylon.PixelType_Mono8))
+            for image in images:
+                actual = list(image[0:20, 0])
+                expected = [actual[0] + i for i in range(20)]
+                self.assertEqual(actual, expected)
+            images_grabbed += len(images)
+            image_numbers.extend(metadata["imageNumber"])
+        self.assertEqual(8, images_grabbed)
+        self.assertEqual(image_numbers, sorted(image_numbers))
+
+        # without a preallocated array
+        camera.StartGrabbingMax(3)
+        images, metadata = camera.RetrieveResults(3, 5000)
+        self.assertEqual(images.shape, (3, 1040, 1024))
+        self.assertEqual(metadata.dtype, pylon.GrabResultMetadataDtype)
+        camera.StopGrabbing()
+        camera.Close()
+
+    def test_buffer_factory(self):
+        camera = self.create_first()
+        camera.Open()
+        camera.Width.Value = 1024
+        camera.Height.Value = 1040
+        camera.PixelFormat.Value = "Mono8"
+        camera.MaxNumBuffer.Value = 4
+        payload_size = camera.PayloadSize.Value
+        memory = numpy.zeros(4 * (payload_size + 64), dtype=numpy.uint8)
+        factory = pylon.ArrayBufferFactory(memory)
+        camera.SetBufferFactory(factory)
+
+        camera.StartGrabbingMax(6)
+        self.assertEqual(factory.GetNumBuffers(), 4)
+        offsets = set()
+        while camera.IsGrabbing():
+            with camera.RetrieveResult(5000) as result:
+                self.assertTrue(result.GrabSucceeded())
+                image = numpy.asarray(result)
+                self.assertTrue(numpy.shares_memory(image, memory))
+                offset = factory.GetOffset(result)
+                self.assertEqual(offset % 64, 0)
+                self.assertTrue(numpy.array_equal(memory[offset:offset + payload_size], result.GetArray(raw=True)))
+                offsets.add(offset)
+                del image
+        self.assertLessEqual(len(offsets), 4)
+        camera.Close()
+        # the factory stays usable after the camera is gone
+        del camera
+        self.assertEqual(factory.GetNumBuffers(), 0)
+
+    def test_buffer_factory_too_small(self):
+        camera = self.create_first()
+        camera.Open()
+        camera.MaxNumBuffer.Value = 4
+        memory = bytearray(camera.PayloadSize.Value)
+        factory = pylon.ArrayBufferFactory(memory)
+        camera.SetBufferFactory(factory)
+        # owned by Python, the camera keeps the memory after the object is gone
+        self.assertTrue(factory.thisown)
+        del factory
+        self.assertRaises(genicam.GenericException, camera.StartGrabbingMax, 4)
+        camera.Close()
+        with self.assertRaises(TypeError):
+            camera.SetBufferFactory(memory)
+
+    def test_shared_memory_buffer_factory(self):
+        camera = self.create_first()
+        camera.Open()
+        camera.Width.Value = 1024
+        camera.Height.Value = 1040
+        camera.PixelFormat.Value = "Mono8"
+        camera.MaxNumBuffer.Value = 4
+        factory = pylon.SharedMemoryBufferFactory(4 * (camera.PayloadSize.Value + 4096))
+        camera.SetBufferFactory(factory)
+
+        camera.StartGrabbingMax(3)
+        descriptors = []
+        expected = []
+        while camera.IsGrabbing():
+            with camera.RetrieveResult(5000) as result:
+                self.assertTrue(result.GrabSucceeded())
+                descriptors.append(factory.Share(result, count=2))
+                expected.append(result.GetArray())
+        self.assertEqual(factory.GetNumShared(), 3)
+
+        for descriptor, image in zip(descriptors, expected):
+            self.assertEqual(descriptor.name, factory.sharedMemory.name)
+            frame = pylon.OpenSharedFrame(descriptor)
+            self.assertTrue(numpy.array_equal(frame, image))
+            del frame
+            # every frame was shared twice, the first release keeps the buffer
+            self.assertFalse(factory.Release(descriptor.bufferId))
+            pylon.ReleaseSharedFrame(descriptor, factory.releaseQueue)
+        self.assertEqual(factory.GetNumShared(), 3)
+
+        returned = 0
+        for i in range(10):
+            returned += factory.ProcessReleases(timeout=1.0)
+            if returned == 3:
+                break
+        self.assertEqual(returned, 3)
+        self.assertEqual(factory.GetNumShared(), 0)
+
+        camera.Close()
+        factory.Close()
+
+    def test_retrieve_result_async(self):
+        import asyncio
+        camera = self.create_first()
+        camera.Open()
+        camera.PixelFormat.Value = "Mono8"
+
+        async def grab():
+            images = 0
+            async for result in camera.Results(5000):
+                self.assertTrue(result.GrabSucceeded())
+                images += 1
+                result.Release()
+            return images
+
+        camera.StartGrabbingMax(5)
+        self.assertEqual(asyncio.run(grab()), 5)
+
+        async def cancel_then_retrieve():
+            # a cancelled wait doesn't consume a result
+            task = asyncio.ensure_future(camera.RetrieveResultAsync(5000))
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            result = await camera.RetrieveResultAsync(5000)
+            self.assertTrue(result.GrabSucceeded())
+            result.Release()
+
+        camera.StartGrabbingMax(1)
+        asyncio.run(cancel_then_retrieve())
+        camera.StopGrabbing()
+
+        async def stop_while_waiting():
+            # without a timeout the iteration ends when grabbing stops
+            asyncio.get_running_loop().call_later(0.2, camera.StopGrabbing)
+            return [result async for result in camera.Results()]
+
+        camera.TriggerSelector.Value = "FrameStart"
+        camera.TriggerMode.Value = "On"
+        camera.TriggerSource.Value = "Software"
+        camera.StartGrabbing()
+        self.assertEqual(asyncio.run(asyncio.wait_for(stop_while_waiting(), 5)), [])
+        camera.TriggerMode.Value = "Off"
+        camera.Close()
+
+    def test_batching_image_event_handler(self):
+        import threading
+        countOfImagesToGrab = 20
+
+        class BatchHandler(pylon.BatchingImageEventHandler):
+            def __init__(self):
+                super().__init__(4, 100000)
+                self.batch_sizes = []
+                self.image_numbers = []
+                self.done = threading.Event()
+
+            def OnImagesGrabbed(self, camera, grabResults):
+                self.batch_sizes.append(len(grabResults))
+                for grabResult in grabResults:
+                    if grabResult.GrabSucceeded():
+                        self.image_numbers.append(grabResult.ImageNumber)
+                    grabResult.Release()
+                if sum(self.batch_sizes) >= countOfImagesToGrab:
+                    self.done.set()
+
+        handler = BatchHandler()
+        self.assertEqual(handler.GetMaxBatchSize(), 4)
+        self.assertEqual(handler.GetMaxDelayUs(), 100000)
+        camera = self.create_first()
+        camera.Open()
+        camera.PixelFormat.Value = "Mono8"
+        camera.RegisterImageEventHandler(handler, pylon.RegistrationMode_Append, pylon.Cleanup_None)
+        camera.StartGrabbingMax(countOfImagesToGrab, pylon.GrabStrategy_OneByOne, pylon.GrabLoop_ProvidedByInstantCamera)
+        self.assertTrue(handler.done.wait(10))
+        camera.StopGrabbing()
+        camera.DeregisterImageEventHandler(handler)
+        camera.Close()
+
+        self.assertEqual(sum(handler.batch_sizes), countOfImagesToGrab)
+        self.assertLessEqual(max(handler.batch_sizes), 4)
+        self.assertEqual(handler.image_numbers, sorted(handler.image_numbers))
+        self.assertEqual(handler.GetNumPending(), 0)
+        stats = handler.GetStatistics()
+        self.assertEqual(stats.numBatches, len(handler.batch_sizes))
+        self.assertEqual(stats.numFrames, countOfImagesToGrab)
+        self.assertEqual(stats.maxBatchSize, max(handler.batch_sizes))
+        self.assertEqual(stats.numErrors, 0)
+        self.assertGreaterEqual(stats.maxLatencyUs, stats.meanLatencyUs)
+        handler.ResetStatistics()
+        self.assertEqual(handler.GetStatistics().numFrames, 0)
+
+    def test_frame_filter(self):
+        import time
+        camera = self.create_first()
+        camera.Open()
+        camera.PixelFormat.Value = "Mono8"
+
+        frameFilter = pylon.FrameFilter(3)
+        self.assertEqual(frameFilter.Decimation, 3)
+        self.assertEqual(frameFilter.MaxRateHz, 0.0)
+        self.assertEqual(frameFilter.KeepNewest, 0)
+        camera.SetFrameFilter(frameFilter)
+        self.assertIs(camera.GetFrameFilter(), frameFilter)
+        with self.assertRaises(TypeError):
+            camera.SetFrameFilter(3)
+        camera.StartGrabbingMax(12)
+        images, metadata = camera.RetrieveResults(12, 5000)
+        self.assertTrue(all(metadata["grabSucceeded"]))
+        image_numbers = [int(n) for n in metadata["imageNumber"]]
+        self.assertEqual(len(image_numbers), 4)
+        self.assertEqual([n - image_numbers[0] for n in image_numbers], [0, 3, 6, 9])
+        stats = frameFilter.GetStatistics()
+        self.assertEqual(stats.numReceived, 12)
+        self.assertEqual(stats.numDelivered, 4)
+        self.assertEqual(stats.numDroppedDecimation, 8)
+
+        # only the newest frame of the ones waiting is delivered
+        frameFilter = pylon.FrameFilter(keepNewest=1)
+        camera.SetFrameFilter(frameFilter)
+        camera.MaxNumBuffer.Value = 10
+        camera.StartGrabbing()
+        time.sleep(0.5)
+        result = camera.RetrieveResult(5000)
+        self.assertTrue(result.GrabSucceeded())
+        result.Release()
+        camera.StopGrabbing()
+        stats = frameFilter.GetStatistics()
+        self.assertGreater(stats.numDroppedNewest, 0)
+        self.assertEqual(stats.numDelivered, 1)
+        self.assertEqual(stats.numReceived, stats.numDelivered + stats.numDroppedNewest + frameFilter.GetNumHeld())
+
+        with self.assertRaises(genicam.InvalidArgumentException):
+            pylon.FrameFilter(0)
+        camera.SetFrameFilter(None)
+        self.assertEqual(frameFilter.GetNumHeld(), 0)
+        self.assertIsNone(camera.GetFrameFilter())
+        camera.Close()
+
+    def test_frame_filter_attached_to_camera(self):
+        import asyncio
+        cameraArray = pylon.InstantCameraArray(1)
+        cameraArray[0].Attach(pylon.TlFactory.GetInstance().CreateFirstDevice(self.device_filter[0]))
+        frameFilter = pylon.FrameFilter(2)
+        cameraArray[0].SetFrameFilter(frameFilter)
+        # seen from a new proxy of the same camera
+        camera = cameraArray[0]
+        self.assertIs(camera.GetFrameFilter(), frameFilter)
+        # replacing the image event handlers keeps the filter
+        camera.RegisterImageEventHandler(pylon.ImageEventHandler(), pylon.RegistrationMode_ReplaceAll, pylon.Cleanup_Delete)
+        self.assertIs(camera.GetFrameFilter(), frameFilter)
+        camera.Open()
+        camera.PixelFormat.Value = "Mono8"
+
+        camera.StartGrabbingMax(4)
+        image_numbers = []
+        for _ in range(2):
+            with camera.RetrieveResult(5000) as result:
+                image_numbers.append(result.ImageNumber)
+        camera.StopGrabbing()
+        self.assertEqual([n - image_numbers[0] for n in image_numbers], [0, 2])
+        frameFilter.Reset()
+        frameFilter.ResetStatistics()
+
+        async def grab():
+            image_numbers = []
+            async for result in camera.Results(5000):
+                image_numbers.append(result.ImageNumber)
+                result.Release()
+            return image_numbers
+
+        camera.StartGrabbingMax(6)
+        image_numbers = asyncio.run(grab())
+        self.assertEqual([n - image_numbers[0] for n in image_numbers], [0, 2, 4])
+        self.assertEqual(frameFilter.GetStatistics().numDelivered, 3)
+        camera.Close()
+
+    def test_prefetch(self):
+        camera = self.create_first()
+        camera.Open()
+        camera.Width.Value = 1024
+        camera.Height.Value = 1040
+        camera.PixelFormat.Value = "Mono8"
+
+        camera.StartGrabbingMax(6)
+        image_numbers = []
+        with camera.Prefetch(3) as prefetcher:
+            self.assertEqual(prefetcher.GetDepth(), 3)
+            for frame in prefetcher:
+                self.assertTrue(frame.metadata.grabSucceeded)
+                self.assertEqual(frame.array.shape, (1040, 1024))
+                self.assertEqual(frame.array.dtype, numpy.uint8)
+                actual = list(frame.array[0:20, 0])
+                expected = [actual[0] + i for i in range(20)]
+                self.assertEqual(actual, expected)
+                image_numbers.append(frame.metadata.imageNumber)
+        self.assertEqual(len(image_numbers), 6)
+        self.assertEqual(image_numbers, sorted(image_numbers))
+
+        # with conversion
+        camera.StartGrabbingMax(2)
+        frames = list(camera.Prefetch(2, pylon.PixelType_RGB8packed))
+        self.assertEqual(len(frames), 2)
+        for frame in frames:
+            self.assertEqual(frame.array.shape, (1040, 1024, 3))
+            self.assertTrue(numpy.all(frame.array[..., 0] == frame.array[..., 1]))
+
+        # the pixel buffers are reused once the frames are released
+        camera.StartGrabbingMax(12)
+        addresses = set()
+        for frame in camera.Prefetch(2):
+            addresses.add(frame.array.__array_interface__["data"][0])
+        self.assertLessEqual(len(addresses), 4)
+
+        # an open prefetcher stops retrieving when closed
+        camera.StartGrabbing()
+        prefetcher = camera.Prefetch(2)
+        next(prefetcher)
+        prefetcher.Close()
+        self.assertTrue(camera.IsGrabbing())
+        camera.StopGrabbing()
+        camera.Close()
+
+    def test_grab_statistics(self):
+        camera = self.create_first()
+        camera.Open()
+        camera.EnableGrabStatistics()
+        camera.SetFrameFilter(pylon.FrameFilter(2))
+        camera.StartGrabbingMax(10)
+        camera.RetrieveResults(10, 5000)
+        stats = camera.GetGrabStatistics()
+        self.assertEqual(stats.numRetrieved, 10)
+        self.assertEqual(stats.numFailed, 0)
+        self.assertEqual(stats.numRequeued, 5)
+        self.assertEqual(stats.numDelivered, 5)
+        self.assertEqual(len(stats.latencyCounts), len(stats.latencyBoundsUs) + 1)
+        self.assertEqual(sum(stats.latencyCounts), 10)
+        self.assertGreater(stats.maxNumEmptyBuffers, 0)
+        self.assertEqual(stats.AsDict()["numRetrieved"], 10)
+
+        text = stats.ToPrometheus(labels={"camera": "emu"})
+        self.assertIn('pypylon_grab_frames_total{camera="emu",outcome="retrieved"} 10\n', text)
+        self.assertIn('pypylon_grab_delivery_latency_seconds_bucket{camera="emu",le="+Inf"} 10\n', text)
+        self.assertIn('pypylon_grab_delivery_latency_seconds_count{camera="emu"} 10\n', text)
+
+        camera.ResetGrabStatistics()
+        stats = camera.GetGrabStatistics()
+        self.assertEqual(stats.numRetrieved, 0)
+        self.assertEqual(stats.numRequeued, 0)
+        self.assertEqual(sum(stats.latencyCounts), 0)
+        camera.Close()
+
     def test_grab_multiple_cameras(self):
         twoCamsUsed = False
         # Number of images to be grabbed.
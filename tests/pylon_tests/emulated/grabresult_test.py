@@ -94,6 +94,129 @@ class GrabResultTestSuite(PylonEmuTestCase):
         self.assertRaises(genicam.RuntimeException, grabResult.GetImageFormat)
         self.assertRaises(genicam.RuntimeException, grabResult.GetArray)
 
+    def test_getarray_out(self):
+        import numpy as np
+        camera = self.create_first()
+
+        camera.Open()
+        camera.Width.Value = 1024
+        camera.Height.Value = 1040
+        camera.PixelFormat.Value = "Mono8"
+        grabResult = camera.GrabOne(1000)
+        camera.Close()
+
+        out = np.zeros((1040, 1024), dtype=np.uint8)
+        self.assertIs(grabResult.GetArray(out=out), out)
+        self.assertTrue(np.array_equal(out, grabResult.GetArray()))
+
+        # rows of the destination may be strided
+        staging = np.zeros((1040, 1100), dtype=np.uint8)
+        grabResult.GetArray(out=staging[:, :1024])
+        self.assertTrue(np.array_equal(staging[:, :1024], out))
+
+        raw = np.zeros(grabResult.GetPayloadSize(), dtype=np.uint8)
+        grabResult.GetArray(raw=True, out=raw)
+        self.assertTrue(np.array_equal(raw, grabResult.GetArray(raw=True)))
+
+        self.assertRaises(ValueError, grabResult.GetArray, out=np.zeros((1040, 1023), dtype=np.uint8))
+        self.assertRaises(ValueError, grabResult.GetArray, out=np.zeros((1040, 1024), dtype=np.uint16))
+        self.assertRaises(ValueError, grabResult.GetArray, out=np.zeros((1040, 2048), dtype=np.uint8)[:, ::2])
+        grabResult.Release()
+
+    def test_array_export(self):
+        import numpy as np
+        camera = self.create_first()
+
+        camera.Open()
+        camera.Width.Value = 1024
+        camera.Height.Value = 1040
+        camera.PixelFormat.Value = "Mono8"
+        grabResult = camera.GrabOne(1000)
+        camera.Close()
+
+        expected = grabResult.GetArray()
+        ar = np.asarray(grabResult)
+        self.assertEqual(ar.shape, (1040, 1024))
+        self.assertEqual(ar.dtype, np.uint8)
+        self.assertTrue(np.shares_memory(ar, np.asarray(grabResult)))
+        self.assertTrue(np.array_equal(np.asarray(memoryview(ar)), expected))
+
+        # the array keeps the buffer alive after the result has been released
+        grabResult.Release()
+        self.assertFalse(grabResult.IsValid())
+        self.assertTrue(np.array_equal(ar, expected))
+        self.assertRaises(genicam.RuntimeException, np.asarray, grabResult)
+
+    def test_dlpack_export(self):
+        import numpy as np
+        camera = self.create_first()
+
+        camera.Open()
+        camera.Width.Value = 1024
+        camera.Height.Value = 1040
+        camera.PixelFormat.Value = "Mono8"
+        grabResult = camera.GrabOne(1000)
+        camera.Close()
+
+        self.assertEqual(grabResult.__dlpack_device__(), (1, 0))
+        expected = grabResult.GetArray()
+        ar = np.from_dlpack(grabResult)
+        self.assertEqual(ar.shape, (1040, 1024))
+        self.assertTrue(np.shares_memory(ar, np.asarray(grabResult)))
+
+        # the capsule keeps the buffer alive after the result has been released
+        grabResult.Release()
+        self.assertTrue(np.array_equal(ar, expected))
+
+        # capsules that are never consumed release their reference as well
+        camera.Open()
+        grabResult = camera.GrabOne(1000)
+        camera.Close()
+        capsule = grabResult.__dlpack__()
+        del capsule
+        grabResult.Release()
+
+    def test_metadata(self):
+        import numpy as np
+        camera = self.create_first()
+
+        camera.Open()
+        camera.Width.Value = 1024
+        camera.Height.Value = 1040
+        camera.PixelFormat.Value = "Mono8"
+        grabResults = [camera.GrabOne(1000) for i in range(3)]
+        camera.Close()
+
+        grabResult = grabResults[0]
+        metadata = grabResult.GetMetadata()
+        self.assertIsInstance(metadata, pylon.GrabResultMetadata)
+        self.assertEqual(metadata.timeStamp, grabResult.GetTimeStamp())
+        self.assertEqual(metadata.id, grabResult.GetID())
+        self.assertEqual(metadata.imageNumber, grabResult.GetImageNumber())
+        self.assertEqual(metadata.width, 1024)
+        self.assertEqual(metadata.height, 1040)
+        self.assertEqual(metadata.paddingX, grabResult.GetPaddingX())
+        self.assertEqual(metadata.pixelType, pylon.PixelType_Mono8)
+        self.assertEqual(metadata.errorCode, grabResult.GetErrorCode())
+        self.assertTrue(metadata.grabSucceeded)
+        self.assertEqual(metadata.cameraContext, grabResult.GetCameraContext())
+
+        records = np.zeros(4, dtype=pylon.GrabResultMetadataDtype)
+        self.assertIs(grabResult.GetMetadata(out=records, index=2), records)
+        self.assertEqual(tuple(records[2].tolist()), tuple(metadata))
+        self.assertEqual(records[1]["timeStamp"], 0)
+        with self.assertRaises(TypeError):
+            grabResult.GetMetadata(out=[None] * 4)
+
+        filled = pylon.FillGrabResultMetadata(grabResults, records)
+        self.assertEqual(len(filled), 3)
+        for record, result in zip(filled, grabResults):
+            self.assertEqual(tuple(record.tolist()), tuple(result.GetMetadata()))
+
+        for result in grabResults:
+            result.Release()
+        self.assertRaises(genicam.RuntimeException, grabResult.GetMetadata)
+
     def test_zerocopy_access(self):
         camera = self.create_first()
 
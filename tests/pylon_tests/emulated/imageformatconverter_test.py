@@ -0,0 +1,245 @@
+from pylonemutestcase import PylonEmuTestCase
+from pypylon import pylon
+from pypylon import genicam
+import numpy
+import unittest
+
+
+class ImageFormatConverterTestSuite(PylonEmuTestCase):
+    def setUp(self):
+        camera = self.create_first()
+        camera.Open()
+        camera.Width.Value = 640
+        camera.Height.Value = 480
+        camera.PixelFormat.Value = "Mono8"
+        camera.StartGrabbingMax(1)
+        self.result = camera.RetrieveResult(5000)
+        self.assertTrue(self.result.GrabSucceeded())
+        camera.Close()
+        self.converter = pylon.ImageFormatConverter()
+        self.converter.OutputPixelFormat = pylon.PixelType_BGR8packed
+
+    def tearDown(self):
+        self.result.Release()
+
+    def test_convert(self):
+        image = self.converter.Convert(self.result)
+        self.assertEqual(image.GetPixelType(), pylon.PixelType_BGR8packed)
+        expected = image.GetArray()
+        self.assertEqual(expected.shape, (480, 640, 3))
+        mono = self.result.GetArray()
+        for channel in range(3):
+            numpy.testing.assert_array_equal(expected[:, :, channel], mono)
+
+    def test_convert_out_array(self):
+        expected = self.converter.Convert(self.result).GetArray()
+        out = numpy.zeros((480, 640, 3), dtype=numpy.uint8)
+        self.assertIs(self.converter.Convert(self.result, out=out), out)
+        numpy.testing.assert_array_equal(out, expected)
+
+        # from an image
+        out[:] = 0
+        image = pylon.PylonImage()
+        image.AttachGrabResultBuffer(self.result)
+        self.converter.Convert(image, out=out)
+        numpy.testing.assert_array_equal(out, expected)
+
+    def test_convert_out_array_invalid(self):
+        with self.assertRaises(ValueError):
+            self.converter.Convert(self.result, out=numpy.zeros((480, 640), dtype=numpy.uint8))
+        with self.assertRaises(ValueError):
+            self.converter.Convert(self.result, out=numpy.zeros((480, 640, 3), dtype=numpy.uint16))
+        with self.assertRaises(ValueError):
+            self.converter.Convert(self.result, out=numpy.zeros((480, 640, 6), dtype=numpy.uint8)[:, :, ::2])
+        readonly = numpy.zeros((480, 640, 3), dtype=numpy.uint8)
+        readonly.flags.writeable = False
+        with self.assertRaises(ValueError):
+            self.converter.Convert(self.result, out=readonly)
+        with self.assertRaises(TypeError):
+            self.converter.Convert(self.result, out=bytearray(480 * 640 * 3))
+
+    def test_convert_out_image(self):
+        expected = self.converter.Convert(self.result).GetArray()
+        out = pylon.PylonImage()
+        self.assertIs(self.converter.Convert(self.result, out=out), out)
+        numpy.testing.assert_array_equal(out.GetArray(), expected)
+        # the buffer of the image is reused
+        address = out._GetBufferAddress()
+        self.converter.Convert(self.result, out=out)
+        self.assertEqual(out._GetBufferAddress(), address)
+
+    def test_num_threads(self):
+        self.assertEqual(self.converter.NumThreads, 1)
+        self.converter.NumThreads = 0
+        self.assertEqual(self.converter.GetNumThreads(), 0)
+        with self.assertRaises(ValueError):
+            self.converter.SetNumThreads(-1)
+
+    def test_convert_parallel(self):
+        camera = self.create_first()
+        camera.Open()
+        if "BayerRG8" not in camera.PixelFormat.Symbolics:
+            camera.Close()
+            self.skipTest("camera doesn't support BayerRG8")
+        camera.PixelFormat.Value = "BayerRG8"
+        camera.Width.Value = min(1920, camera.Width.Max)
+        camera.Height.Value = min(1080, camera.Height.Max)
+        camera.StartGrabbingMax(1)
+        with camera.RetrieveResult(5000) as result:
+            self.assertTrue(result.GrabSucceeded())
+            camera.Close()
+            expected = self.converter.Convert(result).GetArray()
+            for numThreads in (2, 3, 4, 0):
+                self.converter.NumThreads = numThreads
+                # bit identical to the conversion by one thread
+                numpy.testing.assert_array_equal(self.converter.Convert(result).GetArray(), expected)
+                out = numpy.zeros_like(expected)
+                self.converter.Convert(result, out=out)
+                numpy.testing.assert_array_equal(out, expected)
+                image = pylon.PylonImage()
+                image.AttachGrabResultBuffer(result)
+                image_out = pylon.PylonImage()
+                self.converter.Convert(image, out=image_out)
+                numpy.testing.assert_array_equal(image_out.GetArray(), expected)
+
+    def grab_frames(self, count):
+        camera = self.create_first()
+        camera.Open()
+        camera.Width.Value = 640
+        camera.Height.Value = 480
+        camera.PixelFormat.Value = "Mono8"
+        camera.StartGrabbingMax(count)
+        results = []
+        while camera.IsGrabbing():
+            results.append(camera.RetrieveResult(5000))
+        camera.Close()
+        return results
+
+    def test_convert_batch(self):
+        results = self.grab_frames(8)
+        expected = [self.converter.Convert(r).GetArray() for r in results]
+        for numThreads in (1, 3, 0):
+            out, errors = self.converter.ConvertBatch(results, numThreads=numThreads)
+            self.assertEqual(errors, {})
+            self.assertEqual(out.shape, (8, 480, 640, 3))
+            for i in range(8):
+                numpy.testing.assert_array_equal(out[i], expected[i])
+
+        # into strided frames of a caller owned array
+        stacked = numpy.zeros((16, 480, 640, 3), dtype=numpy.uint8)
+        out, errors = self.converter.ConvertBatch(results, out=stacked[::2])
+        self.assertEqual(errors, {})
+        for i in range(8):
+            numpy.testing.assert_array_equal(stacked[2 * i], expected[i])
+            self.assertFalse(stacked[2 * i + 1].any())
+        for r in results:
+            r.Release()
+
+    def test_convert_batch_errors(self):
+        results = self.grab_frames(2)
+        other = pylon.PylonImage()
+        other.Reset(pylon.PixelType_Mono8, 320, 240)
+        sources = [results[0], pylon.PylonImage(), None, other, results[1]]
+        out = numpy.full((5, 480, 640, 3), 255, dtype=numpy.uint8)
+        converted, errors = self.converter.ConvertBatch(sources, out=out)
+        self.assertIs(converted, out)
+        self.assertEqual(sorted(errors), [1, 2, 3])
+        for i in (1, 2, 3):
+            self.assertFalse(out[i].any())
+        numpy.testing.assert_array_equal(out[0], self.converter.Convert(results[0]).GetArray())
+        numpy.testing.assert_array_equal(out[4], self.converter.Convert(results[1]).GetArray())
+        with self.assertRaises(ValueError):
+            self.converter.ConvertBatch(sources, out=out[:4])
+        for r in results:
+            r.Release()
+
+    def check_regions(self, result):
+        full = self.converter.Convert(result).GetArray().astype(numpy.uint32)
+        regions = [(0, 0, 64, 48), (101, 37, 200, 150), (640 - 96, 480 - 64, 96, 64)]
+        for scale in (1, 2, 4):
+            for numThreads in (1, 0):
+                arrays = self.converter.ConvertRegions(result, regions, scale=scale, numThreads=numThreads)
+                for (x, y, w, h), array in zip(regions, arrays):
+                    h, w = h // scale, w // scale
+                    crop = full[y:y + h * scale, x:x + w * scale]
+                    expected = (crop.reshape(h, scale, w, scale, 3).sum(axis=(1, 3)) + scale * scale // 2) // (scale * scale)
+                    numpy.testing.assert_array_equal(array, expected)
+
+    def test_convert_regions(self):
+        self.check_regions(self.result)
+
+    def test_convert_regions_bayer(self):
+        camera = self.create_first()
+        camera.Open()
+        if "BayerRG8" not in camera.PixelFormat.Symbolics:
+            camera.Close()
+            self.skipTest("camera doesn't support BayerRG8")
+        camera.Width.Value = 640
+        camera.Height.Value = 480
+        camera.PixelFormat.Value = "BayerRG8"
+        camera.StartGrabbingMax(1)
+        with camera.RetrieveResult(5000) as result:
+            self.assertTrue(result.GrabSucceeded())
+            camera.Close()
+            self.check_regions(result)
+
+    def test_convert_regions_out(self):
+        mosaic = numpy.zeros((120, 320, 3), dtype=numpy.uint8)
+        out = [mosaic[:, :160], mosaic[:, 160:]]
+        arrays = self.converter.ConvertRegions(self.result, [(0, 0, 320, 240), (320, 240, 320, 240)], scale=2, out=out)
+        self.assertIs(arrays[0], out[0])
+        self.assertTrue(numpy.shares_memory(arrays[1], mosaic))
+        with self.assertRaises(ValueError):
+            self.converter.ConvertRegions(self.result, [(0, 0, 320, 240)], out=out)
+        with self.assertRaises(ValueError):
+            self.converter.ConvertRegions(self.result, [(0, 0, 320, 240)], scale=0)
+        with self.assertRaises(genicam.InvalidArgumentException):
+            self.converter.ConvertRegions(self.result, [(600, 0, 64, 64)])
+
+    def test_converter_pool(self):
+        pool = pylon.ImageFormatConverterPool(maxEntries=2, numImages=2)
+        expected = self.converter.Convert(self.result).GetArray()
+        first = pool.Convert(self.result, pylon.PixelType_BGR8packed)
+        numpy.testing.assert_array_equal(first.GetArray(), expected)
+        second = pool.Convert(self.result, pylon.PixelType_BGR8packed)
+        self.assertIsNot(second, first)
+        # images still referenced aren't overwritten
+        third = pool.Convert(self.result, pylon.PixelType_BGR8packed)
+        self.assertIsNot(third, first)
+        self.assertIsNot(third, second)
+        numpy.testing.assert_array_equal(first.GetArray(), expected)
+        # the buffers of the ring are reused once released
+        first_address = first._GetBufferAddress()
+        second_address = second._GetBufferAddress()
+        del first, second, third
+        fourth = pool.Convert(self.result, pylon.PixelType_BGR8packed)
+        self.assertEqual(fourth._GetBufferAddress(), first_address)
+        # an exported array keeps its buffer in use
+        array = numpy.asarray(fourth)
+        del fourth
+        self.assertEqual(pool.Convert(self.result, pylon.PixelType_BGR8packed)._GetBufferAddress(), second_address)
+        fifth = pool.Convert(self.result, pylon.PixelType_BGR8packed)
+        self.assertNotEqual(fifth._GetBufferAddress(), first_address)
+        numpy.testing.assert_array_equal(array, expected)
+        del array, fifth
+        self.assertEqual(pool.GetStatistics(), (5, 1, 0, 1))
+
+        mono = pool.Convert(self.result, pylon.PixelType_Mono8)
+        numpy.testing.assert_array_equal(mono.GetArray(), self.result.GetArray())
+        pool.Convert(self.result, pylon.PixelType_RGB8packed)
+        stats = pool.GetStatistics()
+        self.assertEqual((stats.misses, stats.evictions, stats.numEntries), (3, 1, 2))
+        # the least recently used entry, BGR8packed, was evicted
+        pool.Convert(self.result, pylon.PixelType_Mono8)
+        self.assertEqual(pool.GetStatistics().hits, 3)
+        pool.Convert(self.result, pylon.PixelType_BGR8packed)
+        self.assertEqual(pool.GetStatistics().misses, 4)
+
+        pool.ResetStatistics()
+        pool.Clear()
+        self.assertEqual(pool.GetStatistics(), (0, 0, 0, 0))
+        self.assertIs(pylon.ImageFormatConverterPool.GetInstance(), pylon.ImageFormatConverterPool.GetInstance())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,6 +14,8 @@ class InstantCameraArrayTestSuite(PylonEmuTestCase):
         # Test if no Camera is connected
         for cam in cameraArray:
             self.fail()
+        self.assertEqual(cameraArray.StartGrabbingParallel(), 0.0)
+        self.assertFalse(cameraArray.IsGrabbingParallel())
 
     def test_initialize(self):
         cameraArray = pylon.InstantCameraArray()
@@ -105,6 +107,79 @@ class InstantCameraArrayTestSuite(PylonEmuTestCase):
         self.assertFalse(cameraArray.IsPylonDeviceAttached())
         self.assertFalse(cameraArray.IsCameraDeviceRemoved())
 
+    def test_parallel_lifecycle(self):
+        import os
+        import tempfile
+        cameraArray = pylon.InstantCameraArray(self.num_dev)
+        devices = pylon.TlFactory.GetInstance().EnumerateDevices(self.device_filter)
+        for i, cam in enumerate(cameraArray):
+            cam.Attach(pylon.TlFactory.GetInstance().CreateDevice(devices[i]))
+
+        cameraArray.OpenParallel()
+        self.assertTrue(all(cam.IsOpen() for cam in cameraArray))
+
+        cameraArray[0].Width.Value = 512
+        with tempfile.TemporaryDirectory() as directory:
+            nodeFile = os.path.join(directory, "NodeMap.pfs")
+            pylon.FeaturePersistence.Save(nodeFile, cameraArray[0].GetNodeMap())
+            cameraArray.LoadFeaturesParallel(nodeFile)
+            self.assertEqual([cam.Width.Value for cam in cameraArray], [512] * self.num_dev)
+
+            with self.assertRaises(ValueError):
+                cameraArray.LoadFeaturesParallel([nodeFile])
+            missing = os.path.join(directory, "missing.pfs")
+            with self.assertRaises(pylon.InstantCameraArrayException) as context:
+                cameraArray.LoadFeaturesParallel([nodeFile, missing] + [nodeFile] * (self.num_dev - 2))
+            self.assertEqual(list(context.exception.errors), [1])
+
+        skew = cameraArray.StartGrabbingParallel(maxImages=2)
+        self.assertGreaterEqual(skew, 0.0)
+        self.assertTrue(all(cam.IsGrabbing() for cam in cameraArray))
+        self.assertTrue(cameraArray.IsGrabbingParallel())
+        # the array itself doesn't see the grabs of the cameras
+        with self.assertRaises(RuntimeError):
+            cameraArray.RetrieveResult(5000)
+        pipeline = pylon.Pipeline(cameraArray)
+        pipeline.AddStage("array", pylon.ArrayStage())
+        self.assertRaises(RuntimeError, pipeline.Start)
+        for cam in cameraArray:
+            while cam.IsGrabbing():
+                with cam.RetrieveResult(5000) as result:
+                    self.assertTrue(result.GrabSucceeded())
+        self.assertFalse(cameraArray.IsGrabbingParallel())
+        cameraArray.StopGrabbing()
+
+        # array level grabbing works again
+        cameraArray.StartGrabbing()
+        with cameraArray.RetrieveResult(5000) as result:
+            self.assertTrue(result.GrabSucceeded())
+        cameraArray.StopGrabbing()
+        cameraArray.Close()
+
+    def test_grab_statistics_of_array_camera(self):
+        cameraArray = pylon.InstantCameraArray(1)
+        cameraArray[0].Attach(pylon.TlFactory.GetInstance().CreateFirstDevice(self.device_filter[0]))
+        cameraArray[0].Open()
+        # every access returns a new proxy, the statistics belong to the camera
+        cameraArray[0].EnableGrabStatistics()
+        cameraArray[0].StartGrabbingMax(5)
+        while cameraArray[0].IsGrabbing():
+            with cameraArray[0].RetrieveResult(5000) as result:
+                self.assertTrue(result.GrabSucceeded())
+        self.assertEqual(cameraArray[0].GetGrabStatistics().numRetrieved, 5)
+
+        # enabling them again doesn't register another collector
+        cameraArray[0].EnableGrabStatistics()
+        cameraArray[0].StartGrabbingMax(2)
+        while cameraArray[0].IsGrabbing():
+            with cameraArray[0].RetrieveResult(5000) as result:
+                self.assertTrue(result.GrabSucceeded())
+        self.assertEqual(cameraArray[0].GetGrabStatistics().numRetrieved, 7)
+
+        cameraArray[0].ResetGrabStatistics()
+        self.assertEqual(cameraArray[0].GetGrabStatistics().numRetrieved, 0)
+        cameraArray.Close()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,136 @@
+from pylonemutestcase import PylonEmuTestCase
+from pypylon import pylon
+import numpy
+import time
+import unittest
+
+
+class PipelineTestSuite(PylonEmuTestCase):
+    def setUp(self):
+        self.camera = self.create_first()
+        self.camera.Open()
+        self.camera.Width.Value = 1024
+        self.camera.Height.Value = 1040
+        self.camera.PixelFormat.Value = "Mono8"
+
+    def tearDown(self):
+        self.camera.Close()
+
+    def test_stages(self):
+        means = []
+        pipeline = pylon.Pipeline(self.camera)
+        pipeline.AddStage("array", pylon.ArrayStage(), workers = 2)
+        pipeline.AddStage("mean", lambda image: means.append(float(image.mean())))
+        self.camera.StartGrabbingMax(10)
+        with pipeline:
+            pass
+        self.assertEqual(len(means), 10)
+        statistics = pipeline.GetStatistics()
+        self.assertEqual([s.name for s in statistics], ["array", "mean"])
+        for s in statistics:
+            self.assertEqual(s.processed, 10)
+            self.assertEqual(s.dropped, 0)
+            self.assertEqual(s.errors, 0)
+            self.assertEqual(s.queueDepth, 0)
+            self.assertGreater(s.throughput, 0)
+            self.assertLessEqual(s.latencyP50Us, s.latencyP99Us)
+        self.assertEqual(statistics[0].workers, 2)
+        self.assertIn(pipeline.GetBottleneck(), ("array", "mean"))
+
+    def test_convert_stage(self):
+        shapes = []
+        pipeline = pylon.Pipeline(self.camera)
+        pipeline.AddStage("convert", pylon.ConvertStage(pylon.PixelType_RGB8packed))
+        pipeline.AddStage("shape", lambda image: shapes.append(image.shape))
+        self.camera.StartGrabbingMax(3)
+        with pipeline:
+            pass
+        self.assertEqual(shapes, [(1040, 1024, 3)] * 3)
+
+    def test_native_convert_stage(self):
+        shapes = []
+        pipeline = pylon.Pipeline(self.camera)
+        pipeline.AddStage("convert", pylon.NativeConvertStage(pylon.PixelType_RGB8packed), workers = 2)
+        pipeline.AddStage("shape", lambda image: shapes.append(image.shape))
+        self.camera.StartGrabbingMax(5)
+        with pipeline:
+            pass
+        self.assertEqual(shapes, [(1040, 1024, 3)] * 5)
+        convert, shape = pipeline.GetStatistics()
+        self.assertEqual(convert.workers, 2)
+        self.assertEqual(convert.processed, 5)
+        self.assertEqual(convert.dropped, 0)
+        self.assertEqual(convert.errors, 0)
+        self.assertGreater(convert.throughput, 0)
+        self.assertLessEqual(convert.latencyP50Us, convert.latencyP99Us)
+        self.assertEqual(shape.processed, 5)
+
+    def test_native_convert_stage_input(self):
+        # only grab results can be converted natively
+        pipeline = pylon.Pipeline(self.camera)
+        pipeline.AddStage("array", pylon.ArrayStage())
+        pipeline.AddStage("convert", pylon.NativeConvertStage())
+        self.camera.StartGrabbingMax(2)
+        pipeline.Start()
+        with self.assertRaises(TypeError):
+            pipeline.Join()
+        self.assertEqual(pipeline.GetStatistics()[1].errors, 2)
+
+    def test_drop_policy(self):
+        def slow(image):
+            time.sleep(0.05)
+
+        pipeline = pylon.Pipeline(self.camera)
+        pipeline.AddStage("array", pylon.ArrayStage())
+        pipeline.AddStage("slow", slow, queueSize = 1, policy = pylon.QueuePolicy_DropOldest)
+        self.camera.StartGrabbingMax(20)
+        with pipeline:
+            pass
+        array, slow = pipeline.GetStatistics()
+        self.assertEqual(array.processed, 20)
+        self.assertEqual(slow.processed + slow.dropped, 20)
+        self.assertEqual(slow.maxQueueDepth, 1)
+        self.assertEqual(pipeline.GetBottleneck(), "slow")
+
+    def test_closed_queue(self):
+        pipeline = pylon.Pipeline(self.camera)
+        stage = pipeline.AddStage("a", len, queueSize = 1, policy = pylon.QueuePolicy_DropOldest)
+        self.assertIsNone(stage.queue.Put("first"))
+        stage.queue.Close()
+        # the queued item is kept, the new one is rejected
+        self.assertEqual(stage.queue.Put("second"), "second")
+        self.assertEqual(stage.queue.Get()[0], "first")
+        self.assertIsNone(stage.queue.Get())
+
+    def test_errors(self):
+        def fail(result):
+            raise ValueError("stage failed")
+
+        pipeline = pylon.Pipeline(self.camera)
+        pipeline.AddStage("fail", fail)
+        self.camera.StartGrabbingMax(3)
+        pipeline.Start()
+        with self.assertRaises(ValueError):
+            pipeline.Join()
+        self.assertEqual(pipeline.GetStatistics()[0].errors, 3)
+
+    def test_stop(self):
+        pipeline = pylon.Pipeline(self.camera)
+        pipeline.AddStage("array", pylon.ArrayStage())
+        self.camera.StartGrabbing()
+        pipeline.Start()
+        time.sleep(0.2)
+        pipeline.Stop()
+        self.assertGreater(pipeline.GetStatistics()[0].processed, 0)
+        self.camera.StopGrabbing()
+
+    def test_invalid_arguments(self):
+        pipeline = pylon.Pipeline(self.camera)
+        self.assertRaises(RuntimeError, pipeline.Start)
+        self.assertRaises(ValueError, pipeline.AddStage, "a", len, workers = 0)
+        self.assertRaises(ValueError, pipeline.AddStage, "a", len, queueSize = 0)
+        self.assertRaises(ValueError, pipeline.AddStage, "a", len, policy = 42)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+from pylonemutestcase import PylonEmuTestCase
+from pypylon import pylon
+import numpy
+import unittest
+
+
+class PixelFormatRegistryTestSuite(PylonEmuTestCase):
+    def test_descriptor(self):
+        desc = pylon.GetPixelFormatDescriptor(pylon.PixelType_Mono8)
+        self.assertEqual(desc.bitsPerPixel, 8)
+        self.assertEqual(desc.channels, 1)
+        self.assertEqual(desc.dtype, numpy.uint8)
+        self.assertEqual(desc.format, "B")
+        self.assertFalse(desc.packed)
+        self.assertEqual(desc.GetShape(4, 6), (4, 6))
+
+        desc = pylon.GetPixelFormatDescriptor(pylon.PixelType_BGR8packed)
+        self.assertEqual(desc.bitsPerPixel, 24)
+        self.assertEqual(desc.GetShape(4, 6), (4, 6, 3))
+
+        desc = pylon.GetPixelFormatDescriptor(pylon.PixelType_BiColorRGBG8)
+        self.assertEqual(desc.GetShape(4, 6), (4, 12))
+
+    def test_packed_descriptor(self):
+        desc = pylon.GetPixelFormatDescriptor(pylon.PixelType_Mono12p)
+        self.assertEqual(desc.bitsPerPixel, 12)
+        self.assertTrue(desc.packed)
+        self.assertEqual(desc.unpackedType, pylon.PixelType_Mono12)
+        self.assertEqual(desc.dtype, numpy.uint16)
+
+    def test_unsupported(self):
+        self.assertIsNone(pylon.GetPixelFormatDescriptor(pylon.PixelType_Undefined))
+        img = pylon.PylonImage()
+        self.assertRaises(ValueError, img.GetImageFormat, pylon.PixelType_Mono12p)
+        self.assertRaises(ValueError, img.GetImageFormat, pylon.PixelType_Undefined)
+
+    def test_register(self):
+        old = pylon.GetPixelFormatDescriptor(pylon.PixelType_Mono8)
+        try:
+            pylon.RegisterPixelFormat(pylon.PixelType_Mono8, "B", 4, True)
+            img = pylon.PylonImage()
+            shape, dtype, form = img.GetImageFormat(pylon.PixelType_Mono8)
+            self.assertEqual(shape, (0, 0, 4))
+        finally:
+            pylon.RegisterPixelFormat(pylon.PixelType_Mono8, old.format, old.channels, old.channelAxis)
+
+
+if __name__ == "__main__":
+    unittest.main()
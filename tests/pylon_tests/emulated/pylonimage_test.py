@@ -90,6 +90,137 @@ class PylonImageTestSuite(PylonEmuTestCase):
         self.assertEqual( sys.getrefcount(arr), arr_refcount_0)
 
 
+    def test_array_export(self):
+        import numpy as np
+
+        arr = np.random.randint(0, 256, (16, 24, 3), dtype=np.uint8)
+        img = pylon.PylonImage()
+        img.AttachArray(arr, pylon.PixelType_RGB8packed)
+
+        ar = np.asarray(img)
+        self.assertEqual(ar.shape, (16, 24, 3))
+        self.assertTrue(np.shares_memory(ar, arr))
+        self.assertTrue(np.array_equal(ar, arr))
+
+        # the exported array doesn't depend on the image object anymore
+        del img
+        self.assertTrue(np.array_equal(ar, arr))
+
+    def test_padded_views(self):
+        import numpy as np
+
+        width, height, padding_x = 31, 8, 3
+        for pixel_type, dtype, channels in (
+            (pylon.PixelType_Mono8, np.uint8, 1),
+            (pylon.PixelType_Mono16, np.uint16, 1),
+            (pylon.PixelType_RGB8packed, np.uint8, 3),
+        ):
+            itemsize = np.dtype(dtype).itemsize
+            row_size = width * channels * itemsize
+            padded = np.random.randint(0, 256, (height, row_size + padding_x), dtype=np.uint8)
+            expected = padded[:, :row_size].copy().view(dtype)
+            if channels > 1:
+                expected = expected.reshape(height, width, channels)
+
+            img = pylon.PylonImage()
+            img.AttachMemoryView(padded.data, pixel_type, width, height, padding_x)
+            self.assertEqual(img.GetPaddingX(), padding_x)
+
+            self.assertTrue(np.array_equal(img.GetArray(), expected))
+            self.assertTrue(np.array_equal(np.asarray(img), expected))
+            self.assertEqual(np.asarray(img).strides[0], row_size + padding_x)
+            with img.GetArrayZeroCopy() as zc:
+                self.assertEqual(zc.strides[0], row_size + padding_x)
+                self.assertTrue(np.array_equal(zc, expected))
+
+    def test_dlpack_export(self):
+        import numpy as np
+
+        width, height, padding_x = 24, 8, 4
+        padded = np.random.randint(0, 1 << 16, (height, width + padding_x // 2), dtype=np.uint16)
+        img = pylon.PylonImage()
+        img.AttachMemoryView(padded.data, pylon.PixelType_Mono16, width, height, padding_x)
+
+        ar = np.from_dlpack(img)
+        self.assertEqual(ar.shape, (height, width))
+        self.assertEqual(ar.strides, padded.strides)
+        self.assertTrue(np.shares_memory(ar, padded))
+        del img
+        self.assertTrue(np.array_equal(ar, padded[:, :width]))
+
+    def test_getarray_out_with_padding(self):
+        import numpy as np
+
+        width, height, padding_x = 30, 8, 2
+        padded = np.random.randint(0, 256, (height, width + padding_x), dtype=np.uint8)
+        img = pylon.PylonImage()
+        img.AttachMemoryView(padded.data, pylon.PixelType_Mono8, width, height, padding_x)
+
+        out = np.zeros((height, width), dtype=np.uint8)
+        img.GetArray(out=out)
+        self.assertTrue(np.array_equal(out, padded[:, :width]))
+
+    def test_getarray_raw(self):
+        import numpy as np
+
+        width, height, padding_x = 30, 8, 2
+        padded = np.random.randint(0, 256, (height, width + padding_x), dtype=np.uint8)
+        img = pylon.PylonImage()
+        img.AttachMemoryView(padded.data, pylon.PixelType_Mono8, width, height, padding_x)
+
+        raw = img.GetArray(raw=True)
+        self.assertEqual(raw.shape, (img.GetImageSize(),))
+        out = np.zeros(raw.shape, dtype=np.uint8)
+        img.GetArray(raw=True, out=out)
+        self.assertTrue(np.array_equal(out, raw))
+
+
+    @staticmethod
+    def _pack_12p(values):
+        import numpy as np
+        v = values.astype(np.uint16).reshape(values.shape[0], -1, 2)
+        a, b = v[..., 0], v[..., 1]
+        packed = np.stack((a & 0xFF, (a >> 8) | ((b & 0x0F) << 4), b >> 4), axis=-1)
+        return packed.astype(np.uint8).reshape(values.shape[0], -1)
+
+    @staticmethod
+    def _pack_10p(values):
+        import numpy as np
+        v = values.astype(np.uint64).reshape(values.shape[0], -1, 4)
+        bits = v[..., 0] | (v[..., 1] << 10) | (v[..., 2] << 20) | (v[..., 3] << 30)
+        packed = np.stack([(bits >> (8 * i)) & 0xFF for i in range(5)], axis=-1)
+        return packed.astype(np.uint8).reshape(values.shape[0], -1)
+
+    def test_getarray_unpack_mono12p(self):
+        import numpy as np
+
+        width, height, padding_x = 30, 8, 3
+        expected = np.random.randint(0, 1 << 12, (height, width), dtype=np.uint16)
+        packed = self._pack_12p(expected)
+        padded = np.zeros((height, packed.shape[1] + padding_x), dtype=np.uint8)
+        padded[:, :packed.shape[1]] = packed
+
+        img = pylon.PylonImage()
+        img.AttachMemoryView(padded.data, pylon.PixelType_Mono12p, width, height, padding_x)
+        self.assertTrue(np.array_equal(img.GetArray(), expected))
+
+        # unpack into a strided caller owned array
+        out = np.zeros((height, width + 5), dtype=np.uint16)[:, :width]
+        self.assertIs(img.GetArray(out=out), out)
+        self.assertTrue(np.array_equal(out, expected))
+
+    def test_getarray_unpack_mono10p(self):
+        import numpy as np
+
+        # width is a multiple of the pixel group size and the row ends on a byte boundary
+        width, height = 32, 6
+        expected = np.random.randint(0, 1 << 10, (height, width), dtype=np.uint16)
+        packed = np.ascontiguousarray(self._pack_10p(expected))
+
+        img = pylon.PylonImage()
+        img.AttachMemoryView(packed.data, pylon.PixelType_Mono10p, width, height, 0)
+        self.assertTrue(np.array_equal(img.GetArray(), expected))
+
 
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testName']
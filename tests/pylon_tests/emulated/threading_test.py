@@ -0,0 +1,81 @@
+from pylonemutestcase import PylonEmuTestCase
+from pypylon import pylon
+import threading
+import time
+import unittest
+
+
+class ThreadingTestSuite(PylonEmuTestCase):
+    # Every frame is triggered by software and has to wait for the exposure,
+    # so a camera thread spends most of its time blocked in pylon.
+    exposure_us = 20000.0
+    frames = 10
+
+    def create_cameras(self, count):
+        tlf = pylon.TlFactory.GetInstance()
+        devices = tlf.EnumerateDevices(self.device_filter)[:count]
+        cameras = [pylon.InstantCamera(tlf.CreateDevice(d)) for d in devices]
+        for camera in cameras:
+            camera.Open()
+            camera.Width.Value = 640
+            camera.Height.Value = 480
+            camera.PixelFormat.Value = "Mono8"
+            camera.ExposureTimeAbs.Value = self.exposure_us
+            camera.TriggerSelector.Value = "FrameStart"
+            camera.TriggerMode.Value = "On"
+            camera.TriggerSource.Value = "Software"
+        return cameras
+
+    def grab_triggered(self, camera, errors):
+        try:
+            camera.StartGrabbingMax(self.frames)
+            while camera.IsGrabbing():
+                if camera.WaitForFrameTriggerReady(1000, pylon.TimeoutHandling_ThrowException):
+                    camera.ExecuteSoftwareTrigger()
+                with camera.RetrieveResult(5000) as result:
+                    if not result.GrabSucceeded():
+                        errors.append(result.GetErrorDescription())
+                    result.GetArray()
+        except Exception as e:
+            errors.append(e)
+
+    def test_retrieve_releases_gil(self):
+        camera, = self.create_cameras(1)
+        camera.StartGrabbing()
+        # No trigger is sent, so the thread waits for the whole timeout.
+        waiter = threading.Thread(target=camera.RetrieveResult, args=(500, pylon.TimeoutHandling_Return))
+        waiter.start()
+        time.sleep(0.05)
+        iterations = 0
+        while waiter.is_alive():
+            iterations += 1
+        waiter.join()
+        camera.StopGrabbing()
+        camera.Close()
+        self.assertGreater(iterations, 1000)
+
+    def test_cameras_grab_concurrently(self):
+        # The scaling over cameras is measured by the multicamera benchmark.
+        # Here only the GIL must be released while the cameras grab, so this
+        # thread keeps running.
+        cameras = self.create_cameras(self.num_dev)
+        self.assertEqual(len(cameras), self.num_dev)
+        errors = []
+        threads = [threading.Thread(target=self.grab_triggered, args=(c, errors)) for c in cameras]
+        iterations = 0
+        try:
+            for t in threads:
+                t.start()
+            while any(t.is_alive() for t in threads):
+                iterations += 1
+            for t in threads:
+                t.join()
+        finally:
+            for camera in cameras:
+                camera.Close()
+        self.assertEqual(errors, [])
+        self.assertGreater(iterations, 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()